@@ -0,0 +1,175 @@
+"""Benchmark: import time of the project's entry points.
+
+Each module is imported in a fresh interpreter with ``-X importtime``. The
+report lists the cumulative import time of the module, the slowest
+third-party packages it pulled in, and any heavy dependency (crewai,
+google-adk, LiteLLM, Weave, google-genai) that a lightweight entry point
+imported although it should not.
+
+Run with ``python -m benchmarks.bench_import_time`` from the project root.
+With ``--check`` the command exits non-zero when a module is over its budget
+or imports a forbidden dependency, so it can guard startup time in CI.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from statistics import median
+
+from benchmarks.report import default_output_path, write_report
+
+HEAVY_PACKAGES = ("crewai", "litellm", "weave", "google.adk", "google.genai")
+
+# Entry points that must start quickly: module -> (budget in ms, packages
+# it must not import).
+LIGHT_MODULES = {
+    "main": (1500, HEAVY_PACKAGES),
+    "example_agent.agent": (1500, HEAVY_PACKAGES),
+    "src.models": (1500, HEAVY_PACKAGES),
+    "src.creation.main": (1500, HEAVY_PACKAGES),
+    "src.creation.dedup": (2000, HEAVY_PACKAGES),
+    "src.runner.results_table": (2000, HEAVY_PACKAGES),
+    "evaluation.eval_set_stream": (500, HEAVY_PACKAGES),
+}
+TOP_IMPORTS = 5
+_PROJECT_PACKAGES = ("main", "src", "evaluation", "example_agent", "benchmarks")
+
+_PROBE = (
+    "import json, sys; import {module}; "
+    "print(json.dumps([m for m in {heavy!r} if m in sys.modules]))"
+)
+
+
+def measure(module: str, heavy: tuple[str, ...] = HEAVY_PACKAGES) -> dict:
+    """Import a module in a fresh interpreter and parse ``-X importtime``."""
+    env = {**os.environ, "PYTHONWARNINGS": "ignore"}
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            _PROBE.format(module=module, heavy=heavy),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+        cwd=Path(__file__).parent.parent,
+    )
+
+    imports = _module_subtree(_parse_importtime(completed.stderr), module)
+    return {
+        "module": module,
+        "import_ms": imports[-1][2] / 1000 if imports else 0.0,
+        "slowest_dependencies_ms": {
+            package: us / 1000 for package, us in _slowest_packages(imports)
+        },
+        "heavy_imported": json.loads(completed.stdout.strip().splitlines()[-1]),
+    }
+
+
+def _parse_importtime(stderr: str) -> list[tuple[int, str, int]]:
+    """Return (nesting depth, module, cumulative microseconds) per import line."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            depth = len(name) - len(name.lstrip())
+            imports.append((depth, name.strip(), int(cumulative)))
+    return imports
+
+
+def _module_subtree(
+    imports: list[tuple[int, str, int]], module: str
+) -> list[tuple[int, str, int]]:
+    """Return the imports made while importing ``module``, ending with itself.
+
+    ``-X importtime`` prints a module after everything it imported, nested
+    one level deeper, so the subtree is the run of deeper lines right before
+    the module's own line. Interpreter start-up imports are left out.
+    """
+    for end in range(len(imports) - 1, -1, -1):
+        depth, name, _ = imports[end]
+        if name == module:
+            start = end
+            while start > 0 and imports[start - 1][0] > depth:
+                start -= 1
+            return imports[start : end + 1]
+    return []
+
+
+def _slowest_packages(imports: list[tuple[int, str, int]]) -> list[tuple[str, int]]:
+    """Return the third-party top-level packages that took longest to import."""
+    packages: dict[str, int] = {}
+    for _, name, cumulative in imports:
+        package = name.split(".")[0]
+        if package in _PROJECT_PACKAGES:
+            continue
+        packages[package] = max(packages.get(package, 0), cumulative)
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)[
+        :TOP_IMPORTS
+    ]
+
+
+def main(args: argparse.Namespace) -> int:
+    modules = args.modules or list(LIGHT_MODULES)
+    results = {}
+    failures = []
+    for module in modules:
+        budget_ms, forbidden = LIGHT_MODULES.get(module, (None, ()))
+        runs = [measure(module) for _ in range(args.repeat)]
+        result = runs[0]
+        result["import_ms"] = median(run["import_ms"] for run in runs)
+        result["budget_ms"] = budget_ms
+        results[module] = result
+
+        forbidden_imported = [m for m in result["heavy_imported"] if m in forbidden]
+        if budget_ms is not None and result["import_ms"] > budget_ms:
+            failures.append(f"{module}: {result['import_ms']:.0f} ms > {budget_ms} ms")
+        if forbidden_imported:
+            failures.append(f"{module}: imports {', '.join(forbidden_imported)}")
+
+        slowest = ", ".join(
+            f"{name} {ms:.0f}ms"
+            for name, ms in result["slowest_dependencies_ms"].items()
+        )
+        print(
+            f"{module:<30} {result['import_ms']:>8.1f} ms"
+            + (f" (budget {budget_ms} ms)" if budget_ms is not None else "")
+            + (f"  slowest: {slowest}" if slowest else "")
+        )
+
+    path = write_report(
+        args.output or default_output_path("import_time"),
+        "import_time",
+        {"modules": modules, "repeat": args.repeat},
+        results,
+    )
+    print(f"Saved results to {path}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if args.check and failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "modules", nargs="*", help="Modules to measure (default: the entry points)"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Exit non-zero if a module is over budget or imports a heavy package",
+    )
+    parser.add_argument("--output", type=Path, help="Where to save the JSON results")
+    sys.exit(main(parser.parse_args()))
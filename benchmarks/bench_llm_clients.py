@@ -0,0 +1,141 @@
+"""Benchmark: per-call latency of LLM calls with and without pooled clients.
+
+Sends chat completions through LiteLLM to a local ``StubLLMServer`` over TLS
+(with a throwaway self-signed certificate) in three ways:
+
+* ``new connection``: a fresh client per call, as when every call builds its
+  own client, paying TCP and TLS setup each time;
+* ``litellm default``: LiteLLM's own client handling;
+* ``pooled``: the model's ``PooledLLMClient`` from ``src.llm_clients``.
+
+The stub answers instantly, so the difference is connection setup.
+
+Run with ``python -m benchmarks.bench_llm_clients`` from the project root.
+"""
+
+import argparse
+import asyncio
+import datetime
+import ipaddress
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+import litellm
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+from openai import AsyncOpenAI
+
+from benchmarks.fakes import StubLLMServer
+from benchmarks.report import default_output_path, print_table, summarize, write_report
+from src.llm_clients import get_llm_client
+
+MODEL = "openai/stub-model"
+MESSAGES = [{"role": "user", "content": "What time is it?"}]
+
+
+def write_self_signed_certificate(directory: Path) -> tuple[Path, Path]:
+    """Write a certificate and key for 127.0.0.1; return their paths."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(
+            x509.SubjectAlternativeName(
+                [x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]
+            ),
+            critical=False,
+        )
+        .sign(key, hashes.SHA256())
+    )
+    certfile, keyfile = directory / "cert.pem", directory / "key.pem"
+    certfile.write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+    keyfile.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    return certfile, keyfile
+
+
+async def call(api_base: str, mode: str) -> float:
+    """Make one call; return its latency in seconds."""
+    start = time.perf_counter()
+    kwargs = {"api_base": api_base, "api_key": "test-key", "max_retries": 0}
+    if mode == "new connection":
+        client = AsyncOpenAI(
+            api_key="test-key",
+            base_url=api_base,
+            http_client=httpx.AsyncClient(verify=litellm.ssl_verify),
+            max_retries=0,
+        )
+        async with client:
+            await litellm.acompletion(MODEL, MESSAGES, client=client, **kwargs)
+    else:
+        if mode == "pooled":
+            pooled = get_llm_client(MODEL, api_base, "test-key")
+            kwargs.update(pooled.completion_kwargs(is_async=True))
+        await litellm.acompletion(MODEL, MESSAGES, **kwargs)
+    return time.perf_counter() - start
+
+
+async def measure(api_base: str, mode: str, calls: int, concurrency: int) -> dict:
+    # Warm up once so every mode starts from the same imports and caches.
+    await call(api_base, mode)
+    latencies = []
+    start = time.perf_counter()
+    for offset in range(0, calls, concurrency):
+        batch = min(concurrency, calls - offset)
+        latencies += await asyncio.gather(*[call(api_base, mode) for _ in range(batch)])
+    return summarize(latencies, time.perf_counter() - start, calls)
+
+
+async def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        certfile, keyfile = write_self_signed_certificate(Path(tmp))
+        # Trust the certificate in every client. LiteLLM's default aiohttp
+        # transport ignores litellm.ssl_verify, so use its httpx one.
+        litellm.ssl_verify = str(certfile)
+        litellm.disable_aiohttp_transport = True
+        server = StubLLMServer(certfile=str(certfile), keyfile=str(keyfile))
+        try:
+            results = {}
+            for mode in ("new connection", "litellm default", "pooled"):
+                connections = server.connections
+                results[mode] = await measure(
+                    server.api_base, mode, args.calls, args.concurrency
+                )
+                results[mode]["connections"] = server.connections - connections
+        finally:
+            server.close()
+
+    print_table(list(results.items()))
+    for mode, summary in results.items():
+        print(f"{mode:<36} {summary['connections']:>8} connections")
+    path = write_report(
+        args.output or default_output_path("llm_clients"),
+        "llm_clients",
+        {"calls": args.calls, "concurrency": args.concurrency},
+        results,
+    )
+    print(f"Saved results to {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--output", type=Path, help="Where to save the JSON results")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,75 @@
+"""Micro-benchmark: a fresh MCP server per scenario vs the pooled servers.
+
+Each simulated scenario lists the tools of the ``mcp_server_time`` server and
+calls ``get_current_time`` once. With a plain ``MCPToolset`` per scenario
+that includes spawning the server and the MCP handshake; with
+``PooledMCPToolset`` the servers are started once up front.
+
+Run with ``python -m benchmarks.bench_mcp_pool`` from the project root.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
+from mcp import StdioServerParameters
+
+from src.runner.mcp_pool import MCPServerPool, PooledMCPToolset
+
+SERVER = StdioServerParameters(command=sys.executable, args=["-m", "mcp_server_time"])
+
+
+async def run_scenario(toolset: MCPToolset) -> float:
+    """Discover the tools and call one; return the latency in seconds."""
+    start = time.perf_counter()
+    tools = {tool.name: tool for tool in await toolset.get_tools()}
+    await tools["get_current_time"].run_async(
+        args={"timezone": "UTC"}, tool_context=None
+    )
+    return time.perf_counter() - start
+
+
+async def run_fresh(scenarios: int) -> list[float]:
+    latencies = []
+    for _ in range(scenarios):
+        toolset = MCPToolset(connection_params=SERVER)
+        latencies.append(await run_scenario(toolset))
+        await toolset.close()
+    return latencies
+
+
+async def run_pooled(scenarios: int, size: int) -> tuple[list[float], float]:
+    pool = MCPServerPool(SERVER, size=size, health_check_interval=None)
+    start = time.perf_counter()
+    await pool.start()
+    startup = time.perf_counter() - start
+    toolset = PooledMCPToolset(connection_params=SERVER, pool=pool)
+    try:
+        latencies = [await run_scenario(toolset) for _ in range(scenarios)]
+    finally:
+        await pool.close()
+    return latencies, startup
+
+
+def _ms(latencies: list[float]) -> str:
+    return f"{sum(latencies) / len(latencies) * 1000:,.1f} ms/scenario"
+
+
+async def main(scenarios: int, size: int) -> None:
+    fresh = await run_fresh(scenarios)
+    pooled, startup = await run_pooled(scenarios, size)
+
+    print(f"scenarios:          {scenarios}")
+    print(f"fresh server:       {_ms(fresh)}")
+    print(f"pooled servers:     {_ms(pooled)} (+{startup:.2f}s startup, size {size})")
+    print(f"speedup:            {sum(fresh) / sum(pooled):.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenarios", type=int, default=10)
+    parser.add_argument("--pool-size", type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(main(args.scenarios, args.pool_size))
@@ -0,0 +1,273 @@
+"""Offline benchmark of the eval pipeline at several scenario counts.
+
+Measures ``create_scenarios`` against a fake crew LLM, ``run_scenario``
+against the time agent wired to a fake LiteLLM model and a fake MCP time
+tool, and loading / converting eval sets. Nothing touches the network, so
+results are comparable between runs and machines with the same settings.
+
+Run with ``python -m benchmarks.bench_pipeline`` from the project root, e.g.
+``python -m benchmarks.bench_pipeline --sizes 10,1000 --llm-latency 0.05``.
+Results are printed and saved as JSON under ``benchmarks/results/``.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from benchmarks.fakes import FakeCrewLLM, fake_time_agent
+from benchmarks.report import default_output_path, print_table, summarize, write_report
+from evaluation.eval_set import EvalSet
+from evaluation.eval_set_stream import (
+    convert_eval_set_file,
+    iter_eval_cases,
+    load_eval_cases,
+)
+from src.creation import main as creation
+from src.creation.scenario_creator import Scenario_Eval_Crew
+from src.models import Scenario, ToolInfo
+from src.runner.scenario_runner import run_scenarios_concurrently
+
+DEFAULT_SIZES = (10, 1_000, 100_000)
+STAGES = ("create", "run", "eval_sets")
+LOOKUPS = 100
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Silence the crew's verbose console output while timing it."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+async def bench_create_scenarios(
+    size: int, llm_latency: float, max_concurrency: int
+) -> dict:
+    """Time ``create_scenarios`` for enough tools to yield ``size`` scenarios.
+
+    Latencies are per crew kickoff (one per tool shard).
+    """
+    per_tool = creation.DEFAULT_SCENARIOS_PER_TOOL
+    tools = [
+        ToolInfo(
+            name=f"tool_{i}",
+            description=f"Benchmark tool number {i}",
+            parameters={"value": "string"},
+        )
+        for i in range(max(1, size // per_tool))
+    ]
+    latencies = []
+    generate = creation._generate_scenarios
+
+    async def timed_generate(shard, num_scenarios):
+        start = time.perf_counter()
+        try:
+            return await generate(shard, num_scenarios)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    with (
+        mock.patch.object(Scenario_Eval_Crew, "llm", FakeCrewLLM(latency=llm_latency)),
+        mock.patch.object(creation, "_generate_scenarios", timed_generate),
+        _quiet(),
+    ):
+        start = time.perf_counter()
+        scenarios = await creation.create_scenarios_async(
+            tools, use_cache=False, max_concurrency=max_concurrency
+        )
+        elapsed = time.perf_counter() - start
+    return summarize(latencies, elapsed, len(scenarios))
+
+
+def time_agent_scenarios(count: int) -> list[Scenario]:
+    """Alternate time questions (expecting the tool) and unrelated chit-chat."""
+    return [
+        Scenario(
+            name=f"scenario_{i}",
+            query=f"What time is it in zone {i}?" if i % 2 == 0 else f"Say hello #{i}",
+            why_its_suitable="Deterministic benchmark scenario",
+            expected_tool_call="get_current_time" if i % 2 == 0 else None,
+        )
+        for i in range(count)
+    ]
+
+
+async def bench_run_scenarios(
+    size: int,
+    llm_latency: float,
+    tool_latency: float,
+    max_concurrency: int,
+    streaming: bool,
+) -> dict:
+    """Time ``run_scenario`` over ``size`` scenarios with bounded concurrency."""
+    agent = fake_time_agent(llm_latency=llm_latency, tool_latency=tool_latency)
+    scenarios = time_agent_scenarios(size)
+    start = time.perf_counter()
+    results = await run_scenarios_concurrently(
+        scenarios, agent, max_concurrency=max_concurrency, streaming=streaming
+    )
+    elapsed = time.perf_counter() - start
+    summary = summarize([r.latency_seconds for r in results], elapsed, len(results))
+    # A correct fake agent passes every scenario; anything else means the
+    # benchmark measured a broken pipeline.
+    summary["pass_rate"] = sum(r.passed for r in results) / len(results)
+    return summary
+
+
+def _eval_case(index: int) -> dict:
+    return {
+        "eval_id": f"case_{index}",
+        "conversation": [
+            {
+                "invocation_id": f"inv-{index}",
+                "user_content": {
+                    "parts": [{"text": f"What time is it in zone {index}?"}],
+                    "role": "user",
+                },
+                "final_response": {
+                    "parts": [{"text": "The current time is 2025-07-13 14:30:00 UTC"}],
+                    "role": "model",
+                },
+                "intermediate_data": {
+                    "tool_uses": [{"args": {}, "name": "get_current_time"}],
+                    "intermediate_responses": [],
+                },
+            }
+        ],
+        "session_input": {"app_name": "time_agent", "user_id": "bench", "state": {}},
+    }
+
+
+def bench_eval_sets(size: int, directory: Path) -> dict[str, dict]:
+    """Time loading a JSON eval set, converting it to JSONL, streaming it and
+    looking up individual cases through the side index."""
+    json_path = directory / f"eval_set_{size}.json"
+    eval_set = EvalSet.model_validate(
+        {
+            "eval_set_id": f"bench_{size}",
+            "name": "Benchmark eval set",
+            "eval_cases": [_eval_case(i) for i in range(size)],
+        }
+    )
+    json_path.write_text(eval_set.model_dump_json(exclude_none=True))
+    del eval_set
+
+    results = {}
+
+    start = time.perf_counter()
+    EvalSet.model_validate_json(json_path.read_bytes())
+    elapsed = time.perf_counter() - start
+    results["load_json"] = summarize([elapsed], elapsed, size)
+
+    start = time.perf_counter()
+    jsonl_path = convert_eval_set_file(json_path)
+    elapsed = time.perf_counter() - start
+    results["convert_to_jsonl"] = summarize([elapsed], elapsed, size)
+
+    start = time.perf_counter()
+    streamed = sum(1 for _ in iter_eval_cases(jsonl_path))
+    elapsed = time.perf_counter() - start
+    results["stream_jsonl"] = summarize([elapsed], elapsed, streamed)
+
+    rng = random.Random(0)
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(LOOKUPS):
+        lookup_start = time.perf_counter()
+        load_eval_cases(jsonl_path, [f"case_{rng.randrange(size)}"])
+        latencies.append(time.perf_counter() - lookup_start)
+    elapsed = time.perf_counter() - start
+    results["indexed_lookup"] = summarize(latencies, elapsed, LOOKUPS)
+    return results
+
+
+async def main(args: argparse.Namespace) -> None:
+    results: dict[str, dict] = {}
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            size_results = results.setdefault(str(size), {})
+            if "create" in args.stages:
+                size_results["create_scenarios"] = await bench_create_scenarios(
+                    size, args.crew_latency, args.max_concurrency
+                )
+                rows.append(
+                    (f"create_scenarios[{size}]", size_results["create_scenarios"])
+                )
+            if "run" in args.stages:
+                size_results["run_scenario"] = await bench_run_scenarios(
+                    size,
+                    args.llm_latency,
+                    args.tool_latency,
+                    args.max_concurrency,
+                    args.streaming,
+                )
+                rows.append((f"run_scenario[{size}]", size_results["run_scenario"]))
+            if "eval_sets" in args.stages:
+                for name, summary in bench_eval_sets(size, Path(tmp)).items():
+                    size_results[name] = summary
+                    rows.append((f"{name}[{size}]", summary))
+
+    print_table(rows)
+    parameters = {
+        key: value if not isinstance(value, tuple) else list(value)
+        for key, value in vars(args).items()
+        if key != "output"
+    }
+    path = write_report(
+        args.output or default_output_path("pipeline"), "pipeline", parameters, results
+    )
+    print(f"Saved results to {path}")
+
+
+def _sizes(value: str) -> tuple[int, ...]:
+    return tuple(int(size) for size in value.split(",") if size.strip())
+
+
+def _stages(value: str) -> tuple[str, ...]:
+    stages = tuple(stage.strip() for stage in value.split(",") if stage.strip())
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown stages: {', '.join(sorted(unknown))}")
+    return stages
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--sizes",
+        type=_sizes,
+        default=DEFAULT_SIZES,
+        help="Comma-separated scenario counts (default: 10,1000,100000)",
+    )
+    parser.add_argument(
+        "--stages",
+        type=_stages,
+        default=STAGES,
+        help=f"Comma-separated stages to run, from {','.join(STAGES)}",
+    )
+    parser.add_argument(
+        "--llm-latency", type=float, default=0.0, help="Seconds per fake LiteLLM call"
+    )
+    parser.add_argument(
+        "--crew-latency", type=float, default=0.0, help="Seconds per fake crew LLM call"
+    )
+    parser.add_argument(
+        "--tool-latency",
+        type=float,
+        default=0.0,
+        help="Seconds per fake MCP time tool call",
+    )
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    parser.add_argument(
+        "--streaming", action="store_true", help="Run scenarios in streaming mode"
+    )
+    parser.add_argument("--output", type=Path, help="Where to save the JSON results")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,81 @@
+"""Micro-benchmark: per-call Runner construction vs the pooled runner.
+
+Run with ``python -m benchmarks.bench_runner_pool`` from the project root.
+"""
+
+import argparse
+import asyncio
+import gc
+import time
+
+from google.genai import types
+from opentelemetry import metrics, trace
+
+from benchmarks.fakes import EchoAgent
+from src.runner.runner_pool import RunnerPool
+from src.runner.scenario_runner import call_agent_async, setup_session_and_runner
+from src.runner.telemetry import configure_telemetry
+
+
+async def call_with_fresh_runner(agent, query, user_id, session_id, app_name):
+    """The original call path: new session service and Runner on every call."""
+    content = types.Content(role="user", parts=[types.Part(text=query)])
+    _, runner = await setup_session_and_runner(agent, app_name, user_id, session_id)
+    events = runner.run_async(
+        user_id=user_id, session_id=session_id, new_message=content
+    )
+    return [event async for event in events]
+
+
+async def measure(call, calls: int) -> float:
+    """Return calls per second for ``calls`` sequential agent calls."""
+    gc.collect()
+    start = time.perf_counter()
+    for i in range(calls):
+        await call(f"session-{i}")
+    return calls / (time.perf_counter() - start)
+
+
+async def measure_untraced(call, calls: int) -> float:
+    """Like :func:`measure`, with the runner's telemetry on no-op providers."""
+    configure_telemetry(trace.NoOpTracerProvider(), metrics.NoOpMeterProvider())
+    try:
+        return await measure(call, calls)
+    finally:
+        configure_telemetry()
+
+
+async def main(calls: int, rounds: int) -> None:
+    agent = EchoAgent(name="echo_agent")
+    pool = RunnerPool()
+
+    def fresh(sid):
+        return call_with_fresh_runner(agent, "hi", "user", sid, "bench")
+
+    def pooled(sid):
+        return call_agent_async(agent, "hi", "user", sid, "bench", runner_pool=pool)
+
+    # The paths are interleaved and each one's best round is reported, so a
+    # noisy neighbour slows every path alike instead of whichever ran last.
+    rates = {"fresh": [], "pooled": [], "untraced": []}
+    for _ in range(rounds):
+        rates["fresh"].append(await measure(fresh, calls))
+        rates["pooled"].append(await measure(pooled, calls))
+        rates["untraced"].append(await measure_untraced(pooled, calls))
+    before, after, untraced = (max(rates[k]) for k in rates)
+
+    print(f"calls:              {calls} x {rounds} rounds")
+    print(f"fresh runner:       {before:,.0f} calls/s")
+    print(f"pooled runner:      {after:,.0f} calls/s")
+    print(f"pooled, no-op OTel: {untraced:,.0f} calls/s")
+    print(f"speedup:            {after / before:.2f}x")
+    print(f"span overhead:      {(1 / after - 1 / untraced) * 1e6:+.1f} us/call")
+    print(f"live sessions left: {pool.live_session_count}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.rounds))
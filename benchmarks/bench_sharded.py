@@ -0,0 +1,89 @@
+"""Benchmark: scenario throughput of the sharded runner by worker count.
+
+Runs the same scenarios against the offline fake time agent on 1, 2, ...
+worker processes and reports scenarios per second and the speedup over the
+first worker count. The fake agent answers instantly, so the work measured
+is the CPU-bound part of a run (event handling, validation, scoring) that
+sharding spreads over cores. Throughput is measured from the first item a
+worker starts to the last one it finishes, so worker start-up (importing
+google-adk) is reported separately rather than diluting it.
+
+Run with ``python -m benchmarks.bench_sharded`` from the project root.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_pipeline import time_agent_scenarios
+from benchmarks.report import default_output_path, write_report
+from src.runner.sharded import WorkQueue, run_sharded
+
+AGENT_SPEC = "benchmarks.fakes:fake_time_agent"
+
+
+def measure(scenarios: int, workers: int, batch_size: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.time()
+        results = run_sharded(
+            time_agent_scenarios(scenarios),
+            AGENT_SPEC,
+            workers=workers,
+            queue_dir=tmp,
+            batch_size=batch_size,
+        )
+        elapsed = time.time() - start
+        work_results = WorkQueue(tmp).work_results()
+
+    assert all(result is not None for result in results)
+    first_start = min(w.started_at for w in work_results)
+    run_seconds = max(w.finished_at for w in work_results) - first_start
+    return {
+        "workers": workers,
+        "elapsed_seconds": elapsed,
+        "startup_seconds": first_start - start,
+        "run_seconds": run_seconds,
+        "scenarios_per_second": scenarios / run_seconds,
+    }
+
+
+def main(args: argparse.Namespace) -> None:
+    results = {}
+    for workers in args.workers:
+        results[str(workers)] = summary = measure(
+            args.scenarios, workers, args.batch_size
+        )
+        base = results[str(args.workers[0])]["scenarios_per_second"]
+        summary["speedup"] = summary["scenarios_per_second"] / base
+        print(
+            f"{workers:>3} workers  {summary['scenarios_per_second']:>9,.0f} scenarios/s"
+            f"  speedup {summary['speedup']:.2f}x"
+            f"  (startup {summary['startup_seconds']:.1f}s)"
+        )
+
+    parameters = {
+        "scenarios": args.scenarios,
+        "workers": args.workers,
+        "batch_size": args.batch_size,
+        "cpu_count": os.cpu_count(),
+    }
+    path = write_report(
+        args.output or default_output_path("sharded"), "sharded", parameters, results
+    )
+    print(f"Saved results to {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenarios", type=int, default=5000)
+    parser.add_argument(
+        "--workers",
+        type=lambda value: [int(n) for n in value.split(",")],
+        default=[1, 2, 4],
+        help="Comma-separated worker counts (default: 1,2,4)",
+    )
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--output", type=Path, help="Where to save the JSON results")
+    main(parser.parse_args())
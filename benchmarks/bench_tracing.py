@@ -0,0 +1,163 @@
+"""Benchmark: per-scenario overhead of each tracing profile.
+
+Each profile runs in its own process, because OpenTelemetry providers can only
+be installed once per process. The ``sampled`` and ``batched`` profiles
+export to a local OTLP/HTTP stand-in that accepts and discards everything, so
+no network access or W&B key is needed.
+
+Run with ``python -m benchmarks.bench_tracing`` from the project root.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from benchmarks.report import default_output_path, print_table, summarize, write_report
+
+PROFILES = ("off", "sampled", "batched", "file", "console")
+WARMUP_SCENARIOS = 20
+
+
+class _CollectorHandler(BaseHTTPRequestHandler):
+    """Accepts OTLP/HTTP export requests and discards them."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-protobuf")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+async def run_worker(scenarios: int, result_path: Path) -> None:
+    """Run scenarios under the tracing profile from the environment."""
+    from opentelemetry import trace
+
+    from src.weave_config import setup_weave_tracing
+
+    # Install the profile's provider before anything imports crewai, which
+    # would otherwise install its own exporting one.
+    setup_weave_tracing()
+
+    from benchmarks.bench_pipeline import time_agent_scenarios
+    from benchmarks.fakes import fake_time_agent
+    from src.runner.scenario_runner import run_scenario
+
+    agent = fake_time_agent()
+    for i, scenario in enumerate(time_agent_scenarios(WARMUP_SCENARIOS)):
+        await run_scenario(scenario, agent, session_id=f"warmup-{i}")
+
+    latencies = []
+    start = time.perf_counter()
+    for i, scenario in enumerate(time_agent_scenarios(scenarios)):
+        result = await run_scenario(scenario, agent, session_id=f"session-{i}")
+        latencies.append(result.latency_seconds)
+    elapsed = time.perf_counter() - start
+    summary = summarize(latencies, elapsed, scenarios)
+    summary["mean_ms"] = sum(latencies) / len(latencies) * 1000
+
+    # Exporting whatever is still buffered is part of the cost of a profile.
+    flush_start = time.perf_counter()
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, "shutdown"):
+        provider.shutdown()
+    summary["flush_seconds"] = time.perf_counter() - flush_start
+    result_path.write_text(json.dumps(summary))
+
+
+def run_profile(profile: str, scenarios: int, endpoint: str, tmp: Path) -> dict:
+    """Run the worker for one profile in a fresh interpreter."""
+    result_path = tmp / f"{profile}.json"
+    env = {
+        **os.environ,
+        "MAGIC_EVAL_TRACING": profile,
+        "MAGIC_EVAL_OTLP_ENDPOINT": endpoint,
+        "MAGIC_EVAL_TRACE_FILE": str(tmp / f"{profile}-spans.jsonl"),
+        "MAGIC_EVAL_TRACE_SAMPLE_RATIO": "0.1",
+    }
+    env.pop("OTEL_SDK_DISABLED", None)
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.bench_tracing",
+            "--worker",
+            "--scenarios",
+            str(scenarios),
+            "--result",
+            str(result_path),
+        ],
+        env=env,
+        check=True,
+        # The console profile prints every span; keep that off the report.
+        stdout=subprocess.DEVNULL,
+    )
+    return json.loads(result_path.read_text())
+
+
+def main(args: argparse.Namespace) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CollectorHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_port}/v1/traces"
+
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for profile in args.profiles:
+                results[profile] = run_profile(
+                    profile, args.scenarios, endpoint, Path(tmp)
+                )
+    finally:
+        server.shutdown()
+
+    baseline = results.get("off")
+    if baseline is not None:
+        for summary in results.values():
+            summary["overhead_ms_per_scenario"] = (
+                summary["mean_ms"] - baseline["mean_ms"]
+            )
+
+    print_table([(f"run_scenario[{profile}]", s) for profile, s in results.items()])
+    for profile, summary in results.items():
+        overhead = summary.get("overhead_ms_per_scenario")
+        print(
+            f"{profile:<10} mean {summary['mean_ms']:.3f} ms"
+            + (f"  overhead {overhead:+.3f} ms/scenario" if overhead is not None else "")
+            + f"  flush {summary['flush_seconds'] * 1000:.1f} ms"
+        )
+
+    parameters = {"scenarios": args.scenarios, "profiles": list(args.profiles)}
+    path = write_report(
+        args.output or default_output_path("tracing"), "tracing", parameters, results
+    )
+    print(f"Saved results to {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenarios", type=int, default=1000)
+    parser.add_argument(
+        "--profiles",
+        type=lambda value: tuple(p.strip() for p in value.split(",") if p.strip()),
+        default=PROFILES,
+        help=f"Comma-separated profiles to compare (default: {','.join(PROFILES)})",
+    )
+    parser.add_argument("--output", type=Path, help="Where to save the JSON results")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--result", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        asyncio.run(run_worker(args.scenarios, args.result))
+    else:
+        main(args)
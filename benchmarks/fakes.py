@@ -0,0 +1,303 @@
+"""Deterministic, offline stand-ins used by the benchmarks.
+
+``FakeLlm`` replaces the LiteLLM model of the example agent, ``FakeTimeTool``
+replaces the MCP time server and ``FakeCrewLLM`` replaces the crewai LLM of the
+scenario crew. Each one takes a ``latency`` in seconds so the benchmarks can
+model slow providers without any network access. ``StubLLMServer`` is a local
+OpenAI-compatible endpoint for measuring the real HTTP path instead.
+"""
+
+import asyncio
+import json
+import re
+import ssl
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.tools.base_tool import BaseTool
+from google.genai import types
+
+FIXED_DATETIME = "2025-07-13T14:30:00+00:00"
+TIME_KEYWORDS = ("time", "clock", "hour", "timezone")
+
+_TOOL_NAME = re.compile(r"""["']name["']\s*:\s*["']([^"']+)["']""")
+_NUM_SCENARIOS = re.compile(r"Only create (\d+) scenarios")
+
+
+class EchoAgent(BaseAgent):
+    """Agent that answers every message with a single text event, no LLM involved."""
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            content=types.Content(role="model", parts=[types.Part(text="ok")]),
+        )
+
+
+class FakeLlm(BaseLlm):
+    """ADK model that calls ``get_current_time`` for time questions and answers
+    everything else directly."""
+
+    model: str = "fake/time-model"
+    latency: float = 0.0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        last = llm_request.contents[-1] if llm_request.contents else None
+        parts = (last.parts or []) if last is not None else []
+        tool_result = next(
+            (p.function_response for p in parts if p.function_response), None
+        )
+        text = " ".join(p.text for p in parts if p.text).lower()
+
+        if tool_result is not None:
+            answer = types.Part(text=f"It is {tool_result.response} right now.")
+        elif "get_current_time" in llm_request.tools_dict and any(
+            keyword in text for keyword in TIME_KEYWORDS
+        ):
+            answer = types.Part(
+                function_call=types.FunctionCall(
+                    name="get_current_time", args={"timezone": "UTC"}
+                )
+            )
+        else:
+            answer = types.Part(text="I can only help with questions about time.")
+
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[answer]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=len(text.split()) + 50,
+                candidates_token_count=10,
+            ),
+        )
+
+
+class FakeTimeTool(BaseTool):
+    """In-process stand-in for the ``get_current_time`` tool of mcp_server_time."""
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(
+            name="get_current_time",
+            description="Get the current time in a specific timezone",
+        )
+        self.latency = latency
+
+    def _get_declaration(self) -> Optional[types.FunctionDeclaration]:
+        return types.FunctionDeclaration(
+            name=self.name,
+            description=self.description,
+            parameters=types.Schema(
+                type=types.Type.OBJECT,
+                properties={"timezone": types.Schema(type=types.Type.STRING)},
+                required=["timezone"],
+            ),
+        )
+
+    async def run_async(self, *, args: dict[str, Any], tool_context) -> Any:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return {
+            "timezone": args.get("timezone", "UTC"),
+            "datetime": FIXED_DATETIME,
+            "is_dst": False,
+        }
+
+
+def fake_time_agent(llm_latency: float = 0.0, tool_latency: float = 0.0) -> LlmAgent:
+    """Return the example time agent wired to the fake model and time tool."""
+    return LlmAgent(
+        name="time_agent",
+        model=FakeLlm(latency=llm_latency),
+        instruction="You are a helpful assistant.",
+        tools=[FakeTimeTool(latency=tool_latency)],
+    )
+
+
+def _define_fake_crew_llm() -> type:
+    # crewai takes seconds to import and installs its own tracer provider, so
+    # only benchmarks that drive the scenario crew load it (see __getattr__).
+    from crewai.llms.base_llm import BaseLLM
+
+    class FakeCrewLLM(BaseLLM):
+        """crewai LLM that answers the scenario task with scenarios built from the
+        tool names found in the prompt."""
+
+        def __init__(self, latency: float = 0.0):
+            super().__init__(model="fake/scenario-model")
+            self.latency = latency
+
+        def call(
+            self,
+            messages,
+            tools=None,
+            callbacks=None,
+            available_functions=None,
+            from_task=None,
+            from_agent=None,
+        ) -> str:
+            if self.latency:
+                # crewai runs kickoff_async in a worker thread, so block like a
+                # synchronous HTTP client would.
+                time.sleep(self.latency)
+
+            if isinstance(messages, str):
+                prompt = messages
+            else:
+                prompt = "\n".join(str(m.get("content", "")) for m in messages)
+            tool_names = list(dict.fromkeys(_TOOL_NAME.findall(prompt))) or [None]
+            match = _NUM_SCENARIOS.search(prompt)
+            count = int(match.group(1)) if match else len(tool_names)
+
+            scenarios = []
+            for i in range(count):
+                # Each tool gets a positive case that expects it, then a negative
+                # case that expects no tool call.
+                tool_name = tool_names[(i // 2) % len(tool_names)]
+                expected = tool_name if i % 2 == 0 else None
+                scenarios.append(
+                    {
+                        "name": f"{tool_name}_scenario_{i}",
+                        "query": f"Scenario {i}: please use {tool_name}"
+                        if expected
+                        else f"Scenario {i}: tell me a fact unrelated to {tool_name}",
+                        "why_its_suitable": "Deterministic benchmark scenario",
+                        "expected_tool_call": expected,
+                    }
+                )
+            return (
+                "Thought: I now know the final answer\n"
+                f"Final Answer: {json.dumps({'scenarios': scenarios})}"
+            )
+
+        def supports_function_calling(self) -> bool:
+            return False
+
+    return FakeCrewLLM
+
+
+def __getattr__(name):
+    if name == "FakeCrewLLM":
+        globals()[name] = _define_fake_crew_llm()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def chat_completion(content: str) -> dict:
+    """Return an OpenAI chat completion response body."""
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "stub-model",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    }
+
+
+class StubLLMServer:
+    """
+    Local OpenAI-compatible chat endpoint that answers "hi".
+
+    It keeps connections alive (HTTP/1.1) and counts them, can serve TLS, and
+    answers 429 with a ``Retry-After`` above ``capacity`` concurrent requests
+    or for the next ``fail_next`` requests, like a provider enforcing a quota.
+    """
+
+    def __init__(
+        self,
+        capacity: Optional[int] = None,
+        latency: float = 0.0,
+        retry_after: str = "0.05",
+        certfile: Optional[str] = None,
+        keyfile: Optional[str] = None,
+    ):
+        self.capacity = capacity
+        self.fail_next = 0
+        self.in_flight = 0
+        self.ok = 0
+        self.throttled = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                with server._lock:
+                    server.in_flight += 1
+                    over_quota = server.fail_next > 0 or (
+                        capacity is not None and server.in_flight > capacity
+                    )
+                    server.fail_next = max(0, server.fail_next - 1)
+                try:
+                    if over_quota:
+                        with server._lock:
+                            server.throttled += 1
+                        self._send(429, {"error": {"message": "Rate limit exceeded"}})
+                    else:
+                        if latency:
+                            time.sleep(latency)
+                        with server._lock:
+                            server.ok += 1
+                        self._send(200, chat_completion("hi"))
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+            def _send(self, status: int, body: dict) -> None:
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                if status == 429:
+                    self.send_header("Retry-After", retry_after)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        scheme = "http"
+        if certfile:
+            context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            context.load_cert_chain(certfile, keyfile)
+            self._server.socket = context.wrap_socket(
+                self._server.socket, server_side=True
+            )
+            scheme = "https"
+        self.api_base = f"{scheme}://127.0.0.1:{self._server.server_port}/v1"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
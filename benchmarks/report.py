@@ -0,0 +1,106 @@
+"""Shared helpers for summarizing benchmark timings and saving them as JSON."""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Sequence, Union
+
+import numpy as np
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def summarize(latencies: Sequence[float], elapsed: float, items: int) -> dict[str, Any]:
+    """
+    Summarize one benchmark measurement.
+
+    Args:
+        latencies: Per-operation latencies in seconds
+        elapsed: Wall-clock seconds for the whole measurement
+        items: Number of items processed, used for the throughput
+
+    Returns:
+        dict[str, Any]: Throughput in items per second and latency
+            percentiles in milliseconds
+    """
+    values = np.asarray(latencies, dtype=np.float64) * 1000
+    p50, p95, p99 = (
+        np.percentile(values, (50, 95, 99)).tolist() if len(values) else [None] * 3
+    )
+    return {
+        "items": items,
+        "operations": len(values),
+        "elapsed_seconds": elapsed,
+        "throughput_per_second": items / elapsed if elapsed > 0 else None,
+        "p50_ms": p50,
+        "p95_ms": p95,
+        "p99_ms": p99,
+    }
+
+
+def _git_commit() -> Union[str, None]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict[str, Any]:
+    """Describe where a benchmark ran, so saved results can be compared fairly."""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def default_output_path(name: str) -> Path:
+    """Return a timestamped results path for a benchmark run."""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return RESULTS_DIR / f"{name}-{stamp}.json"
+
+
+def write_report(
+    path: Union[str, Path], benchmark: str, parameters: dict, results: Any
+) -> Path:
+    """Write benchmark results with their parameters and environment as JSON."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "benchmark": benchmark,
+        "environment": environment(),
+        "parameters": parameters,
+        "results": results,
+    }
+    path.write_text(json.dumps(report, indent=2) + "\n")
+    return path
+
+
+def print_table(rows: list[tuple[str, dict[str, Any]]]) -> None:
+    """Print summaries as an aligned table."""
+    print(
+        f"{'benchmark':<36} {'items':>8} {'items/s':>12} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    )
+    for label, row in rows:
+        throughput = row["throughput_per_second"]
+        cells = [
+            f"{row[key]:>9.3f}" if row[key] is not None else f"{'-':>9}"
+            for key in ("p50_ms", "p95_ms", "p99_ms")
+        ]
+        print(
+            f"{label:<36} {row['items']:>8} "
+            f"{throughput if throughput is not None else 0:>12,.1f} {' '.join(cells)}"
+        )
@@ -0,0 +1,247 @@
+"""Streaming JSON-lines eval sets with an eval_id -> byte-offset side index.
+
+A JSONL eval set holds the eval set fields (without ``eval_cases``) on the
+first line and one ``EvalCase`` per following line. Next to it,
+``<path>.idx`` is a binary index sorted by a 64-bit hash of each eval_id, so
+looking up a handful of cases is a binary search over a memory-mapped file
+plus one seek per case, whatever the size of the set.
+
+The eval case models depend on ``google.genai``, which is slow to import, so
+they are only imported by the functions that build ``EvalCase`` objects;
+indexing and listing eval ids stay cheap.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional, Union
+
+if TYPE_CHECKING:
+    from .eval_case import EvalCase
+    from .eval_set import EvalSet
+
+INDEX_SUFFIX = ".idx"
+_INDEX_MAGIC = b"MEVALIDX1\0"
+# Index header: magic, source file size, source mtime (ns), entry count.
+_INDEX_HEADER = struct.Struct(f"<{len(_INDEX_MAGIC)}sqqq")
+# Index entry: eval_id hash, byte offset of the case's line.
+_INDEX_ENTRY = struct.Struct("<QQ")
+
+
+def _eval_id_hash(eval_id: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(eval_id.encode(), digest_size=8).digest(), "little"
+    )
+
+
+def index_path(path: Union[str, Path]) -> Path:
+    """Return the side index location for a JSONL eval set."""
+    path = Path(path)
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def write_eval_set_jsonl(
+    eval_set: Union[EvalSet, dict[str, Any]], path: Union[str, Path]
+) -> Path:
+    """
+    Write an eval set as JSON lines and build its side index.
+
+    Args:
+        eval_set: An EvalSet or a dict in the eval set JSON layout
+        path: Where to write the ``.jsonl`` file
+
+    Returns:
+        Path: The path of the written file
+    """
+    from .eval_set import EvalSet
+
+    if isinstance(eval_set, dict):
+        eval_set = EvalSet.model_validate(eval_set)
+    path = Path(path)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(eval_set.model_dump_json(exclude={"eval_cases"}, exclude_none=True))
+        f.write("\n")
+        for eval_case in eval_set.eval_cases:
+            f.write(eval_case.model_dump_json(exclude_none=True))
+            f.write("\n")
+    build_index(path)
+    return path
+
+
+def convert_eval_set_file(
+    json_path: Union[str, Path], jsonl_path: Optional[Union[str, Path]] = None
+) -> Path:
+    """Convert a single-document eval set JSON file to the JSONL format."""
+    from .eval_set import EvalSet
+
+    json_path = Path(json_path)
+    if jsonl_path is None:
+        jsonl_path = json_path.with_suffix(".jsonl")
+    eval_set = EvalSet.model_validate_json(json_path.read_bytes())
+    return write_eval_set_jsonl(eval_set, jsonl_path)
+
+
+def read_eval_set_header(path: Union[str, Path]) -> EvalSet:
+    """Return the eval set fields of a JSONL eval set, with no eval cases."""
+    from .eval_set import EvalSet
+
+    with open(path, "rb") as f:
+        header = json.loads(f.readline())
+    header["eval_cases"] = []
+    return EvalSet.model_validate(header)
+
+
+def iter_eval_cases(path: Union[str, Path]) -> Iterator[EvalCase]:
+    """Yield the eval cases of a JSONL eval set one at a time."""
+    from .eval_case import EvalCase
+
+    with open(path, "rb") as f:
+        f.readline()
+        for line in f:
+            if line.strip():
+                yield EvalCase.model_validate_json(line)
+
+
+def iter_eval_ids(path: Union[str, Path]) -> Iterator[str]:
+    """Yield the eval_ids of a JSONL eval set without building eval cases."""
+    with open(path, "rb") as f:
+        f.readline()
+        for line in f:
+            if line.strip():
+                yield json.loads(line)["eval_id"]
+
+
+def build_index(path: Union[str, Path]) -> Path:
+    """Scan a JSONL eval set and write its eval_id -> offset side index."""
+    path = Path(path)
+    entries = []
+    with open(path, "rb") as f:
+        f.readline()
+        offset = f.tell()
+        for line in f:
+            if line.strip():
+                eval_id = json.loads(line)["eval_id"]
+                entries.append((_eval_id_hash(eval_id), offset))
+            offset += len(line)
+    entries.sort()
+
+    stat = path.stat()
+    target = index_path(path)
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(
+            _INDEX_HEADER.pack(_INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, len(entries))
+        )
+        for entry in entries:
+            f.write(_INDEX_ENTRY.pack(*entry))
+    os.replace(tmp_path, target)
+    return target
+
+
+def _index_is_current(path: Path) -> bool:
+    try:
+        with open(index_path(path), "rb") as f:
+            header = f.read(_INDEX_HEADER.size)
+    except FileNotFoundError:
+        return False
+    if len(header) < _INDEX_HEADER.size:
+        return False
+    magic, size, mtime_ns, _ = _INDEX_HEADER.unpack(header)
+    stat = path.stat()
+    return (
+        magic == _INDEX_MAGIC and size == stat.st_size and mtime_ns == stat.st_mtime_ns
+    )
+
+
+def _candidate_offsets(index: mmap.mmap, count: int, key: int) -> Iterator[int]:
+    """Binary-search the index for every entry with the given hash."""
+    start = _INDEX_HEADER.size
+    lo, hi = 0, count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        mid_key, _ = _INDEX_ENTRY.unpack_from(index, start + mid * _INDEX_ENTRY.size)
+        if mid_key < key:
+            lo = mid + 1
+        else:
+            hi = mid
+    while lo < count:
+        entry_key, offset = _INDEX_ENTRY.unpack_from(
+            index, start + lo * _INDEX_ENTRY.size
+        )
+        if entry_key != key:
+            return
+        yield offset
+        lo += 1
+
+
+def load_eval_cases(
+    path: Union[str, Path], eval_ids: Iterable[str]
+) -> list[EvalCase]:
+    """
+    Load selected eval cases from a JSONL eval set via its side index.
+
+    The index is (re)built first if it is missing or older than the file.
+
+    Args:
+        path: The JSONL eval set
+        eval_ids: The eval_ids to load
+
+    Returns:
+        list[EvalCase]: The cases, in the order of ``eval_ids``
+
+    Raises:
+        KeyError: If an eval_id is not in the eval set
+    """
+    from .eval_case import EvalCase
+
+    path = Path(path)
+    if not _index_is_current(path):
+        build_index(path)
+
+    cases = []
+    with open(index_path(path), "rb") as index_file, open(path, "rb") as f:
+        count = _INDEX_HEADER.unpack(index_file.read(_INDEX_HEADER.size))[3]
+        if count == 0:
+            index = None
+        else:
+            index = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            for eval_id in eval_ids:
+                offsets = (
+                    _candidate_offsets(index, count, _eval_id_hash(eval_id))
+                    if index is not None
+                    else ()
+                )
+                for offset in offsets:
+                    f.seek(offset)
+                    eval_case = EvalCase.model_validate_json(f.readline())
+                    # Hashes can collide, so confirm the id on the case itself.
+                    if eval_case.eval_id == eval_id:
+                        cases.append(eval_case)
+                        break
+                else:
+                    raise KeyError(f"eval_id {eval_id!r} not found in {path}")
+        finally:
+            if index is not None:
+                index.close()
+    return cases
+
+
+def load_eval_selection(spec: str) -> Iterator[EvalCase]:
+    """
+    Yield eval cases for a ``path`` or ``path:eval_id,eval_id`` selection.
+
+    This is the selection syntax used by ``AgentEvaluator.evaluate``. Without
+    eval_ids every case is streamed; with eval_ids only those are read.
+    """
+    path, _, selected = spec.partition(":")
+    if not selected:
+        yield from iter_eval_cases(path)
+        return
+    eval_ids = [eval_id.strip() for eval_id in selected.split(",") if eval_id.strip()]
+    yield from load_eval_cases(path, eval_ids)
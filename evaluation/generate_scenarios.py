@@ -147,7 +147,11 @@ def create_time_agent_scenarios() -> List[Dict[str, Any]]:
     return scenarios
 
 def create_evaluation_file(scenarios: List[Dict[str, Any]], output_path: str):
-    """Create a complete evaluation file with the given scenarios."""
+    """Create a complete evaluation file with the given scenarios.
+
+    A ``.jsonl`` output path writes the streaming JSON-lines format (with its
+    eval_id index) instead of a single JSON document.
+    """
     eval_set = {
         "eval_set_id": "time_agent_comprehensive_evaluation",
         "name": "Time Agent Comprehensive Evaluation",
@@ -155,8 +159,13 @@ def create_evaluation_file(scenarios: List[Dict[str, Any]], output_path: str):
         "eval_cases": scenarios
     }
     
-    with open(output_path, 'w') as f:
-        json.dump(eval_set, f, indent=2)
+    if output_path.endswith(".jsonl"):
+        from evaluation.eval_set_stream import write_eval_set_jsonl
+
+        write_eval_set_jsonl(eval_set, output_path)
+    else:
+        with open(output_path, 'w') as f:
+            json.dump(eval_set, f, indent=2)
     
     print(f"Created evaluation file: {output_path}")
 
@@ -1,40 +1,91 @@
-"""Example agent implementation using Google ADK with MCP toolset and Weave tracing."""
+"""Example agent implementation using Google ADK with MCP toolset and Weave tracing.
+
+Nothing heavy happens at import time: ``root_agent``, ``MCP_TIME_SERVER``,
+``tracer`` and ``llama_completion`` are built on first access, so importing
+this module does not pull in google-adk, LiteLLM or Weave, and does not set
+up tracing.
+"""
+
+from functools import cache
 
-import os
 from dotenv import load_dotenv
-from google.adk.agents import LlmAgent
-from google.adk.models.lite_llm import LiteLlm
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioServerParameters
-from src.weave_config import setup_weave_tracing, create_weave_op
 
 # Load environment variables
 load_dotenv()
 
-# Set up Weave tracing
-tracer = setup_weave_tracing()
+LLAMA_MODEL = "Llama-3.3-70B-Instruct"
+
+_LAZY_ATTRIBUTES = ("root_agent", "MCP_TIME_SERVER", "tracer", "llama_completion")
+
+
+@cache
+def get_tracer():
+    """Set up Weave tracing once and return the agent's tracer."""
+    from src.weave_config import setup_weave_tracing
+
+    return setup_weave_tracing()
 
-MCP_TIME_SERVER = MCPToolset(
-    connection_params=StdioServerParameters(
-        command="python", args=["-m", "mcp_server_time"]
+
+def create_mcp_time_server():
+    """Create the MCP toolset backed by the ``mcp_server_time`` server.
+
+    The server processes are pooled and shared by every run (see
+    ``src.runner.mcp_pool``); ``MAGIC_EVAL_MCP_POOL_SIZE`` sets how many.
+    """
+    from mcp import StdioServerParameters
+
+    from src.runner.mcp_pool import PooledMCPToolset
+
+    return PooledMCPToolset(
+        connection_params=StdioServerParameters(
+            command="python", args=["-m", "mcp_server_time"]
+        )
     )
-)
 
-LLAMA_MODEL = "Llama-3.3-70B-Instruct"
 
-# Configure environment variables for the model
-os.environ["LLAMA_API_KEY"] = os.getenv("LLAMA_API_KEY")
-os.environ["WANDB_API_KEY"] = os.getenv("WANDB_API_KEY")
+def create_root_agent(tools=None):
+    """
+    Build the time agent.
+
+    Args:
+        tools: Tools to give the agent. Defaults to the shared MCP time server.
 
+    Returns:
+        LlmAgent: A new agent instance
+    """
+    from google.adk.agents import LlmAgent
+    from src.runner.llm_client import get_lite_llm
 
-# Create a custom completion function that uses your specific model with Weave tracing
-@create_weave_op
-def llama_completion(messages, **kwargs):
-    with tracer.start_as_current_span("llama_completion") as span:
+    get_tracer()
+    return LlmAgent(
+        model=get_lite_llm(f"meta_llama/{LLAMA_MODEL}"),
+        name="time_agent",
+        instruction="You are a helpful assistant.",
+        tools=[get_mcp_time_server()] if tools is None else tools,
+    )
+
+
+@cache
+def get_mcp_time_server():
+    """Return the shared MCP time server toolset."""
+    return create_mcp_time_server()
+
+
+@cache
+def get_root_agent():
+    """Return the shared time agent, building it on first use."""
+    return create_root_agent()
+
+
+def _llama_completion(messages, **kwargs):
+    from src.runner.llm_client import get_lite_llm
+
+    with get_tracer().start_as_current_span("llama_completion") as span:
         span.set_attribute("model", LLAMA_MODEL)
         span.set_attribute("messages_count", len(messages))
 
-        # Create LiteLLM model instance
-        model = LiteLlm(model=f"meta_llama/{LLAMA_MODEL}")
+        # Shared model instance, so calls reuse its pooled connections
+        model = get_lite_llm(f"meta_llama/{LLAMA_MODEL}")
 
         # Use the model's completion method
         result = model.complete(messages=messages, **kwargs)
@@ -43,9 +94,26 @@ def llama_completion(messages, **kwargs):
         return result
 
 
-root_agent = LlmAgent(
-    model=LiteLlm(model=f"meta_llama/{LLAMA_MODEL}"),
-    name="time_agent",
-    instruction="You are a helpful assistant.",
-    tools=[MCP_TIME_SERVER],
-)
+@cache
+def _weave_llama_completion():
+    from src.weave_config import create_weave_op
+
+    # Create a custom completion function that uses your specific model with
+    # Weave tracing
+    return create_weave_op(_llama_completion)
+
+
+def __getattr__(name):
+    if name == "root_agent":
+        return get_root_agent()
+    if name == "MCP_TIME_SERVER":
+        return get_mcp_time_server()
+    if name == "tracer":
+        return get_tracer()
+    if name == "llama_completion":
+        return _weave_llama_completion()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
@@ -1,60 +1,150 @@
-# 1. Get tools from agent
+"""Generate scenarios for the example agent, review them and run the kept ones.
+
+The three steps overlap: accepted scenarios run while later ones are still
+being generated and reviewed (see ``src.pipeline``).
+
+Heavy dependencies (crewai, google-adk, LiteLLM) are only imported inside
+the steps that need them, so importing this module is cheap.
+"""
 
-from src.models import ToolInfo
-from src.runner.scenario_runner import run_scenario
-from src.creation.main import create_scenarios
-from rich.console import Console
 import asyncio
+import os
+
+from rich.console import Console
+
+from src.models import ToolInfo
 
 console = Console()
 
-tool_info = [
-    ToolInfo(
-        name="get_current_time",
-        description="Get the current time",
-        parameters={"timezone": "string"},
-    ),
-    ToolInfo(
-        name="get_current_time",
-        description="Get the current time",
-        parameters={"timezone": "string"},
-    ),
-]
-
-
-# 2. Create scenarios
-scenarios = create_scenarios(tool_info)
-
-# Pretty print scenario and allow user to select yes or not
-final_scenarios = []
-
-for scenario in scenarios:
-    console.print(scenario)
-    user_input = console.input("Do you want to keep this scenario? (y/n): ")
-    if user_input == "y":
-        final_scenarios.append(scenario)
-    else:
-        console.print(f"Skipping scenario: {scenario.name}")
+RESULTS_PATH = ".magic_eval_cache/run_results.npz"
+
+# MAGIC_EVAL_FAIL_FAST=1 stops starting scenarios after the first failure;
+# MAGIC_EVAL_TIME_BUDGET=<minutes> runs only as much as fits in the budget.
+FAIL_FAST_ENV = "MAGIC_EVAL_FAIL_FAST"
+TIME_BUDGET_ENV = "MAGIC_EVAL_TIME_BUDGET"
+# MAGIC_EVAL_AUTO_ACCEPT=1 accepts generated scenarios by rule instead of
+# asking about each one.
+AUTO_ACCEPT_ENV = "MAGIC_EVAL_AUTO_ACCEPT"
+
+
+async def discover_agent_tools() -> list[ToolInfo]:
+    """Resolve the example agent's tools, including those of its MCP server."""
+    from example_agent.agent import root_agent
+    from src.creation.get_tools import discover_tools
+    from src.runner.mcp_pool import close_mcp_server_pools
+
+    try:
+        return (await discover_tools(root_agent)).tools
+    finally:
+        await close_mcp_server_pools()
 
-from example_agent.agent import root_agent
 
+def _print_result(result) -> None:
+    console.print(
+        f"{result.scenario_name}: {result.passed} "
+        f"({result.latency_seconds:.2f}s, tools: {result.tool_calls})"
+        + (
+            f" [cached from run {result.provenance.run_id}"
+            f" on {result.provenance.host}]"
+            if result.provenance
+            else ""
+        )
+    )
 
-async def run_scenarios():
-    # 3. Run scenarios
-    results = []
-    for scenario in final_scenarios:
-        console.print(f"Running scenario: {scenario.name}")
-        result = await run_scenario(scenario, root_agent)
-        results.append(result)
 
-    console.print("--------------------------------")
-    console.print("Results:")
-    console.print("--------------------------------")
+def _auto_accept() -> bool:
+    return os.getenv(AUTO_ACCEPT_ENV, "").lower() in ("1", "true", "yes")
+
+
+async def evaluate(tools: list[ToolInfo]) -> None:
+    """
+    Generate, review and run scenarios for the tools as one pipeline.
+
+    Scenarios start running as soon as they are accepted, while later ones are
+    still being generated or reviewed.
+    """
+    from example_agent.agent import root_agent
+    from src.creation.incremental import iter_scenario_batches_incremental
+    from src.pipeline import AutoAcceptReviewer, InteractiveReviewer, run_pipeline
+    from src.runner.mcp_pool import close_mcp_server_pools
+    from src.runner.prioritization import ScenarioHistory
+    from src.runner.result_cache import default_result_cache, refresh_requested
+    from src.runner.results_table import ResultsTable
+    from src.runner.tool_stubs import stub_agent, stub_tools_enabled
+
+    agent = root_agent
+    if stub_tools_enabled():
+        # Only tool selection is scored, so the real tools can be faked. Every
+        # agent in the tree keeps its own tools; the discovered ones only
+        # provide the declarations.
+        agent = stub_agent(root_agent, tools)
+
+    if _auto_accept():
+        reviewer = AutoAcceptReviewer(tool.name for tool in tools)
+    else:
+        reviewer = InteractiveReviewer(console)
+    fail_fast = os.getenv(FAIL_FAST_ENV, "").lower() in ("1", "true", "yes")
+    budget_minutes = os.getenv(TIME_BUDGET_ENV)
+    history = ScenarioHistory.load()
+
+    # 2.-3. Create, review and run scenarios. Recently failed, then flaky,
+    # then slow scenarios go first among those waiting to run, and every
+    # result is printed as soon as it is known.
+    try:
+        outcome = await run_pipeline(
+            # Only tools that are new or changed since the last run are sent
+            # to the crew; the others' scenarios come from the manifest.
+            iter_scenario_batches_incremental(tools),
+            agent,
+            reviewer,
+            streaming=True,
+            result_cache=default_result_cache(),
+            refresh=refresh_requested(),
+            fail_fast=fail_fast,
+            time_budget_seconds=float(budget_minutes) * 60 if budget_minutes else None,
+            on_result=lambda index, result: _print_result(result),
+            tools=tools,
+            history=history,
+        )
+    finally:
+        await close_mcp_server_pools()
+    history.record(outcome.accepted, outcome.results)
+    history.save()
+
     # 4. Evaluate scenarios
-    for result in results:
-        console.print(result)
+    if outcome.duplicates:
+        console.print(f"Removed {outcome.duplicates} near-duplicate scenarios")
+    console.print(
+        f"Accepted {len(outcome.accepted)} scenarios, "
+        f"rejected {len(outcome.rejected)}"
+    )
+    for name, reason in getattr(reviewer, "rejections", {}).items():
+        console.print(f"Rejected {name}: {reason}")
+    ran = [result for result in outcome.results if result is not None]
+    if len(ran) < len(outcome.results):
+        console.print(f"Skipped {len(outcome.results) - len(ran)} scenarios")
+    if not ran:
+        return
+
+    table = ResultsTable.from_results(ran)
+    latency = table.latency_percentiles((50, 95))
+    console.print(
+        f"Pass rate: {table.pass_rate():.0%} | "
+        f"p50 {latency[50]:.2f}s | p95 {latency[95]:.2f}s"
+    )
+    table.save(RESULTS_PATH)
+
+
+def main():
+    from src.llm_clients import close_llm_clients
+
+    # 1. Get tools from agent (cached per agent config)
+    tools = asyncio.run(discover_agent_tools())
+    try:
+        asyncio.run(evaluate(tools))
+    finally:
+        close_llm_clients()
 
 
-# Run the async function
 if __name__ == "__main__":
-    asyncio.run(run_scenarios())
+    main()
@@ -0,0 +1,257 @@
+"""Near-duplicate scenario detection with MinHash and locality-sensitive hashing."""
+
+import re
+import zlib
+from collections import defaultdict
+from typing import Optional
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from src.models import Scenario
+
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_NUM_PERM = 32
+DEFAULT_BANDS = 8
+SHINGLE_SIZE = 3
+
+# Permutations are (a * x + b) mod p with p = 2**31 - 1, which keeps every
+# intermediate product inside int64.
+_MERSENNE_PRIME = (1 << 31) - 1
+_SIGNATURE_CHUNK = 4096
+_NON_WORD = re.compile(r"[^\w\s]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class DuplicateGroup(BaseModel):
+    """A scenario that was kept and the near-duplicates collapsed into it."""
+
+    kept: Scenario = Field(..., description="The scenario that will be run")
+    duplicates: list[Scenario] = Field(
+        ..., description="Near-duplicates of the kept scenario that were dropped"
+    )
+
+
+class DedupResult(BaseModel):
+    """Outcome of deduplicating a scenario list."""
+
+    scenarios: list[Scenario] = Field(..., description="Scenarios left to run")
+    groups: list[DuplicateGroup] = Field(
+        ..., description="Every kept scenario that absorbed at least one duplicate"
+    )
+
+    @property
+    def runs_saved(self) -> int:
+        """Number of agent runs avoided by dropping duplicates."""
+        return sum(len(group.duplicates) for group in self.groups)
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase a query and strip punctuation and extra whitespace."""
+    return _WHITESPACE.sub(" ", _NON_WORD.sub(" ", query.lower())).strip()
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[int]:
+    """Return the hashed character shingles of a normalized text."""
+    if len(text) <= size:
+        return {zlib.crc32(text.encode())}
+    return {zlib.crc32(text[i : i + size].encode()) for i in range(len(text) - size + 1)}
+
+
+def jaccard(a: set[int], b: set[int]) -> float:
+    """Return the Jaccard similarity of two shingle sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """Computes fixed-size MinHash signatures with deterministic permutations."""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, _MERSENNE_PRIME, size=(num_perm, 1), dtype=np.int64)
+        self.b = rng.integers(0, _MERSENNE_PRIME, size=(num_perm, 1), dtype=np.int64)
+
+    def signatures(self, shingle_sets: list[set[int]]) -> np.ndarray:
+        """
+        Return the MinHash signatures of many shingle sets at once.
+
+        Args:
+            shingle_sets: Non-empty shingle sets
+
+        Returns:
+            np.ndarray: A (len(shingle_sets), num_perm) array of signatures
+        """
+        result = np.empty((len(shingle_sets), len(self.a)), dtype=np.int64)
+        for start in range(0, len(shingle_sets), _SIGNATURE_CHUNK):
+            chunk = shingle_sets[start : start + _SIGNATURE_CHUNK]
+            lengths = np.fromiter((len(s) for s in chunk), dtype=np.int64)
+            values = np.fromiter(
+                (x for s in chunk for x in s), dtype=np.int64, count=int(lengths.sum())
+            )
+            hashed = (self.a * (values % _MERSENNE_PRIME) + self.b) % _MERSENNE_PRIME
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            result[start : start + len(chunk)] = np.minimum.reduceat(
+                hashed, offsets, axis=1
+            ).T
+        return result
+
+
+def _find(parents: list[int], i: int) -> int:
+    while parents[i] != i:
+        parents[i] = parents[parents[i]]
+        i = parents[i]
+    return i
+
+
+def deduplicate_scenarios(
+    scenarios: list[Scenario],
+    threshold: float = DEFAULT_THRESHOLD,
+    num_perm: int = DEFAULT_NUM_PERM,
+    bands: int = DEFAULT_BANDS,
+    hasher: Optional[MinHasher] = None,
+) -> DedupResult:
+    """
+    Collapse scenarios whose queries are near-duplicates.
+
+    Scenarios are only compared with others that expect the same tool call.
+    Candidate pairs come from MinHash LSH buckets, so the cost grows roughly
+    linearly with the number of scenarios, and each candidate is confirmed
+    with the exact Jaccard similarity of the query shingles. The first
+    scenario of each duplicate cluster (in input order) is kept.
+
+    Args:
+        scenarios: Scenarios to deduplicate
+        threshold: Minimum Jaccard similarity for two queries to be duplicates
+        num_perm: Number of MinHash permutations
+        bands: Number of LSH bands; ``num_perm`` must be divisible by it
+        hasher: MinHasher to reuse across calls
+
+    Returns:
+        DedupResult: The scenarios to run and the duplicate groups
+    """
+    if num_perm % bands:
+        raise ValueError("num_perm must be divisible by bands")
+    rows = num_perm // bands
+    hasher = hasher or MinHasher(num_perm)
+
+    shingle_sets = [shingles(normalize_query(s.query)) for s in scenarios]
+    parents = list(range(len(scenarios)))
+
+    by_tool: dict[Optional[str], list[int]] = defaultdict(list)
+    for index, scenario in enumerate(scenarios):
+        by_tool[scenario.expected_tool_call].append(index)
+
+    signatures = hasher.signatures(shingle_sets)
+    band_keys = [
+        [row[band * rows : (band + 1) * rows].tobytes() for band in range(bands)]
+        for row in signatures
+    ]
+
+    for indices in by_tool.values():
+        buckets: dict[tuple, list[int]] = defaultdict(list)
+        for index in indices:
+            for band, band_key in enumerate(band_keys[index]):
+                buckets[(band, band_key)].append(index)
+
+        for bucket in buckets.values():
+            # Compare each member with one representative per cluster seen in
+            # this bucket rather than with every other member, so buckets full
+            # of copies of the same query stay linear.
+            representatives: list[int] = []
+            for i in bucket:
+                for r in representatives:
+                    root_i, root_r = _find(parents, i), _find(parents, r)
+                    if root_i == root_r:
+                        break
+                    if jaccard(shingle_sets[i], shingle_sets[r]) >= threshold:
+                        # Keep the earliest scenario as the cluster root.
+                        parents[max(root_i, root_r)] = min(root_i, root_r)
+                        break
+                else:
+                    representatives.append(i)
+
+    kept = []
+    duplicates: dict[int, list[Scenario]] = defaultdict(list)
+    for index, scenario in enumerate(scenarios):
+        root = _find(parents, index)
+        if root == index:
+            kept.append(scenario)
+        else:
+            duplicates[root].append(scenario)
+
+    return DedupResult(
+        scenarios=kept,
+        groups=[
+            DuplicateGroup(kept=scenarios[root], duplicates=dupes)
+            for root, dupes in sorted(duplicates.items())
+        ],
+    )
+
+
+class StreamingDeduplicator:
+    """
+    Deduplicate scenarios that arrive in batches, e.g. one per generated shard.
+
+    Each batch is compared with everything kept so far; scenarios already
+    passed on are never withdrawn, so the result can be acted on right away.
+    The LSH buckets of kept scenarios persist between batches, so each batch
+    only costs hashing and looking up its own scenarios.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        bands: int = DEFAULT_BANDS,
+        hasher: Optional[MinHasher] = None,
+    ):
+        """
+        Args:
+            threshold: Minimum Jaccard similarity for two queries to be duplicates
+            num_perm: Number of MinHash permutations
+            bands: Number of LSH bands; ``num_perm`` must be divisible by it
+            hasher: MinHasher to use
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = hasher or MinHasher(num_perm)
+        self.kept: list[Scenario] = []
+        self.duplicates = 0
+        self._shingle_sets: list[set[int]] = []
+        self._buckets: dict[tuple, list[int]] = defaultdict(list)
+
+    def add(self, batch: list[Scenario]) -> list[Scenario]:
+        """Return the scenarios of ``batch`` that duplicate nothing kept so far."""
+        if not batch:
+            return []
+        shingle_sets = [shingles(normalize_query(s.query)) for s in batch]
+        signatures = self.hasher.signatures(shingle_sets)
+        new = []
+        for scenario, shingle_set, row in zip(batch, shingle_sets, signatures):
+            keys = [
+                (
+                    scenario.expected_tool_call,
+                    band,
+                    row[band * self.rows : (band + 1) * self.rows].tobytes(),
+                )
+                for band in range(self.bands)
+            ]
+            candidates = {i for key in keys for i in self._buckets.get(key, ())}
+            if any(
+                jaccard(shingle_set, self._shingle_sets[i]) >= self.threshold
+                for i in candidates
+            ):
+                self.duplicates += 1
+                continue
+            index = len(self.kept)
+            self.kept.append(scenario)
+            self._shingle_sets.append(shingle_set)
+            for key in keys:
+                self._buckets[key].append(index)
+            new.append(scenario)
+        return new
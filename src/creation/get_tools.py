@@ -1,7 +1,34 @@
+import asyncio
+from typing import Any, Optional
+
 from google.adk.agents import Agent
+from google.adk.tools import BaseTool, FunctionTool
+from google.adk.tools.base_toolset import BaseToolset
+from google.genai import types
+
+from src.creation.tool_cache import ToolCache, default_tool_cache, refresh_requested
+from src.fingerprint import agent_fingerprint
 from src.models import AgentTools, ToolInfo
 
 
+def _describe_tool(tool: Any) -> ToolInfo:
+    """Describe a tool from its attributes, falling back to defaults.
+
+    Only attributes of the expected type are used, so toolsets and other
+    objects without them still get a name and description.
+    """
+    name = getattr(tool, "name", None)
+    description = getattr(tool, "description", None)
+    parameters = getattr(tool, "parameters", None)
+    return ToolInfo(
+        name=name if isinstance(name, str) else str(tool),
+        description=(
+            description if isinstance(description, str) else "No description available"
+        ),
+        parameters=parameters if isinstance(parameters, dict) else None,
+    )
+
+
 def get_tools_from_agent(adk_agent: Agent) -> AgentTools:
     """
     Extract tools and their descriptions from an ADK agent.
@@ -15,20 +42,129 @@ def get_tools_from_agent(adk_agent: Agent) -> AgentTools:
     tools_info = []
 
     # Extract tools from the agent
-    if hasattr(adk_agent, "tools") and adk_agent.tools:
-        for tool in adk_agent.tools:
-            tool_info = ToolInfo(
-                name=tool.name if hasattr(tool, "name") else str(tool),
-                description=(
-                    tool.description
-                    if hasattr(tool, "description")
-                    else "No description available"
-                ),
-                parameters=getattr(tool, "parameters", None),
-            )
-            tools_info.append(tool_info)
+    tools = getattr(adk_agent, "tools", None)
+    if isinstance(tools, (list, tuple)):
+        for tool in tools:
+            tools_info.append(_describe_tool(tool))
 
     # Get agent name
-    agent_name = getattr(adk_agent, "name", "Unknown Agent")
+    agent_name = getattr(adk_agent, "name", None)
+    if not isinstance(agent_name, str):
+        agent_name = "Unknown Agent"
 
     return AgentTools(tools=tools_info, agent_name=agent_name)
+
+
+def _schema_json(schema: types.Schema) -> dict:
+    """Convert a genai Schema back into a JSON schema dict."""
+    spec: dict[str, Any] = {}
+    if schema.type is not None:
+        spec["type"] = schema.type.value.lower()
+    if schema.description:
+        spec["description"] = schema.description
+    if schema.enum:
+        spec["enum"] = list(schema.enum)
+    if schema.items is not None:
+        spec["items"] = _schema_json(schema.items)
+    if schema.properties:
+        spec["properties"] = {
+            name: _schema_json(prop) for name, prop in schema.properties.items()
+        }
+    if schema.required:
+        spec["required"] = list(schema.required)
+    return spec
+
+
+def declared_tool_info(tool: BaseTool) -> ToolInfo:
+    """Describe a resolved tool by the declaration the model would see."""
+    declaration = tool._get_declaration()
+    parameters = None
+    if declaration is not None:
+        if declaration.parameters_json_schema is not None:
+            parameters = declaration.parameters_json_schema
+        elif declaration.parameters is not None:
+            parameters = _schema_json(declaration.parameters)
+    return ToolInfo(
+        name=tool.name,
+        description=tool.description or "No description available",
+        parameters=parameters,
+    )
+
+
+async def _resolve_tools(tool: Any) -> list[ToolInfo]:
+    """Return the tools behind one entry of an agent's ``tools`` list."""
+    if isinstance(tool, BaseToolset):
+        return [declared_tool_info(t) for t in await tool.get_tools()]
+    if isinstance(tool, BaseTool):
+        return [declared_tool_info(tool)]
+    if callable(tool):
+        return [declared_tool_info(FunctionTool(tool))]
+    return [_describe_tool(tool)]
+
+
+def _walk_agents(adk_agent: Any) -> list[Any]:
+    """Return an agent and all its sub-agents, depth first."""
+    agents = [adk_agent]
+    for sub_agent in getattr(adk_agent, "sub_agents", None) or []:
+        agents.extend(_walk_agents(sub_agent))
+    return agents
+
+
+async def discover_tools(
+    adk_agent: Agent,
+    use_cache: bool = True,
+    refresh: bool = False,
+    cache: Optional[ToolCache] = None,
+) -> AgentTools:
+    """
+    Resolve the actual tools of an agent and all its sub-agents.
+
+    Unlike :func:`get_tools_from_agent`, toolsets such as ``MCPToolset`` are
+    asked for their tools (all of them concurrently), so each MCP tool is
+    listed with its own name, description and JSON parameter schema. Results
+    are cached under ``agent_fingerprint(adk_agent)``, so repeated runs
+    against an unchanged agent don't reconnect to its tool servers.
+
+    Args:
+        adk_agent: The root of the agent tree
+        use_cache: Set to False to bypass the cache completely
+        refresh: Rediscover even on a cache hit and overwrite the entry
+        cache: Cache to use instead of the one configured by the environment
+
+    Returns:
+        AgentTools: The tools of the whole tree, each name listed once, named
+            after the root agent
+    """
+    if use_cache and cache is None:
+        cache = default_tool_cache()
+    if not use_cache:
+        cache = None
+    refresh = refresh or refresh_requested()
+
+    fingerprint = None
+    if cache is not None:
+        fingerprint = agent_fingerprint(adk_agent)
+        if not refresh:
+            cached = cache.get(fingerprint)
+            if cached is not None:
+                return cached
+
+    entries = [
+        tool
+        for agent in _walk_agents(adk_agent)
+        for tool in getattr(agent, "tools", None) or []
+    ]
+    resolved = await asyncio.gather(*(_resolve_tools(tool) for tool in entries))
+
+    tools: dict[str, ToolInfo] = {}
+    for tool_infos in resolved:
+        for tool_info in tool_infos:
+            tools.setdefault(tool_info.name, tool_info)
+    agent_tools = AgentTools(
+        tools=list(tools.values()),
+        agent_name=getattr(adk_agent, "name", "Unknown Agent"),
+    )
+
+    if cache is not None:
+        cache.put(fingerprint, agent_tools)
+    return agent_tools
@@ -0,0 +1,298 @@
+"""Incremental scenario regeneration driven by tool-set diffs.
+
+Each manifest entry is keyed by a tool together with everything else that
+shapes its scenarios (the crew's prompt config, the model and the scenario
+count, see ``generation_key``), so changing any of them regenerates the
+affected tools. The tools that need scenarios are generated in one call to
+the sharded, concurrent generator, and its scenarios are attributed back to
+tools by their expected tool call.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Optional
+
+from pydantic import BaseModel, Field
+
+from src.creation.main import DEFAULT_SCENARIOS_PER_TOOL, iter_scenario_batches
+from src.creation.scenario_cache import (
+    CONFIG_DIR,
+    generation_key,
+    refresh_requested,
+)
+from src.creation.settings import LLAMA_MODEL
+from src.models import Scenario, ToolInfo
+
+DEFAULT_MANIFEST_PATH = Path(".magic_eval_cache") / "scenario_manifest.json"
+
+
+class ToolScenarios(BaseModel):
+    """Scenarios generated for one version of a tool."""
+
+    tool: ToolInfo = Field(..., description="The tool the scenarios were generated for")
+    scenarios: list[Scenario] = Field(..., description="Scenarios generated for the tool")
+
+
+class ScenarioManifest(BaseModel):
+    """Record of which scenarios came from which tool fingerprints."""
+
+    entries: dict[str, ToolScenarios] = Field(
+        default_factory=dict, description="Generated scenarios by tool fingerprint"
+    )
+
+    @classmethod
+    def load(cls, path: Path | str) -> "ScenarioManifest":
+        """Load a manifest, returning an empty one if the file does not exist."""
+        try:
+            return cls.model_validate_json(Path(path).read_bytes())
+        except FileNotFoundError:
+            return cls()
+
+    def save(self, path: Path | str) -> None:
+        """Write the manifest atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(self.model_dump_json(indent=2))
+        os.replace(tmp_path, path)
+
+
+class RegenerationPlan(BaseModel):
+    """Which tools need new scenarios and which manifest entries are kept or dropped."""
+
+    to_generate: list[ToolInfo] = Field(
+        ..., description="Tools that are new or whose fingerprint changed"
+    )
+    unchanged: list[str] = Field(
+        ..., description="Fingerprints whose scenarios are reused as-is"
+    )
+    removed: list[str] = Field(
+        ..., description="Fingerprints no longer in the tool list"
+    )
+
+
+def tool_fingerprint(tool: ToolInfo) -> str:
+    """Return a hex sha256 digest of a tool's name, description and parameters."""
+    tool_json = json.dumps(
+        tool.model_dump(), sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(tool_json.encode()).hexdigest()
+
+
+def generation_fingerprint(
+    tool: ToolInfo,
+    scenarios_per_tool: int = DEFAULT_SCENARIOS_PER_TOOL,
+    model: str = LLAMA_MODEL,
+    config_dir: Path = CONFIG_DIR,
+) -> str:
+    """Return the manifest key of a tool: the tool and its generation inputs."""
+    return generation_key(
+        [tool],
+        model,
+        config_dir,
+        options={"scenarios_per_tool": scenarios_per_tool},
+    )
+
+
+def _unique_by_fingerprint(
+    tools: list[ToolInfo], key: Callable[[ToolInfo], str] = tool_fingerprint
+) -> dict[str, ToolInfo]:
+    """Map fingerprints to tools, dropping exact duplicates but keeping order."""
+    unique = {}
+    for tool in tools:
+        unique.setdefault(key(tool), tool)
+    return unique
+
+
+def plan_regeneration(
+    tools: list[ToolInfo],
+    manifest: ScenarioManifest,
+    key: Callable[[ToolInfo], str] = tool_fingerprint,
+) -> RegenerationPlan:
+    """
+    Diff the current tools against a manifest.
+
+    Args:
+        tools: The agent's current tools
+        manifest: Scenarios generated on previous runs
+        key: Fingerprint of a tool in the manifest
+
+    Returns:
+        RegenerationPlan: Tools to generate for, and fingerprints kept or removed
+    """
+    current = _unique_by_fingerprint(tools, key)
+    return RegenerationPlan(
+        to_generate=[
+            tool
+            for fingerprint, tool in current.items()
+            if fingerprint not in manifest.entries
+        ],
+        unchanged=[
+            fingerprint for fingerprint in current if fingerprint in manifest.entries
+        ],
+        removed=[
+            fingerprint for fingerprint in manifest.entries if fingerprint not in current
+        ],
+    )
+
+
+def _attribute(
+    manifest: ScenarioManifest,
+    tools: list[ToolInfo],
+    scenarios: list[Scenario],
+    key: Callable[[ToolInfo], str],
+) -> None:
+    """
+    Add generated scenarios to the manifest entries of their tools.
+
+    A scenario belongs to the tool it expects to be called. Scenarios that
+    expect no tool, or a tool that wasn't generated for, go with the first
+    tool another scenario of the batch expects (a batch is one shard), so
+    they are regenerated along with it.
+    """
+    by_name = {tool.name: tool for tool in tools}
+    fallback = next(
+        (
+            by_name[s.expected_tool_call]
+            for s in scenarios
+            if s.expected_tool_call in by_name
+        ),
+        tools[0],
+    )
+    for scenario in scenarios:
+        tool = by_name.get(scenario.expected_tool_call) or fallback
+        entry = manifest.entries.setdefault(
+            key(tool), ToolScenarios(tool=tool, scenarios=[])
+        )
+        entry.scenarios.append(scenario)
+
+
+def _reuse(
+    tools: list[ToolInfo],
+    manifest_path: Path | str,
+    key: Callable[[ToolInfo], str],
+    refresh: bool = False,
+) -> tuple[ScenarioManifest, RegenerationPlan]:
+    """Load the manifest and drop the entries of tools that no longer exist.
+
+    With ``refresh`` (or ``MAGIC_EVAL_SCENARIO_CACHE=refresh``) every entry is
+    dropped, so all tools are regenerated.
+    """
+    manifest = ScenarioManifest.load(manifest_path)
+    if refresh or refresh_requested():
+        manifest.entries.clear()
+    plan = plan_regeneration(tools, manifest, key)
+    for fingerprint in plan.removed:
+        del manifest.entries[fingerprint]
+    return manifest, plan
+
+
+def _ordered(
+    tools: list[ToolInfo],
+    manifest: ScenarioManifest,
+    key: Callable[[ToolInfo], str],
+) -> list[Scenario]:
+    return [
+        scenario
+        for fingerprint in _unique_by_fingerprint(tools, key)
+        for scenario in manifest.entries[fingerprint].scenarios
+    ]
+
+
+def create_scenarios_incremental(
+    tools: list[ToolInfo],
+    manifest_path: Path | str = DEFAULT_MANIFEST_PATH,
+    generate: Optional[Callable[[list[ToolInfo]], list[Scenario]]] = None,
+    scenarios_per_tool: int = DEFAULT_SCENARIOS_PER_TOOL,
+    model: str = LLAMA_MODEL,
+) -> list[Scenario]:
+    """
+    Create scenarios, calling the crew only for tools that were added or changed.
+
+    Scenarios of unchanged tools are reused from the manifest and scenarios of
+    tools that no longer exist are dropped from it. The tools that need new
+    scenarios are generated together, in one call.
+
+    Args:
+        tools: The agent's current tools
+        manifest_path: Where the tool-to-scenarios manifest is stored
+        generate: Function generating scenarios for a list of tools.
+            Defaults to ``create_scenarios``, which shards them and runs the
+            kickoffs concurrently.
+        scenarios_per_tool: How many scenarios to ask for per tool
+        model: The crew's model; part of the manifest key
+
+    Returns:
+        list[Scenario]: Scenarios for every current tool, in tool order
+    """
+    if generate is None:
+        from src.creation.main import create_scenarios
+
+        def generate(tools: list[ToolInfo]) -> list[Scenario]:
+            return create_scenarios(tools, scenarios_per_tool=scenarios_per_tool)
+
+    def key(tool: ToolInfo) -> str:
+        return generation_fingerprint(tool, scenarios_per_tool, model)
+
+    manifest, plan = _reuse(tools, manifest_path, key)
+    if plan.to_generate:
+        _attribute(manifest, plan.to_generate, generate(plan.to_generate), key)
+        for tool in plan.to_generate:
+            manifest.entries.setdefault(
+                key(tool), ToolScenarios(tool=tool, scenarios=[])
+            )
+    manifest.save(manifest_path)
+    return _ordered(tools, manifest, key)
+
+
+async def iter_scenario_batches_incremental(
+    tools: list[ToolInfo],
+    manifest_path: Path | str = DEFAULT_MANIFEST_PATH,
+    scenarios_per_tool: int = DEFAULT_SCENARIOS_PER_TOOL,
+    model: str = LLAMA_MODEL,
+    **kwargs: Any,
+) -> AsyncIterator[list[Scenario]]:
+    """
+    Stream scenarios like ``iter_scenario_batches``, reusing unchanged tools'.
+
+    The reused scenarios come first, as one batch; then the batches generated
+    for added or changed tools, as they finish. The manifest is saved when
+    the iterator finishes or is closed, with the tools generated so far.
+
+    Args:
+        tools: The agent's current tools
+        manifest_path: Where the tool-to-scenarios manifest is stored
+        scenarios_per_tool: How many scenarios to ask for per tool
+        model: The crew's model; part of the manifest key
+        **kwargs: Passed on to ``iter_scenario_batches``
+
+    Yields:
+        list[Scenario]: Batches of scenarios
+    """
+
+    def key(tool: ToolInfo) -> str:
+        return generation_fingerprint(tool, scenarios_per_tool, model)
+
+    manifest, plan = _reuse(tools, manifest_path, key, kwargs.get("refresh", False))
+    try:
+        reused = [
+            scenario
+            for fingerprint in plan.unchanged
+            for scenario in manifest.entries[fingerprint].scenarios
+        ]
+        if reused:
+            yield reused
+        if plan.to_generate:
+            async for batch in iter_scenario_batches(
+                plan.to_generate, scenarios_per_tool=scenarios_per_tool, **kwargs
+            ):
+                _attribute(manifest, plan.to_generate, batch, key)
+                yield batch
+            for tool in plan.to_generate:
+                manifest.entries.setdefault(
+                    key(tool), ToolScenarios(tool=tool, scenarios=[])
+                )
+    finally:
+        manifest.save(manifest_path)
@@ -0,0 +1,39 @@
+"""crewai LLMs for the scenario crew that share rate limits and connections."""
+
+from crewai import LLM
+
+from src.llm_clients import get_llm_client
+from src.rate_limit import rate_limited
+
+
+class RateLimitedLLM(LLM):
+    """
+    crewai ``LLM`` whose calls share the process-wide limiter of their model.
+
+    The scenario crew and the agents under test usually call the same
+    provider, so they share its quota. The limiter retries 429s itself, so
+    LiteLLM's own retries are turned off unless ``max_retries`` is given.
+    """
+
+    def __init__(self, model: str, **kwargs):
+        kwargs.setdefault("max_retries", 0)
+        super().__init__(model=model, **kwargs)
+
+    def call(self, messages, *args, **kwargs):
+        return rate_limited(self.model, super().call, messages, *args, **kwargs)
+
+
+class PooledLLM(RateLimitedLLM):
+    """
+    Rate-limited LLM that also sends its calls over the model's pooled
+    connections (``src.llm_clients``), shared with the agents under test.
+    """
+
+    def _prepare_completion_params(self, messages, tools=None):
+        params = super()._prepare_completion_params(messages, tools)
+        if params.get("client") is None:
+            pooled = get_llm_client(
+                self.model, self.api_base or self.base_url, self.api_key
+            )
+            params.update(pooled.completion_kwargs(is_async=False))
+        return params
@@ -1,7 +1,38 @@
-from src.creation.scenario_creator import Scenario_Eval_Crew
+import asyncio
+from contextlib import nullcontext
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from src.creation.scenario_cache import (
+    ScenarioCache,
+    default_scenario_cache,
+    generation_key,
+    refresh_requested,
+)
+from src.creation.settings import LLAMA_MODEL
+from src.creation.tool_prompt import default_token_budget, plan_shards, serialize_tools
 from src.models import Scenario, ScenarioList, ToolInfo
 import json
 
+DEFAULT_SHARD_SIZE = 8
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_SCENARIOS_PER_TOOL = 2
+
+
+def __getattr__(name):
+    # crewai takes seconds to import, so the crew is only imported once a
+    # scenario actually has to be generated.
+    if name == "Scenario_Eval_Crew":
+        from src.creation.scenario_creator import Scenario_Eval_Crew
+
+        globals()[name] = Scenario_Eval_Crew
+        return Scenario_Eval_Crew
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _scenario_crew_class():
+    """Return the crew class, honouring a ``Scenario_Eval_Crew`` set on this module."""
+    return globals().get("Scenario_Eval_Crew") or __getattr__("Scenario_Eval_Crew")
+
 
 def run():
     """Run the scenario evaluation crew with default inputs."""
@@ -34,22 +65,190 @@ def run():
     ]
 
     inputs = {
-        "tools": [tool.model_dump() for tool in tools],
+        "tools": serialize_tools(tools),
+        "num_scenarios": DEFAULT_SCENARIOS_PER_TOOL * len(tools),
     }
-    result = Scenario_Eval_Crew().crew().kickoff(inputs=inputs)
+    result = _scenario_crew_class()().crew().kickoff(inputs=inputs)
     print(result.json_dict)
 
     scenarios = [Scenario(**scenario) for scenario in result.json_dict["scenarios"]]
     print(scenarios)
 
 
-def create_scenarios(tools: list[ToolInfo]) -> list[Scenario]:
-    """Create scenarios for the given tools."""
-    inputs = {
-        "tools": [tool.model_dump() for tool in tools],
-    }
-    result = Scenario_Eval_Crew().crew().kickoff(inputs=inputs)
-    return [Scenario(**scenario) for scenario in result.json_dict["scenarios"]]
+def shard_tools(tools: list[ToolInfo], shard_size: int) -> list[list[ToolInfo]]:
+    """Split tools into consecutive shards of at most ``shard_size`` tools."""
+    if shard_size < 1:
+        raise ValueError("shard_size must be at least 1")
+    return [tools[i : i + shard_size] for i in range(0, len(tools), shard_size)]
+
+
+def create_scenarios(
+    tools: list[ToolInfo],
+    use_cache: bool = True,
+    refresh: bool = False,
+    cache: Optional[ScenarioCache] = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    scenarios_per_tool: int = DEFAULT_SCENARIOS_PER_TOOL,
+    token_budget: Optional[int] = None,
+) -> list[Scenario]:
+    """
+    Create scenarios for the given tools.
+
+    Synchronous wrapper around :func:`create_scenarios_async`; call that
+    directly from code that already runs an event loop.
+    """
+    return asyncio.run(
+        create_scenarios_async(
+            tools,
+            use_cache=use_cache,
+            refresh=refresh,
+            cache=cache,
+            shard_size=shard_size,
+            max_concurrency=max_concurrency,
+            scenarios_per_tool=scenarios_per_tool,
+            token_budget=token_budget,
+        )
+    )
+
+
+async def create_scenarios_async(
+    tools: list[ToolInfo],
+    use_cache: bool = True,
+    refresh: bool = False,
+    cache: Optional[ScenarioCache] = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    scenarios_per_tool: int = DEFAULT_SCENARIOS_PER_TOOL,
+    token_budget: Optional[int] = None,
+) -> list[Scenario]:
+    """
+    Create scenarios for the given tools.
+
+    Tools are split into shards and each shard gets its own crew kickoff, with
+    at most ``max_concurrency`` kickoffs running at once. A shard closes early
+    when its prompt would exceed ``token_budget`` tokens, so large tool lists
+    are chunked automatically. Each shard is cached on disk, keyed by its
+    tools, the crew's prompt config, the model and the requested scenario
+    count, so unchanged shards skip the crew entirely.
+
+    Args:
+        tools: The tools to create scenarios for
+        use_cache: Set to False to bypass the cache completely
+        refresh: Regenerate even on a cache hit and overwrite the entry
+        cache: Cache to use instead of the one configured by the environment
+        shard_size: Maximum number of tools sent to one crew kickoff
+        max_concurrency: Maximum number of crew kickoffs running at once
+        scenarios_per_tool: How many scenarios to ask for per tool in a shard
+        token_budget: Maximum prompt tokens per kickoff. Defaults to
+            ``MAGIC_EVAL_PROMPT_TOKEN_BUDGET`` or 8000.
+
+    Returns:
+        list[Scenario]: The generated (or cached) scenarios, in shard order
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    run_shard = _shard_runner(
+        use_cache, refresh, cache, scenarios_per_tool, asyncio.Semaphore(max_concurrency)
+    )
+    shards = plan_shards(tools, shard_size, token_budget or default_token_budget())
+    shard_results = await asyncio.gather(*(run_shard(shard) for shard in shards))
+    return [
+        scenario
+        for scenario_list in shard_results
+        for scenario in scenario_list.scenarios
+    ]
+
+
+async def iter_scenario_batches(
+    tools: list[ToolInfo],
+    use_cache: bool = True,
+    refresh: bool = False,
+    cache: Optional[ScenarioCache] = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    scenarios_per_tool: int = DEFAULT_SCENARIOS_PER_TOOL,
+    token_budget: Optional[int] = None,
+) -> AsyncIterator[list[Scenario]]:
+    """
+    Create scenarios shard by shard, yielding each shard's as soon as it's done.
+
+    Takes the same arguments as :func:`create_scenarios_async`. Shards are
+    yielded in completion order, not tool order. A new shard only starts
+    once a finished one has been consumed, so a slow consumer holds back
+    generation instead of letting results pile up.
+
+    Yields:
+        list[Scenario]: The generated (or cached) scenarios of one shard
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    run_shard = _shard_runner(use_cache, refresh, cache, scenarios_per_tool)
+    shards = iter(
+        plan_shards(tools, shard_size, token_budget or default_token_budget())
+    )
+    running: set[asyncio.Task] = set()
+
+    def start_next() -> None:
+        shard = next(shards, None)
+        if shard is not None:
+            running.add(asyncio.create_task(run_shard(shard)))
+
+    try:
+        for _ in range(max_concurrency):
+            start_next()
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                running.discard(task)
+                yield task.result().scenarios
+                start_next()
+    finally:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+
+def _shard_runner(
+    use_cache: bool,
+    refresh: bool,
+    cache: Optional[ScenarioCache],
+    scenarios_per_tool: int,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> Callable[[list[ToolInfo]], Awaitable[ScenarioList]]:
+    """Return a coroutine function generating one shard, through the cache."""
+    if use_cache and cache is None:
+        cache = default_scenario_cache()
+    if not use_cache:
+        cache = None
+    refresh = refresh or refresh_requested()
+
+    async def run_shard(shard: list[ToolInfo]) -> ScenarioList:
+        num_scenarios = scenarios_per_tool * len(shard)
+        key = None
+        if cache is not None:
+            key = generation_key(
+                shard, LLAMA_MODEL, options={"num_scenarios": num_scenarios}
+            )
+            if not refresh:
+                cached = cache.get(key)
+                if cached is not None:
+                    return cached
+
+        async with semaphore or nullcontext():
+            scenario_list = await _generate_scenarios(shard, num_scenarios)
+        if cache is not None:
+            cache.put(key, LLAMA_MODEL, scenario_list)
+        return scenario_list
+
+    return run_shard
+
+
+async def _generate_scenarios(tools: list[ToolInfo], num_scenarios: int) -> ScenarioList:
+    """Run the scenario crew for the given tools and validate its output."""
+    inputs = {"tools": serialize_tools(tools), "num_scenarios": num_scenarios}
+    result = await _scenario_crew_class()().crew().kickoff_async(inputs=inputs)
+    return ScenarioList.model_validate(result.json_dict)
 
 
 if __name__ == "__main__":
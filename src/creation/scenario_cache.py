@@ -0,0 +1,178 @@
+"""Content-addressed disk cache for generated scenario lists."""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from src.models import ScenarioList, ToolInfo
+
+CONFIG_DIR = Path(__file__).parent / "config"
+PROMPT_CONFIG_FILES = ("agents.yaml", "tasks.yaml")
+
+DEFAULT_CACHE_DIR = Path(".magic_eval_cache") / "scenarios"
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+
+# Environment switches: MAGIC_EVAL_SCENARIO_CACHE=off skips the cache
+# entirely, MAGIC_EVAL_SCENARIO_CACHE=refresh regenerates and overwrites.
+CACHE_MODE_ENV = "MAGIC_EVAL_SCENARIO_CACHE"
+CACHE_DIR_ENV = "MAGIC_EVAL_CACHE_DIR"
+
+
+class CacheEntry(BaseModel):
+    """A cached generation result as stored on disk."""
+
+    key: str = Field(..., description="Content hash the entry is stored under")
+    model: str = Field(..., description="Model that generated the scenarios")
+    created_at: float = Field(..., description="Unix time the entry was written")
+    scenario_list: ScenarioList = Field(..., description="The validated scenarios")
+
+
+def generation_key(
+    tools: list[ToolInfo],
+    model: str,
+    config_dir: Path = CONFIG_DIR,
+    options: Optional[dict] = None,
+) -> str:
+    """
+    Hash everything that determines a Scenario_Eval_Crew generation.
+
+    Args:
+        tools: The tools scenarios are generated for
+        model: The crew's LLM model name
+        config_dir: Directory holding the crew's agents.yaml and tasks.yaml
+        options: Any other generation inputs, e.g. the requested scenario count
+
+    Returns:
+        str: Hex sha256 digest identifying the generation inputs
+    """
+    digest = hashlib.sha256()
+    tools_json = json.dumps(
+        [tool.model_dump() for tool in tools], sort_keys=True, separators=(",", ":")
+    )
+    digest.update(tools_json.encode())
+    for name in PROMPT_CONFIG_FILES:
+        digest.update(b"\0" + name.encode() + b"\0")
+        digest.update((config_dir / name).read_bytes())
+    digest.update(b"\0" + model.encode())
+    if options:
+        digest.update(b"\0" + json.dumps(options, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+class ScenarioCache:
+    """
+    Directory of cached ScenarioList generations keyed by generation_key().
+
+    Entries created more than ``max_age_seconds`` ago are treated as misses
+    so prompts get regenerated periodically. When the cache holds more than
+    ``max_entries`` files or ``max_bytes`` bytes, the least recently used
+    entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        directory: Path | str = DEFAULT_CACHE_DIR,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+    ):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[ScenarioList]:
+        """Return the cached scenarios for a key, or None on a miss."""
+        path = self._path(key)
+        try:
+            entry = CacheEntry.model_validate_json(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            # Corrupt or outdated entry: treat as a miss and drop it.
+            path.unlink(missing_ok=True)
+            return None
+
+        if time.time() - entry.created_at > self.max_age_seconds:
+            path.unlink(missing_ok=True)
+            return None
+
+        # Bump the mtime so size-based eviction is least-recently-used.
+        os.utime(path)
+        return entry.scenario_list
+
+    def put(self, key: str, model: str, scenario_list: ScenarioList) -> None:
+        """Store a generation result and evict entries over the limits."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = CacheEntry(
+            key=key, model=model, created_at=time.time(), scenario_list=scenario_list
+        )
+        # Write then rename so concurrent readers never see a partial file.
+        tmp_path = self._path(key).with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(entry.model_dump_json())
+        os.replace(tmp_path, self._path(key))
+        self.evict()
+
+    def evict(self) -> int:
+        """Apply the age and size limits. Returns the number of entries removed.
+
+        A file's mtime is its last use, which is never earlier than its
+        creation, so files not touched within ``max_age_seconds`` are expired.
+        """
+        if not self.directory.exists():
+            return 0
+
+        now = time.time()
+        entries = []
+        removed = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.max_age_seconds:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        while entries and (
+            len(entries) > self.max_entries or total_bytes > self.max_bytes
+        ):
+            _, size, path = entries.pop(0)
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+def default_scenario_cache() -> Optional[ScenarioCache]:
+    """Return the cache configured by the environment, or None if disabled."""
+    if os.getenv(CACHE_MODE_ENV, "").lower() == "off":
+        return None
+    cache_dir = os.getenv(CACHE_DIR_ENV)
+    if cache_dir:
+        return ScenarioCache(Path(cache_dir) / "scenarios")
+    return ScenarioCache()
+
+
+def refresh_requested() -> bool:
+    """Whether the environment asks to regenerate and overwrite cached entries."""
+    return os.getenv(CACHE_MODE_ENV, "").lower() == "refresh"
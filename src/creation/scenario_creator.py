@@ -1,17 +1,16 @@
 from typing import Optional
-from crewai import Agent, Crew, Process, Task, LLM
+from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 
 # Uncomment the following line to use an example of a custom tool
 # from surprise_travel.tools.custom_tool import MyCustomTool
 
 # Check our tools documentation for more information on how to use them
+from src.creation.llm import PooledLLM
+from src.creation.settings import LLAMA_MODEL
 from src.models import Scenario, ScenarioList
 
 
-LLAMA_MODEL = "Llama-4-Maverick-17B-128E-Instruct-FP8"
-
-
 @CrewBase
 class Scenario_Eval_Crew:
     """Scenario evaluation crew"""
@@ -19,7 +18,7 @@ class Scenario_Eval_Crew:
     agents_config = "config/agents.yaml"
     tasks_config = "config/tasks.yaml"
 
-    llm = LLM(
+    llm = PooledLLM(
         model=f"meta_llama/{LLAMA_MODEL}",
     )
 
@@ -0,0 +1,3 @@
+"""Scenario generation settings that are cheap to import (no crewai)."""
+
+LLAMA_MODEL = "Llama-4-Maverick-17B-128E-Instruct-FP8"
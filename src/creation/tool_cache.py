@@ -0,0 +1,108 @@
+"""Disk cache for discovered agent tools, keyed by the agent's fingerprint."""
+
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from src.models import AgentTools
+
+DEFAULT_CACHE_DIR = Path(".magic_eval_cache") / "tools"
+DEFAULT_MAX_AGE_SECONDS = 24 * 60 * 60
+
+# MAGIC_EVAL_TOOL_CACHE=off skips the cache, =refresh rediscovers and
+# overwrites. MAGIC_EVAL_CACHE_DIR moves it like the scenario cache.
+CACHE_MODE_ENV = "MAGIC_EVAL_TOOL_CACHE"
+CACHE_DIR_ENV = "MAGIC_EVAL_CACHE_DIR"
+
+
+class ToolCacheEntry(BaseModel):
+    """A discovery result as stored on disk."""
+
+    fingerprint: str = Field(..., description="agent_fingerprint() of the agent")
+    created_at: float = Field(..., description="Unix time the entry was written")
+    agent_tools: AgentTools = Field(..., description="The discovered tools")
+
+
+class ToolCache:
+    """
+    Discovered tools per agent fingerprint, in memory and on disk.
+
+    The fingerprint covers the agent tree's models, instructions, tools and
+    toolset connection parameters, so any config change is a miss. A tool
+    server can still change its tools without the config changing, so disk
+    entries expire after ``max_age_seconds``.
+    """
+
+    def __init__(
+        self,
+        directory: Path | str = DEFAULT_CACHE_DIR,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+    ):
+        self.directory = Path(directory)
+        self.max_age_seconds = max_age_seconds
+        self._memory: dict[str, AgentTools] = {}
+
+    def _path(self, fingerprint: str) -> Path:
+        return self.directory / f"{fingerprint}.json"
+
+    def get(self, fingerprint: str) -> Optional[AgentTools]:
+        """Return the cached tools for a fingerprint, or None on a miss."""
+        agent_tools = self._memory.get(fingerprint)
+        if agent_tools is not None:
+            return agent_tools
+
+        path = self._path(fingerprint)
+        try:
+            entry = ToolCacheEntry.model_validate_json(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            path.unlink(missing_ok=True)
+            return None
+        if time.time() - entry.created_at > self.max_age_seconds:
+            path.unlink(missing_ok=True)
+            return None
+
+        self._memory[fingerprint] = entry.agent_tools
+        return entry.agent_tools
+
+    def put(self, fingerprint: str, agent_tools: AgentTools) -> None:
+        """Store a discovery result."""
+        self._memory[fingerprint] = agent_tools
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = ToolCacheEntry(
+            fingerprint=fingerprint, created_at=time.time(), agent_tools=agent_tools
+        )
+        # Write then rename so concurrent readers never see a partial file.
+        tmp_path = self._path(fingerprint).with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(entry.model_dump_json())
+        os.replace(tmp_path, self._path(fingerprint))
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        self._memory.clear()
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+_default_tool_cache: Optional[ToolCache] = None
+
+
+def default_tool_cache() -> Optional[ToolCache]:
+    """Return the process-wide cache configured by the environment, or None."""
+    global _default_tool_cache
+    if os.getenv(CACHE_MODE_ENV, "").lower() == "off":
+        return None
+    cache_dir = os.getenv(CACHE_DIR_ENV)
+    directory = Path(cache_dir) / "tools" if cache_dir else DEFAULT_CACHE_DIR
+    if _default_tool_cache is None or _default_tool_cache.directory != directory:
+        _default_tool_cache = ToolCache(directory)
+    return _default_tool_cache
+
+
+def refresh_requested() -> bool:
+    """Whether the environment asks to rediscover and overwrite cached tools."""
+    return os.getenv(CACHE_MODE_ENV, "").lower() == "refresh"
@@ -0,0 +1,213 @@
+"""Compact tool descriptions for the scenario prompt, and its token budget.
+
+``serialize_tools`` renders each tool once, as one line of compact JSON: name,
+description and parameters, with JSON-schema boilerplate dropped (optional
+parameter names end in ``?``). The output only depends on the set of tools,
+so equal shards give equal prompts.
+
+``count_tokens`` measures text with the crew model's tokenizer, and
+``prompt_tokens`` the whole rendered prompt, so ``plan_shards`` can split a
+tool list whose prompt would not fit a token budget into several generations.
+"""
+
+import json
+import logging
+import os
+from functools import cache
+from typing import Any, Optional
+
+import yaml
+
+from src.creation.scenario_cache import CONFIG_DIR
+from src.creation.settings import LLAMA_MODEL
+from src.models import ToolInfo
+
+CREW_MODEL = f"meta_llama/{LLAMA_MODEL}"
+DEFAULT_PROMPT_TOKEN_BUDGET = 8000
+PROMPT_TOKEN_BUDGET_ENV = "MAGIC_EVAL_PROMPT_TOKEN_BUDGET"
+
+# Prompt fields crewai builds the agent's messages from.
+_AGENT_FIELDS = ("role", "goal", "backstory")
+_TASK_FIELDS = ("description", "expected_output")
+_SCHEMA_NOISE = ("title", "additionalProperties", "$schema")
+
+logger = logging.getLogger(__name__)
+
+
+def _compact_schema(schema: Any) -> Any:
+    """Shorten a JSON schema to a type string where nothing else is lost."""
+    if not isinstance(schema, dict):
+        return schema
+    schema = {k: v for k, v in schema.items() if k not in _SCHEMA_NOISE}
+    type_ = schema.pop("type", "any")
+    if isinstance(type_, list):
+        type_ = "|".join(type_)
+    description = schema.pop("description", None)
+    if type_ == "array" and isinstance(schema.get("items"), dict):
+        items = _compact_schema(schema.pop("items"))
+        if isinstance(items, str):
+            type_ = f"array of {items}"
+        else:
+            schema["items"] = items
+    if "properties" in schema:
+        schema["properties"] = compact_parameters(
+            {
+                "properties": schema.pop("properties"),
+                "required": schema.pop("required", []),
+            }
+        )
+    if "enum" in schema and len(schema) == 1:
+        enum = json.dumps(schema.pop("enum"), separators=(",", ":"))
+        type_ = f"{type_} one of {enum}"
+
+    if not schema:
+        return f"{type_}: {description}" if description else type_
+    compact = {"type": type_}
+    if description:
+        compact["description"] = description
+    compact.update(schema)
+    return compact
+
+
+def compact_parameters(parameters: Optional[dict]) -> Optional[dict]:
+    """
+    Shorten a tool's parameters for the prompt.
+
+    Args:
+        parameters: A JSON schema of the arguments, or already a plain
+            ``{name: type}`` mapping
+
+    Returns:
+        Optional[dict]: ``{name: type}``, where optional parameter names end
+            in ``?`` and types keep their description, enum and nesting
+    """
+    if not parameters:
+        return None
+    if "properties" not in parameters:
+        return parameters
+    required = set(parameters.get("required") or [])
+    return {
+        (name if name in required else f"{name}?"): _compact_schema(schema)
+        for name, schema in (parameters["properties"] or {}).items()
+    }
+
+
+def serialize_tool(tool: ToolInfo) -> str:
+    """Render one tool as a line of compact JSON."""
+    spec: dict[str, Any] = {
+        "name": tool.name,
+        "description": " ".join(tool.description.split()),
+    }
+    parameters = compact_parameters(tool.parameters)
+    if parameters:
+        spec["parameters"] = parameters
+    return json.dumps(spec, separators=(",", ":"), ensure_ascii=False)
+
+
+def serialize_tools(tools: list[ToolInfo]) -> str:
+    """
+    Render tools for the ``{tools}`` placeholder of the crew's prompt.
+
+    Args:
+        tools: The tools; repeated names are only included once
+
+    Returns:
+        str: One compact JSON object per tool and line, sorted by name
+    """
+    unique = {}
+    for tool in tools:
+        unique.setdefault(tool.name, tool)
+    return "\n".join(serialize_tool(unique[name]) for name in sorted(unique))
+
+
+@cache
+def _prompt_templates() -> tuple[str, ...]:
+    agents = yaml.safe_load((CONFIG_DIR / "agents.yaml").read_text())
+    tasks = yaml.safe_load((CONFIG_DIR / "tasks.yaml").read_text())
+    return tuple(
+        [agent.get(field, "") for agent in agents.values() for field in _AGENT_FIELDS]
+        + [task.get(field, "") for task in tasks.values() for field in _TASK_FIELDS]
+    )
+
+
+def count_tokens(text: str, model: str = CREW_MODEL) -> int:
+    """Count the tokens of ``text`` with the model's tokenizer (via LiteLLM)."""
+    # LiteLLM takes seconds to import, so only load it once counting is needed.
+    import litellm
+
+    return litellm.token_counter(model=model, text=text)
+
+
+def prompt_tokens(
+    tools: list[ToolInfo], num_scenarios: int, model: str = CREW_MODEL
+) -> int:
+    """
+    Measure the crew prompt for a set of tools before sending it.
+
+    Args:
+        tools: The tools of one generation
+        num_scenarios: The scenario count asked for
+        model: Model whose tokenizer to use
+
+    Returns:
+        int: Tokens of the rendered agent and task prompts. crewai adds a
+            little framing of its own, so leave some headroom in budgets.
+    """
+    inputs = {"tools": serialize_tools(tools), "num_scenarios": num_scenarios}
+    return count_tokens(
+        "\n".join(template.format(**inputs) for template in _prompt_templates()),
+        model,
+    )
+
+
+def default_token_budget() -> int:
+    """Return the prompt token budget set in the environment, or the default."""
+    return int(os.getenv(PROMPT_TOKEN_BUDGET_ENV, DEFAULT_PROMPT_TOKEN_BUDGET))
+
+
+def plan_shards(
+    tools: list[ToolInfo],
+    shard_size: int,
+    token_budget: int,
+    model: str = CREW_MODEL,
+) -> list[list[ToolInfo]]:
+    """
+    Split tools into consecutive shards whose prompts fit a token budget.
+
+    Args:
+        tools: The tools to create scenarios for; repeated names are dropped
+        shard_size: Maximum number of tools per shard
+        token_budget: Maximum prompt tokens per shard
+        model: Model whose tokenizer to use
+
+    Returns:
+        list[list[ToolInfo]]: The shards. A tool too large for the budget on
+            its own still gets a shard, with a warning.
+    """
+    if shard_size < 1:
+        raise ValueError("shard_size must be at least 1")
+    unique: dict[str, ToolInfo] = {}
+    for tool in tools:
+        unique.setdefault(tool.name, tool)
+    base = prompt_tokens([], 0, model)
+    shards: list[list[ToolInfo]] = []
+    shard: list[ToolInfo] = []
+    used = base
+    for tool in unique.values():
+        # +1 for the newline between tools.
+        tokens = count_tokens(serialize_tool(tool), model) + 1
+        if shard and (len(shard) >= shard_size or used + tokens > token_budget):
+            shards.append(shard)
+            shard, used = [], base
+        if base + tokens > token_budget:
+            logger.warning(
+                "Tool %s alone needs %d prompt tokens, over the budget of %d",
+                tool.name,
+                base + tokens,
+                token_budget,
+            )
+        shard.append(tool)
+        used += tokens
+    if shard:
+        shards.append(shard)
+    return shards
@@ -0,0 +1,109 @@
+"""Stable fingerprints of ADK agent configurations."""
+
+import hashlib
+import json
+from typing import Any, Iterable, Optional
+
+from src.models import ToolInfo
+
+
+def _describe_callable_or_value(value: Any) -> Any:
+    """Return a JSON-friendly description of a str or provider callable."""
+    if callable(value):
+        return f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', repr(value))}"
+    return value
+
+
+def _describe_model(model: Any) -> str:
+    """Return the model name of an agent's ``model`` (a str or a BaseLlm)."""
+    if isinstance(model, str):
+        return model
+    return getattr(model, "model", None) or type(model).__name__
+
+
+def _declaration(tool: Any) -> Optional[dict]:
+    """Return the function declaration the model sees for a tool, if it has one."""
+    from google.adk.tools import BaseTool, FunctionTool
+    from google.adk.tools.base_toolset import BaseToolset
+
+    if isinstance(tool, BaseToolset):
+        return None
+    if not isinstance(tool, BaseTool):
+        if not callable(tool):
+            return None
+        tool = FunctionTool(tool)
+    declaration = tool._get_declaration()
+    if declaration is None:
+        return None
+    return declaration.model_dump(mode="json", exclude_none=True)
+
+
+def _describe_tool(tool: Any) -> dict:
+    """Describe a tool or toolset by the attributes that affect agent behaviour.
+
+    Tools are described by their declaration (name, description and
+    parameters), so a changed docstring or signature changes the fingerprint.
+    Toolsets only have their connection parameters here; their tools are
+    covered by the ``tools`` argument of :func:`agent_fingerprint`.
+    """
+    description = {
+        "type": type(tool).__name__,
+        "name": getattr(tool, "name", None) or getattr(tool, "__name__", None),
+        "description": getattr(tool, "description", None),
+        "declaration": _declaration(tool),
+    }
+    connection_params = getattr(tool, "_connection_params", None)
+    if connection_params is not None:
+        if hasattr(connection_params, "model_dump"):
+            connection_params = connection_params.model_dump(mode="json")
+        description["connection_params"] = connection_params
+    return description
+
+
+def agent_config(agent: Any) -> dict:
+    """
+    Collect the parts of an agent's configuration that change its behaviour.
+
+    Args:
+        agent: An ADK agent (or any object with the same attributes)
+
+    Returns:
+        dict: Name, model, instructions, tools and sub-agents, recursively
+    """
+    return {
+        "type": type(agent).__name__,
+        "name": getattr(agent, "name", None),
+        "model": _describe_model(getattr(agent, "model", "")),
+        "instruction": _describe_callable_or_value(getattr(agent, "instruction", "")),
+        "global_instruction": _describe_callable_or_value(
+            getattr(agent, "global_instruction", "")
+        ),
+        "tools": [_describe_tool(tool) for tool in getattr(agent, "tools", None) or []],
+        "sub_agents": [
+            agent_config(sub_agent)
+            for sub_agent in getattr(agent, "sub_agents", None) or []
+        ],
+    }
+
+
+def agent_fingerprint(agent: Any, tools: Optional[Iterable[ToolInfo]] = None) -> str:
+    """
+    Return a hex sha256 digest of an agent's configuration.
+
+    Args:
+        agent: An ADK agent (or any object with the same attributes)
+        tools: The agent's discovered tools (see ``discover_tools``). Pass them
+            when the digest keys results, so a tool server that changes its
+            tools or their schemas changes the fingerprint.
+
+    Returns:
+        str: The digest
+    """
+    config = agent_config(agent)
+    if tools is not None:
+        config["discovered_tools"] = sorted(
+            (tool.model_dump(mode="json") for tool in tools),
+            key=lambda tool: tool["name"],
+        )
+    config_json = json.dumps(config, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(config_json.encode()).hexdigest()
@@ -0,0 +1,249 @@
+"""Pooled HTTP clients for LLM calls, one per model, shared process-wide.
+
+Left alone, LiteLLM builds an OpenAI client per set of call parameters with
+its own connection pool, and reuses async clients across event loops, which
+breaks once the loop that opened their connections is closed. Here every
+model gets one ``PooledLLMClient`` with an explicit connection limit and
+keep-alive. The scenario crew (``src.creation.llm.PooledLLM``) and the
+agents under test (``src.runner.llm_client.PooledLiteLLMClient``) hand its
+OpenAI client to LiteLLM, so concurrent scenarios reuse warm connections
+instead of paying TCP and TLS setup on every call.
+
+Only OpenAI-compatible providers, which include ``meta_llama``, accept a
+client; calls to other providers are left to LiteLLM.
+
+Async clients are closed when their event loop shuts down (``asyncio.run``
+does that before closing the loop), and ``close_llm_clients`` closes the
+synchronous ones.
+"""
+
+import asyncio
+import os
+import threading
+from typing import Any, AsyncGenerator, Optional
+from weakref import WeakKeyDictionary
+
+import httpx
+import litellm
+from openai import AsyncOpenAI, OpenAI, OpenAIError
+from pydantic import BaseModel, Field
+
+MAX_CONNECTIONS_ENV = "MAGIC_EVAL_LLM_MAX_CONNECTIONS"
+KEEPALIVE_ENV = "MAGIC_EVAL_LLM_KEEPALIVE_SECONDS"
+
+
+class ConnectionSettings(BaseModel):
+    """Connection pool settings of a pooled LLM client."""
+
+    max_connections: int = Field(100, ge=1, description="Open connections per client")
+    max_keepalive_connections: int = Field(
+        20, ge=0, description="Idle connections kept open"
+    )
+    keepalive_expiry_seconds: float = Field(
+        30.0, ge=0, description="How long an idle connection is kept"
+    )
+    timeout_seconds: float = Field(600.0, gt=0, description="Timeout of a request")
+
+    @classmethod
+    def from_env(cls) -> "ConnectionSettings":
+        """Return the default settings with the overrides set in the environment."""
+        settings = cls().model_dump()
+        if max_connections := os.getenv(MAX_CONNECTIONS_ENV):
+            settings["max_connections"] = int(max_connections)
+            settings["max_keepalive_connections"] = min(
+                settings["max_keepalive_connections"], int(max_connections)
+            )
+        if keepalive := os.getenv(KEEPALIVE_ENV):
+            settings["keepalive_expiry_seconds"] = float(keepalive)
+        return cls.model_validate(settings)
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry_seconds,
+        )
+
+
+class PooledLLMClient:
+    """
+    The connection pools of one model and endpoint.
+
+    There is one synchronous client for the whole process, which httpx
+    makes safe to share between threads, and one async client per event
+    loop, since async connections belong to the loop that opened them. Each
+    async client is closed by its loop's ``shutdown_asyncgens()``.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        api_base: Optional[str] = None,
+        api_key: Optional[str] = None,
+        settings: Optional[ConnectionSettings] = None,
+    ):
+        """
+        Args:
+            model: LiteLLM model name, ``provider/model``
+            api_base: Endpoint override; defaults to the provider's
+            api_key: API key override; defaults to the provider's
+            settings: Pool settings. Defaults to ``ConnectionSettings.from_env()``.
+        """
+        self.model = model
+        _, self.provider, resolved_key, resolved_base = litellm.get_llm_provider(
+            model, api_base=api_base, api_key=api_key
+        )
+        self.api_base = api_base or resolved_base
+        self.api_key = api_key or resolved_key
+        self.settings = settings or ConnectionSettings.from_env()
+        self.openai_compatible = (
+            self.provider == "openai"
+            or self.provider in litellm.openai_compatible_providers
+        )
+        self._sync_client: Optional[OpenAI] = None
+        self._async_clients: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, tuple[AsyncOpenAI, AsyncGenerator]
+        ] = WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _client_args(self) -> dict[str, Any]:
+        return {
+            "api_key": self.api_key,
+            "base_url": self.api_base,
+            "timeout": self.settings.timeout_seconds,
+            # Retries are up to the rate limiter (src.rate_limit).
+            "max_retries": 0,
+        }
+
+    def sync_client(self) -> Optional[OpenAI]:
+        """Return the shared OpenAI client, or None if LiteLLM should build one."""
+        if not self.openai_compatible:
+            return None
+        with self._lock:
+            if self._sync_client is None:
+                http_client = httpx.Client(
+                    limits=self.settings.limits(), verify=litellm.ssl_verify
+                )
+                try:
+                    self._sync_client = OpenAI(
+                        http_client=http_client, **self._client_args()
+                    )
+                except OpenAIError:
+                    # No API key configured: let LiteLLM report it.
+                    http_client.close()
+                    return None
+            return self._sync_client
+
+    def async_client(self) -> Optional[AsyncOpenAI]:
+        """Return the AsyncOpenAI client of the running event loop, or None."""
+        if not self.openai_compatible:
+            return None
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._async_clients.get(loop)
+            if entry is None:
+                http_client = httpx.AsyncClient(
+                    limits=self.settings.limits(), verify=litellm.ssl_verify
+                )
+                try:
+                    client = AsyncOpenAI(
+                        http_client=http_client, **self._client_args()
+                    )
+                except OpenAIError:
+                    return None
+                entry = self._async_clients[loop] = (
+                    client,
+                    self._close_on_loop_shutdown(loop, client),
+                )
+            return entry[0]
+
+    def _close_on_loop_shutdown(
+        self, loop: asyncio.AbstractEventLoop, client: AsyncOpenAI
+    ) -> AsyncGenerator:
+        """
+        Return an async generator that closes ``client`` when ``loop`` shuts down.
+
+        An event loop keeps track of the async generators started in it and
+        closes the ones still suspended in ``shutdown_asyncgens()``. The
+        generator is started here, up to its ``yield``, and kept next to the
+        client so it stays suspended until then.
+        """
+
+        async def closer():
+            try:
+                yield
+            finally:
+                # The generator refers to its loop, so the entry has to go
+                # for the loop to be garbage collected.
+                with self._lock:
+                    self._async_clients.pop(loop, None)
+                await client.close()
+
+        generator = closer()
+        try:
+            # Nothing is awaited before the ``yield``, so this step completes
+            # synchronously and registers the generator with the running loop.
+            generator.asend(None).send(None)
+        except StopIteration:
+            pass
+        return generator
+
+    def completion_kwargs(self, is_async: bool) -> dict[str, Any]:
+        """Return the arguments that make a LiteLLM call use this pool."""
+        client = self.async_client() if is_async else self.sync_client()
+        return {"client": client} if client is not None else {}
+
+    def close(self) -> None:
+        """Close the synchronous client's connections."""
+        with self._lock:
+            client, self._sync_client = self._sync_client, None
+        if client is not None:
+            client.close()
+
+    async def aclose(self) -> None:
+        """Close the running loop's async client and the sync client."""
+        with self._lock:
+            entry = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            # Finishing the closer runs its ``finally``, which closes the client.
+            await entry[1].aclose()
+        self.close()
+
+
+_registry_lock = threading.Lock()
+_clients: dict[tuple[str, Optional[str], Optional[str]], PooledLLMClient] = {}
+
+
+def get_llm_client(
+    model: str, api_base: Optional[str] = None, api_key: Optional[str] = None
+) -> PooledLLMClient:
+    """
+    Return the process-wide pooled client of a model, creating it on first use.
+
+    Args:
+        model: LiteLLM model name, ``provider/model``
+        api_base: Endpoint override, as passed to LiteLLM
+        api_key: API key override, as passed to LiteLLM
+
+    Returns:
+        PooledLLMClient: The client shared by every caller of this model
+    """
+    key = (model, api_base, api_key)
+    with _registry_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = PooledLLMClient(model, api_base, api_key)
+        return client
+
+
+def close_llm_clients() -> None:
+    """
+    Close the synchronous clients and forget every pooled client.
+
+    Async clients are closed by their own event loops as those shut down.
+    """
+    with _registry_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
@@ -35,3 +35,61 @@ class AgentTools(BaseModel):
         ..., description="List of tools and their descriptions"
     )
     agent_name: str = Field(..., description="Name of the agent these tools belong to")
+
+
+class ResultProvenance(BaseModel):
+    """Where a cached scenario result came from."""
+
+    cache_key: str = Field(..., description="Key the result is cached under")
+    run_id: str = Field(..., description="Id of the run that produced the result")
+    host: str = Field(..., description="Host that produced the result")
+    recorded_at: float = Field(..., description="Unix time the result was cached")
+
+
+class ScenarioResult(BaseModel):
+    """Outcome and measurements of one scenario run."""
+
+    scenario_name: str = Field(..., description="Name of the scenario that was run")
+    expected_tool_call: Optional[str] = Field(
+        None, description="Tool call the scenario expected, or None"
+    )
+    passed: bool = Field(..., description="Whether the agent met the expectation")
+    latency_seconds: float = Field(
+        ..., description="Wall-clock time from sending the query to the verdict"
+    )
+    event_count: int = Field(..., description="Number of agent events consumed")
+    time_to_first_event_seconds: Optional[float] = Field(
+        None, description="Time from sending the query to the first agent event"
+    )
+    time_to_first_function_call_seconds: Optional[float] = Field(
+        None, description="Time from sending the query to the first tool call"
+    )
+    tool_calls: list[str] = Field(
+        default_factory=list, description="Names of the tool calls the agent made"
+    )
+    input_tokens: int = Field(0, description="Prompt tokens reported by the model")
+    output_tokens: int = Field(0, description="Output tokens reported by the model")
+    provenance: Optional[ResultProvenance] = Field(
+        None, description="Set when the result was reused from the result cache"
+    )
+
+
+class TrialResult(BaseModel):
+    """Pass rate of a scenario estimated from repeated runs."""
+
+    scenario_name: str = Field(..., description="Name of the scenario that was run")
+    expected_tool_call: Optional[str] = Field(
+        None, description="Tool call the scenario expected, or None"
+    )
+    trials: int = Field(..., description="Number of runs")
+    passes: int = Field(..., description="Number of runs that passed")
+    pass_rate: float = Field(..., description="passes / trials")
+    ci_low: float = Field(..., description="Lower bound of the Wilson interval")
+    ci_high: float = Field(..., description="Upper bound of the Wilson interval")
+    stop_reason: str = Field(
+        ...,
+        description="Why trials stopped: sprt_pass, sprt_fail, ci_width or max_trials",
+    )
+    results: list[ScenarioResult] = Field(
+        default_factory=list, description="The individual runs, in order"
+    )
@@ -0,0 +1,318 @@
+"""Generate, review and run scenarios as one pipeline.
+
+The three stages run concurrently, connected by bounded queues:
+
+1. generation yields scenarios shard by shard (``iter_scenario_batches``),
+   dropping near-duplicates of scenarios already seen;
+2. a reviewer accepts or rejects each scenario, either a person
+   (``InteractiveReviewer``) or a set of rules (``AutoAcceptReviewer``);
+3. accepted scenarios go straight to a pool of runner workers. Scenarios
+   waiting to run start in ``prioritize`` order (recent failures first), as
+   far as the run queue holds more than one of them.
+
+A full queue blocks the stage feeding it, so generation never gets far
+ahead of review and review never far ahead of the runners. While a person is
+still reviewing scenario 20, scenarios 1-19 are already running.
+"""
+
+import asyncio
+import math
+import threading
+import uuid
+from typing import AsyncIterable, Callable, Iterable, Optional
+
+from google.adk.agents import Agent
+from pydantic import BaseModel, Field
+from rich.console import Console
+
+from src.creation.dedup import StreamingDeduplicator
+from src.fingerprint import agent_fingerprint
+from src.models import Scenario, ScenarioResult, ToolInfo
+from src.runner.prioritization import ScenarioHistory, priority
+from src.runner.result_cache import ResultCache
+from src.runner.scenario_runner import DEFAULT_MAX_CONCURRENCY, run_scenario
+
+DEFAULT_QUEUE_SIZE = 8
+DEFAULT_MAX_QUERY_LENGTH = 2000
+# Priority of the end-of-work sentinels: after every scenario.
+_LAST = (math.inf,)
+
+# A rule returns why it rejects a scenario, or None to let it through.
+ReviewRule = Callable[[Scenario], Optional[str]]
+
+
+class Reviewer:
+    """Decides which generated scenarios are run."""
+
+    async def review(self, scenario: Scenario) -> bool:
+        """Return True to run the scenario."""
+        raise NotImplementedError
+
+
+class AutoAcceptReviewer(Reviewer):
+    """
+    Accepts every scenario that passes a set of rules, without asking.
+
+    The built-in rules reject empty or overly long queries and scenarios that
+    expect a tool the agent doesn't have.
+    """
+
+    def __init__(
+        self,
+        tool_names: Optional[Iterable[str]] = None,
+        max_query_length: int = DEFAULT_MAX_QUERY_LENGTH,
+        rules: Iterable[ReviewRule] = (),
+    ):
+        """
+        Args:
+            tool_names: The agent's tools; None accepts any expected tool
+            max_query_length: Longest query accepted, in characters
+            rules: Extra rules, checked after the built-in ones
+        """
+        self.tool_names = set(tool_names) if tool_names is not None else None
+        self.max_query_length = max_query_length
+        self.rules = list(rules)
+        self.rejections: dict[str, str] = {}
+
+    def rejection_reason(self, scenario: Scenario) -> Optional[str]:
+        """Return why the scenario is rejected, or None if it is accepted."""
+        if not scenario.query.strip():
+            return "empty query"
+        if len(scenario.query) > self.max_query_length:
+            return f"query longer than {self.max_query_length} characters"
+        expected = scenario.expected_tool_call
+        if (
+            self.tool_names is not None
+            and expected is not None
+            and expected not in self.tool_names
+        ):
+            return f"expects unknown tool {expected!r}"
+        for rule in self.rules:
+            reason = rule(scenario)
+            if reason:
+                return reason
+        return None
+
+    async def review(self, scenario: Scenario) -> bool:
+        reason = self.rejection_reason(scenario)
+        if reason is not None:
+            self.rejections[scenario.name] = reason
+        return reason is None
+
+
+class InteractiveReviewer(Reviewer):
+    """
+    Asks on the console whether to keep each scenario.
+
+    The question is asked from a daemon thread, so scenarios accepted
+    earlier keep running while the reviewer thinks, and an unanswered
+    question doesn't keep the process alive once the pipeline stops.
+    """
+
+    def __init__(self, console: Optional[Console] = None):
+        self.console = console or Console()
+
+    async def _ask(self, prompt: str) -> str:
+        loop = asyncio.get_running_loop()
+        answer = loop.create_future()
+
+        def resolve(callback, value):
+            if not answer.done():
+                callback(value)
+
+        def ask():
+            try:
+                value = self.console.input(prompt)
+            except BaseException as error:
+                callback, value = answer.set_exception, error
+            else:
+                callback = answer.set_result
+            try:
+                loop.call_soon_threadsafe(resolve, callback, value)
+            except RuntimeError:
+                # The pipeline's loop is gone.
+                pass
+
+        threading.Thread(target=ask, daemon=True).start()
+        return await answer
+
+    async def review(self, scenario: Scenario) -> bool:
+        self.console.print(scenario)
+        answer = await self._ask("Do you want to keep this scenario? (y/n): ")
+        if answer.strip().lower() == "y":
+            return True
+        self.console.print(f"Skipping scenario: {scenario.name}")
+        return False
+
+
+class PipelineResult(BaseModel):
+    """Outcome of a generate, review and run pipeline."""
+
+    accepted: list[Scenario] = Field(
+        default_factory=list, description="Accepted scenarios, in review order"
+    )
+    results: list[Optional[ScenarioResult]] = Field(
+        default_factory=list,
+        description="Result of each accepted scenario; None if it was skipped",
+    )
+    rejected: list[Scenario] = Field(
+        default_factory=list, description="Scenarios the reviewer rejected"
+    )
+    duplicates: int = Field(0, description="Generated near-duplicates dropped")
+
+
+async def run_pipeline(
+    batches: AsyncIterable[list[Scenario]],
+    agent: Agent,
+    reviewer: Reviewer,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    deduplicate: bool = True,
+    streaming: bool = False,
+    result_cache: Optional[ResultCache] = None,
+    refresh: bool = False,
+    fail_fast: bool = False,
+    time_budget_seconds: Optional[float] = None,
+    on_result: Optional[Callable[[int, ScenarioResult], None]] = None,
+    tools: Optional[list[ToolInfo]] = None,
+    history: Optional[ScenarioHistory] = None,
+) -> PipelineResult:
+    """
+    Review and run scenarios while they are still being generated.
+
+    Args:
+        batches: Generated scenarios, one batch at a time, e.g.
+            ``iter_scenario_batches(tools)``. Closed when the pipeline stops.
+        agent: The ADK agent under test
+        reviewer: Decides which scenarios run
+        max_concurrency: Maximum number of scenarios running at once
+        queue_size: Capacity of the queues between the stages
+        deduplicate: Drop near-duplicates of scenarios generated earlier
+        streaming: Stop each agent turn as soon as its verdict is certain
+        result_cache: Reuse cached results of unchanged scenarios and cache
+            the new ones
+        refresh: Run every scenario even on a cache hit, overwriting entries
+        fail_fast: Stop the pipeline once a scenario has failed; scenarios
+            already running still finish
+        time_budget_seconds: Stop the pipeline after this many seconds,
+            cancelling the scenarios still running
+        on_result: Called with (index into ``accepted``, result) as soon as
+            each result is known
+        tools: The agent's discovered tools; they are part of the result
+            cache key, so cached results are not reused once a toolset's
+            tools change
+        history: Run history; accepted scenarios waiting for a worker are
+            started failed first, then flaky, then slow (see
+            ``src.runner.prioritization``). Without it they start in
+            review order.
+
+    Returns:
+        PipelineResult: What was accepted, rejected and run
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    if queue_size < 1:
+        raise ValueError("queue_size must be at least 1")
+
+    outcome = PipelineResult()
+    dedup = StreamingDeduplicator() if deduplicate else None
+    to_review: asyncio.Queue[Optional[Scenario]] = asyncio.Queue(queue_size)
+    to_run: asyncio.PriorityQueue[tuple[tuple, int]] = asyncio.PriorityQueue(
+        queue_size
+    )
+    stop = asyncio.Event()
+    deadline = None
+    if time_budget_seconds is not None:
+        deadline = asyncio.get_running_loop().time() + time_budget_seconds
+
+    run_id = uuid.uuid4().hex[:12]
+    user_id = f"user-{run_id}"
+    app_name = getattr(agent, "name", None) or "magic_eval"
+    fingerprint = agent_fingerprint(agent, tools) if result_cache is not None else None
+
+    async def generate() -> None:
+        iterator = aiter(batches)
+        try:
+            async for batch in iterator:
+                for scenario in dedup.add(batch) if dedup is not None else batch:
+                    await to_review.put(scenario)
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+            if dedup is not None:
+                outcome.duplicates = dedup.duplicates
+        await to_review.put(None)
+
+    async def review() -> None:
+        while (scenario := await to_review.get()) is not None:
+            if await reviewer.review(scenario):
+                outcome.accepted.append(scenario)
+                outcome.results.append(None)
+                stats = history.get(scenario) if history is not None else None
+                await to_run.put((priority(stats), len(outcome.accepted) - 1))
+            else:
+                outcome.rejected.append(scenario)
+        for _ in range(max_concurrency):
+            await to_run.put((_LAST, -1))
+
+    async def run_one(index: int) -> ScenarioResult:
+        scenario = outcome.accepted[index]
+        if result_cache is not None and not refresh:
+            cached = result_cache.get_by_fingerprint(fingerprint, scenario)
+            if cached is not None:
+                return cached
+        result = await run_scenario(
+            scenario,
+            agent,
+            user_id=user_id,
+            session_id=f"session-{run_id}-{index}",
+            app_name=app_name,
+            streaming=streaming,
+        )
+        if result_cache is not None:
+            result_cache.put_by_fingerprint(fingerprint, scenario, result)
+        return result
+
+    upstream: list[asyncio.Task] = []
+    idle: set[asyncio.Task] = set()
+
+    def halt() -> None:
+        # Stop generating and reviewing, and release the workers waiting for
+        # work; scenarios already running finish (or hit the time budget).
+        stop.set()
+        for task in upstream + list(idle):
+            task.cancel()
+
+    async def work() -> None:
+        worker = asyncio.current_task()
+        while not stop.is_set():
+            idle.add(worker)
+            try:
+                rank, index = await to_run.get()
+            finally:
+                idle.discard(worker)
+            if rank == _LAST:
+                return
+            try:
+                async with asyncio.timeout_at(deadline) as budget:
+                    result = await run_one(index)
+            except TimeoutError:
+                if not budget.expired():
+                    raise
+                halt()
+                return
+            outcome.results[index] = result
+            if on_result is not None:
+                on_result(index, result)
+            if fail_fast and not result.passed:
+                halt()
+
+    async with asyncio.TaskGroup() as group:
+        upstream += [group.create_task(generate()), group.create_task(review())]
+        for _ in range(max_concurrency):
+            group.create_task(work())
+
+    if result_cache is not None:
+        result_cache.evict()
+    return outcome
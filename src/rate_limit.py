@@ -0,0 +1,411 @@
+"""Process-wide rate limiting of LLM calls, shared by scenario creation and runs.
+
+The scenario crew (``src.creation.llm.RateLimitedLLM``) and the agents under
+test (``src.runner.llm_client.RateLimitedLiteLLMClient``) send every LLM call
+through the limiter of its model:
+
+* a token bucket per provider caps the request rate, so all models of one
+  provider share its quota;
+* a concurrency limit per model adapts AIMD-style, like TCP congestion
+  control: it grows by one for every window of successful calls and is cut
+  in half on a throttling signal, i.e. a 429 or a call slower than the
+  latency target.
+
+A throttled call is retried after the provider's ``Retry-After`` (or an
+exponential backoff), and the whole provider pauses with it, so concurrent
+callers don't turn one 429 into a retry storm. The limit is cut at most once
+per window: the 429s of calls that were already in flight when it was cut
+don't cut it again, so a burst of errors can't collapse it to the minimum.
+
+Nothing here imports litellm, so the module is cheap to import.
+"""
+
+import asyncio
+import functools
+import os
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from pydantic import BaseModel, Field, model_validator
+
+# MAGIC_EVAL_RATE_LIMIT=off sends LLM calls straight through.
+RATE_LIMIT_ENV = "MAGIC_EVAL_RATE_LIMIT"
+REQUESTS_PER_MINUTE_ENV = "MAGIC_EVAL_RATE_LIMIT_RPM"
+MAX_CONCURRENCY_ENV = "MAGIC_EVAL_LLM_MAX_CONCURRENCY"
+
+T = TypeVar("T")
+
+
+class RateLimitPolicy(BaseModel):
+    """Limits and adaptation parameters of a rate limiter."""
+
+    requests_per_minute: float = Field(
+        600.0, gt=0, description="Request rate allowed per provider"
+    )
+    burst: int = Field(10, ge=1, description="Requests that may start back to back")
+    initial_concurrency: int = Field(4, ge=1, description="Starting concurrency limit")
+    min_concurrency: int = Field(1, ge=1, description="Lowest concurrency limit")
+    max_concurrency: int = Field(32, ge=1, description="Highest concurrency limit")
+    decrease_factor: float = Field(
+        0.5, gt=0, lt=1, description="Factor the limit is cut by when throttled"
+    )
+    latency_target_seconds: Optional[float] = Field(
+        None, gt=0, description="Calls slower than this count as throttled"
+    )
+    max_retries: int = Field(6, ge=0, description="Retries of a throttled call")
+    backoff_seconds: float = Field(
+        1.0, ge=0, description="First backoff without a Retry-After header"
+    )
+    max_backoff_seconds: float = Field(60.0, ge=0, description="Longest backoff")
+
+    @model_validator(mode="after")
+    def _check_concurrency(self) -> "RateLimitPolicy":
+        if not (
+            self.min_concurrency <= self.initial_concurrency <= self.max_concurrency
+        ):
+            raise ValueError(
+                "Expected min_concurrency <= initial_concurrency <= max_concurrency"
+            )
+        return self
+
+    @classmethod
+    def from_env(cls) -> "RateLimitPolicy":
+        """Return the default policy with the overrides set in the environment."""
+        settings = cls().model_dump()
+        if rpm := os.getenv(REQUESTS_PER_MINUTE_ENV):
+            settings["requests_per_minute"] = float(rpm)
+        if max_concurrency := os.getenv(MAX_CONCURRENCY_ENV):
+            settings["max_concurrency"] = int(max_concurrency)
+            for name in ("initial_concurrency", "min_concurrency"):
+                settings[name] = min(settings[name], int(max_concurrency))
+        return cls.model_validate(settings)
+
+
+class TokenBucket:
+    """Thread-safe token bucket that can be paused, e.g. for a Retry-After."""
+
+    def __init__(self, requests_per_minute: float, burst: int):
+        self.rate = requests_per_minute / 60
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_take(self) -> float:
+        """Take a token. Returns 0 on success, else the seconds until one is due."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._updated:
+                # Paused: the bucket starts refilling when the pause ends.
+                return self._updated - now
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for ``seconds``, then refill from empty."""
+        with self._lock:
+            self._updated = max(self._updated, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an exception raised by an LLM client is a 429."""
+    return (
+        getattr(error, "status_code", None) == 429
+        or type(error).__name__ == "RateLimitError"
+    )
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Return the Retry-After of a 429 in seconds, if the provider sent one."""
+    for attribute in ("litellm_response_headers", "headers"):
+        headers = getattr(error, attribute, None)
+        if headers is not None:
+            break
+    else:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+    try:
+        value = headers.get("retry-after") if headers is not None else None
+        return max(0.0, float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        # HTTP dates are rare for LLM APIs; fall back to the backoff.
+        return None
+
+
+class RateLimiter:
+    """
+    Rate and adaptive concurrency limit of one model.
+
+    Use :meth:`call` or :meth:`acall` to run a request under the limits;
+    they acquire a slot, retry on 429s and feed the outcome back into the
+    concurrency limit. Both work from any thread and event loop.
+    """
+
+    def __init__(self, model: str, bucket: TokenBucket, policy: RateLimitPolicy):
+        """
+        Args:
+            model: The model the limiter is for
+            bucket: Token bucket of the model's provider
+            policy: Limits and adaptation parameters
+        """
+        self.model = model
+        self.bucket = bucket
+        self.policy = policy
+        self.requests = 0
+        self.throttled = 0
+        self.decreases = 0
+        self.max_in_flight = 0
+        self._limit = float(policy.initial_concurrency)
+        self._in_flight = 0
+        # Bumped on every decrease; a call only cuts the limit if it started
+        # in the current window.
+        self._window = 0
+        self._cond = threading.Condition()
+        self._wakers: list[Callable[[], None]] = []
+
+    @property
+    def limit(self) -> int:
+        """The current concurrency limit."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """The number of calls currently holding a slot."""
+        return self._in_flight
+
+    def _try_acquire(self) -> tuple[Optional[int], Optional[float]]:
+        # Must hold self._cond. Returns (window, None) on success, else
+        # (None, seconds to wait or None to wait for a release).
+        if self._in_flight >= int(self._limit):
+            return None, None
+        wait = self.bucket.try_take()
+        if wait:
+            return None, wait
+        self._in_flight += 1
+        self.requests += 1
+        self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        return self._window, None
+
+    def acquire(self) -> int:
+        """Block until a slot is free. Returns the window to pass to release()."""
+        with self._cond:
+            while True:
+                window, wait = self._try_acquire()
+                if window is not None:
+                    return window
+                self._cond.wait(wait)
+
+    async def acquire_async(self) -> int:
+        """Like :meth:`acquire`, without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        while True:
+            woken = loop.create_future()
+
+            def wake(woken=woken):
+                try:
+                    loop.call_soon_threadsafe(_set_done, woken)
+                except RuntimeError:
+                    # The waiter's loop is closed.
+                    pass
+
+            with self._cond:
+                window, wait = self._try_acquire()
+                if window is not None:
+                    return window
+                self._wakers.append(wake)
+            try:
+                await asyncio.wait([woken], timeout=wait)
+            finally:
+                with self._cond:
+                    if wake in self._wakers:
+                        self._wakers.remove(wake)
+
+    def release(
+        self, window: int, latency_seconds: float, throttled: bool = False
+    ) -> None:
+        """
+        Free a slot and adapt the concurrency limit to the call's outcome.
+
+        Args:
+            window: What acquire() returned for the call
+            latency_seconds: How long the call took
+            throttled: Whether the call got a 429
+        """
+        policy = self.policy
+        target = policy.latency_target_seconds
+        with self._cond:
+            self._in_flight -= 1
+            if throttled or (target is not None and latency_seconds > target):
+                if window == self._window:
+                    self._limit = max(
+                        policy.min_concurrency, self._limit * policy.decrease_factor
+                    )
+                    self._window += 1
+                    self.decreases += 1
+            else:
+                # +1 per limit's worth of successful calls.
+                self._limit = min(policy.max_concurrency, self._limit + 1 / self._limit)
+            self._cond.notify_all()
+            wakers, self._wakers = self._wakers, []
+        for wake in wakers:
+            wake()
+
+    def cancel(self, window: int) -> None:
+        """Free a slot without feeding back, for calls that failed otherwise."""
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+            wakers, self._wakers = self._wakers, []
+        for wake in wakers:
+            wake()
+
+    def _backoff(self, error: BaseException, attempt: int) -> float:
+        # Pause the provider and return the pause, or raise if out of retries.
+        self.throttled += 1
+        delay = retry_after_seconds(error)
+        if delay is None:
+            delay = min(
+                self.policy.max_backoff_seconds,
+                self.policy.backoff_seconds * 2**attempt,
+            ) * random.uniform(0.5, 1.0)
+        self.bucket.pause(delay)
+        return delay
+
+    def call(self, fn: Callable[[], T]) -> T:
+        """
+        Run a synchronous LLM request under the limits, retrying 429s.
+
+        Args:
+            fn: Makes the request
+
+        Returns:
+            The request's result
+
+        Raises:
+            Exception: Whatever ``fn`` raised, including the last 429 once the
+                retries are used up
+        """
+        for attempt in range(self.policy.max_retries + 1):
+            window = self.acquire()
+            start = time.monotonic()
+            try:
+                result = fn()
+            except Exception as error:
+                if not is_rate_limit_error(error):
+                    self.cancel(window)
+                    raise
+                self.release(window, time.monotonic() - start, throttled=True)
+                self._backoff(error, attempt)
+                if attempt == self.policy.max_retries:
+                    raise
+                continue
+            except BaseException:
+                self.cancel(window)
+                raise
+            self.release(window, time.monotonic() - start)
+            return result
+        raise AssertionError("unreachable")
+
+    async def acall(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Like :meth:`call`, for an async request."""
+        for attempt in range(self.policy.max_retries + 1):
+            window = await self.acquire_async()
+            start = time.monotonic()
+            try:
+                result = await fn()
+            except Exception as error:
+                if not is_rate_limit_error(error):
+                    self.cancel(window)
+                    raise
+                self.release(window, time.monotonic() - start, throttled=True)
+                self._backoff(error, attempt)
+                if attempt == self.policy.max_retries:
+                    raise
+                continue
+            except BaseException:
+                self.cancel(window)
+                raise
+            self.release(window, time.monotonic() - start)
+            return result
+        raise AssertionError("unreachable")
+
+
+def _set_done(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+_registry_lock = threading.Lock()
+_buckets: dict[str, TokenBucket] = {}
+_limiters: dict[str, RateLimiter] = {}
+
+
+def provider_of(model: str) -> str:
+    """Return the provider of a LiteLLM model name, e.g. ``meta_llama``."""
+    return model.split("/", 1)[0]
+
+
+def rate_limiting_enabled() -> bool:
+    """Whether the environment leaves rate limiting on."""
+    return os.getenv(RATE_LIMIT_ENV, "").lower() != "off"
+
+
+def get_rate_limiter(
+    model: str, policy: Optional[RateLimitPolicy] = None
+) -> Optional[RateLimiter]:
+    """
+    Return the process-wide limiter of a model, creating it on first use.
+
+    Args:
+        model: LiteLLM model name, ``provider/model``
+        policy: Policy for a new limiter and, for the first model of a
+            provider, its token bucket. Defaults to ``RateLimitPolicy.from_env()``.
+
+    Returns:
+        Optional[RateLimiter]: The limiter, or None if rate limiting is off
+    """
+    if not rate_limiting_enabled():
+        return None
+    with _registry_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            policy = policy or RateLimitPolicy.from_env()
+            provider = provider_of(model)
+            bucket = _buckets.get(provider)
+            if bucket is None:
+                bucket = _buckets[provider] = TokenBucket(
+                    policy.requests_per_minute, policy.burst
+                )
+            limiter = _limiters[model] = RateLimiter(model, bucket, policy)
+        return limiter
+
+
+def reset_rate_limiters() -> None:
+    """Forget every limiter, e.g. between tests."""
+    with _registry_lock:
+        _buckets.clear()
+        _limiters.clear()
+
+
+def rate_limited(model: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Call ``fn(*args, **kwargs)`` under the limiter of ``model``."""
+    limiter = get_rate_limiter(model)
+    call = functools.partial(fn, *args, **kwargs)
+    return limiter.call(call) if limiter is not None else call()
+
+
+async def rate_limited_async(
+    model: str, fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any
+) -> T:
+    """Await ``fn(*args, **kwargs)`` under the limiter of ``model``."""
+    limiter = get_rate_limiter(model)
+    call = functools.partial(fn, *args, **kwargs)
+    return await (limiter.acall(call) if limiter is not None else call())
@@ -0,0 +1,113 @@
+"""Record and replay ADK agent event streams as on-disk cassettes."""
+
+import gzip
+import hashlib
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from pathlib import Path
+from typing import Iterator, Optional
+
+from google.adk.events import Event
+
+from src.fingerprint import agent_fingerprint
+
+
+class CassetteMode(str, Enum):
+    """How agent calls interact with cassettes."""
+
+    RECORD = "record"
+    REPLAY = "replay"
+
+
+class CassetteNotFoundError(LookupError):
+    """Raised in replay mode when no cassette exists for an agent call."""
+
+
+class CassetteLibrary:
+    """
+    Directory of gzipped JSON-lines cassettes, one per (agent config, query).
+
+    Each line is one ADK event serialized without unset fields.
+    """
+
+    def __init__(self, directory: Path | str, mode: CassetteMode | str):
+        self.directory = Path(directory)
+        self.mode = CassetteMode(mode)
+
+    def key(self, agent, query: str) -> str:
+        """Return the cassette key for an agent configuration and query."""
+        digest = hashlib.sha256()
+        digest.update(agent_fingerprint(agent).encode())
+        digest.update(b"\0" + query.encode())
+        return digest.hexdigest()
+
+    def path_for(self, agent, query: str) -> Path:
+        """Return the cassette file for an agent call."""
+        return self.directory / f"{self.key(agent, query)}.jsonl.gz"
+
+    def load(self, agent, query: str) -> list[Event]:
+        """Return the recorded events for an agent call."""
+        path = self.path_for(agent, query)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return [Event.model_validate_json(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            raise CassetteNotFoundError(
+                f"No cassette for query {query!r} at {path}"
+            ) from None
+
+    def save(self, agent, query: str, events: list[Event]) -> Path:
+        """Write the events of a completed agent call to its cassette."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(agent, query)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            for event in events:
+                f.write(event.model_dump_json(exclude_none=True, by_alias=True))
+                f.write("\n")
+        os.replace(tmp_path, path)
+        return path
+
+
+_active_cassettes: ContextVar[Optional[CassetteLibrary]] = ContextVar(
+    "active_cassettes", default=None
+)
+
+
+@contextmanager
+def use_cassettes(
+    directory: Path | str, mode: CassetteMode | str
+) -> Iterator[CassetteLibrary]:
+    """
+    Record or replay every agent call made inside the block.
+
+    The setting is carried by a context variable, so it also applies to tasks
+    started inside the block (e.g. by ``run_scenarios_concurrently``).
+
+    Args:
+        directory: Directory holding the cassettes
+        mode: ``"record"`` to run the agent and save its events, ``"replay"``
+            to serve saved events without running the agent
+
+    Yields:
+        CassetteLibrary: The active cassette library
+    """
+    library = CassetteLibrary(directory, mode)
+    token = _active_cassettes.set(library)
+    try:
+        yield library
+    finally:
+        _active_cassettes.reset(token)
+
+
+def active_cassettes() -> Optional[CassetteLibrary]:
+    """Return the cassette library in effect for the current context, if any."""
+    return _active_cassettes.get()
+
+
+def is_recording() -> bool:
+    """Whether agent calls in the current context are being recorded."""
+    library = active_cassettes()
+    return library is not None and library.mode is CassetteMode.RECORD
@@ -0,0 +1,59 @@
+"""LiteLLM clients for ADK agents that share rate limits and connections."""
+
+from functools import cache
+
+from google.adk.models.lite_llm import LiteLlm, LiteLLMClient
+
+from src.llm_clients import get_llm_client
+from src.rate_limit import rate_limited, rate_limited_async
+
+
+class RateLimitedLiteLLMClient(LiteLLMClient):
+    """
+    ``LiteLLMClient`` whose calls share the process-wide limiter of their model.
+
+    Pass it to ``LiteLlm(model=..., llm_client=RateLimitedLiteLLMClient())``.
+    The limiter retries 429s itself, so LiteLLM's own retries are turned off
+    unless ``max_retries`` is given.
+    """
+
+    async def acompletion(self, model, messages, tools, **kwargs):
+        kwargs.setdefault("max_retries", 0)
+        return await rate_limited_async(
+            model, super().acompletion, model, messages, tools, **kwargs
+        )
+
+    def completion(self, model, messages, tools, stream=False, **kwargs):
+        kwargs.setdefault("max_retries", 0)
+        return rate_limited(
+            model, super().completion, model, messages, tools, stream=stream, **kwargs
+        )
+
+
+class PooledLiteLLMClient(RateLimitedLiteLLMClient):
+    """
+    Rate-limited client that also sends its calls over the model's pooled
+    connections (``src.llm_clients``), unless a ``client`` is given.
+    """
+
+    async def acompletion(self, model, messages, tools, **kwargs):
+        if "client" not in kwargs:
+            pooled = get_llm_client(
+                model, kwargs.get("api_base"), kwargs.get("api_key")
+            )
+            kwargs.update(pooled.completion_kwargs(is_async=True))
+        return await super().acompletion(model, messages, tools, **kwargs)
+
+    def completion(self, model, messages, tools, stream=False, **kwargs):
+        if "client" not in kwargs:
+            pooled = get_llm_client(
+                model, kwargs.get("api_base"), kwargs.get("api_key")
+            )
+            kwargs.update(pooled.completion_kwargs(is_async=False))
+        return super().completion(model, messages, tools, stream=stream, **kwargs)
+
+
+@cache
+def get_lite_llm(model: str) -> LiteLlm:
+    """Return the shared ADK model for a LiteLLM model name."""
+    return LiteLlm(model=model, llm_client=PooledLiteLLMClient())
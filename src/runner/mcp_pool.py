@@ -0,0 +1,399 @@
+"""Long-lived MCP tool-server processes shared across scenario runs.
+
+A plain ``MCPToolset`` over stdio spawns its server process (for
+``mcp_server_time`` a whole Python interpreter) and runs the MCP handshake
+the first time a tool is used, and again whenever the session is lost. The
+pool keeps ``size`` server processes running with an initialized session
+each, hands the sessions out round-robin to every tool call, pings them in
+the background and restarts any process that crashed or stopped answering.
+A crashed server is noticed when a request on its session fails (a tool
+call or a health-check ping); its slot is restarted on the next use.
+
+``PooledMCPToolset`` is a drop-in ``MCPToolset`` that takes its sessions from
+the pool for its connection parameters, so all toolsets (and all concurrent
+scenario runs) talking to the same server command share the same processes.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+from contextlib import AsyncExitStack
+from datetime import timedelta
+from typing import Callable, Optional, TextIO, Union
+from weakref import WeakKeyDictionary
+
+import anyio
+from google.adk.tools.mcp_tool.mcp_session_manager import StdioConnectionParams
+from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE_ENV = "MAGIC_EVAL_MCP_POOL_SIZE"
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_HEALTH_CHECK_INTERVAL = 30.0
+DEFAULT_HEALTH_CHECK_TIMEOUT = 5.0
+DEFAULT_STARTUP_TIMEOUT = 30.0
+# Matches the timeout ADK gives plain StdioServerParameters.
+DEFAULT_READ_TIMEOUT = 5.0
+
+
+def default_pool_size() -> int:
+    """Return the pool size from ``MAGIC_EVAL_MCP_POOL_SIZE``, or the default."""
+    return max(1, int(os.getenv(POOL_SIZE_ENV, DEFAULT_POOL_SIZE)))
+
+
+def _stdio_params(
+    connection_params: Union[StdioServerParameters, StdioConnectionParams],
+) -> tuple[StdioServerParameters, float]:
+    """Return the server parameters and the read timeout for a connection."""
+    if isinstance(connection_params, StdioConnectionParams):
+        return connection_params.server_params, connection_params.timeout
+    if isinstance(connection_params, StdioServerParameters):
+        return connection_params, DEFAULT_READ_TIMEOUT
+    raise ValueError(
+        "MCP server pools only support stdio connections, got "
+        f"{type(connection_params).__name__}"
+    )
+
+
+class _SlotSession(ClientSession):
+    """A ``ClientSession`` that reports a lost connection to its slot."""
+
+    def __init__(self, *args, on_lost: Callable[[ClientSession], None], **kwargs):
+        super().__init__(*args, **kwargs)
+        self._on_lost = on_lost
+
+    async def send_request(self, *args, **kwargs):
+        try:
+            return await super().send_request(*args, **kwargs)
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            # The server process is gone; ADK retries closed-resource errors
+            # with a new session, which the pool restarts the slot for.
+            self._on_lost(self)
+            raise
+
+
+class _ServerSlot:
+    """
+    One server process and its initialized MCP session.
+
+    The stdio transport and the session are anyio context managers that must
+    be entered and exited in the same task, so each slot runs them in an
+    owner task that lives as long as the process.
+    """
+
+    def __init__(
+        self,
+        server_params: StdioServerParameters,
+        read_timeout: float,
+        errlog: TextIO,
+    ):
+        self.server_params = server_params
+        self.read_timeout = read_timeout
+        self.errlog = errlog
+        self.session: Optional[ClientSession] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+        self.lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether the process is up and no request on its session has failed."""
+        if self._task is None or self._task.done():
+            return False
+        return self.session is not None
+
+    def _lost(self, session: ClientSession) -> None:
+        # A session from before a restart may fail late; only the current
+        # one takes the slot down.
+        if session is self.session:
+            self.session = None
+
+    async def start(self, timeout: float = DEFAULT_STARTUP_TIMEOUT) -> None:
+        """Spawn the server and wait until its session is initialized."""
+        ready = asyncio.get_running_loop().create_future()
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self._own(ready, self._stop))
+        try:
+            self.session = await asyncio.wait_for(ready, timeout)
+        except BaseException:
+            await self.stop()
+            raise
+
+    async def _own(self, ready: asyncio.Future, stop: asyncio.Event) -> None:
+        try:
+            async with AsyncExitStack() as stack:
+                read, write = await stack.enter_async_context(
+                    stdio_client(server=self.server_params, errlog=self.errlog)
+                )
+                session = await stack.enter_async_context(
+                    _SlotSession(
+                        read,
+                        write,
+                        read_timeout_seconds=timedelta(seconds=self.read_timeout),
+                        on_lost=self._lost,
+                    )
+                )
+                await session.initialize()
+                if ready.done():
+                    return
+                ready.set_result(session)
+                await stop.wait()
+        except asyncio.CancelledError:
+            if not ready.done():
+                ready.cancel()
+            raise
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning("MCP server %s exited: %r", self.server_params, e)
+
+    async def ping(self, timeout: float) -> bool:
+        """Return whether the server answers a ping within ``timeout`` seconds."""
+        if not self.running:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout)
+        except Exception:
+            return False
+        return True
+
+    async def stop(self) -> None:
+        """Shut the session and the server process down."""
+        task, self._task, self.session = self._task, None, None
+        if task is None:
+            return
+        self._stop.set()
+        _, pending = await asyncio.wait({task}, timeout=DEFAULT_HEALTH_CHECK_TIMEOUT)
+        if pending:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+class MCPServerPool:
+    """
+    A fixed number of long-lived stdio MCP server processes.
+
+    The pool can be used wherever ADK expects an ``MCPSessionManager``:
+    :meth:`create_session` returns an already initialized session instead of
+    spawning a process, so the per-call cost no longer includes interpreter
+    startup or the MCP handshake.
+    """
+
+    def __init__(
+        self,
+        connection_params: Union[StdioServerParameters, StdioConnectionParams],
+        size: Optional[int] = None,
+        health_check_interval: Optional[float] = DEFAULT_HEALTH_CHECK_INTERVAL,
+        health_check_timeout: float = DEFAULT_HEALTH_CHECK_TIMEOUT,
+        errlog: TextIO = sys.stderr,
+    ):
+        """
+        Args:
+            connection_params: How to start the server; only stdio is supported
+            size: Number of server processes. Defaults to
+                ``MAGIC_EVAL_MCP_POOL_SIZE`` or 2.
+            health_check_interval: Seconds between background health checks,
+                or None to only check on demand
+            health_check_timeout: Seconds a server has to answer a ping
+            errlog: Where the servers' stderr goes
+        """
+        server_params, read_timeout = _stdio_params(connection_params)
+        self.connection_params = connection_params
+        self.size = size if size is not None else default_pool_size()
+        if self.size < 1:
+            raise ValueError("MCP server pool size must be at least 1")
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.restarts = 0
+        self._slots = [
+            _ServerSlot(server_params, read_timeout, errlog) for _ in range(self.size)
+        ]
+        self._next = 0
+        self._started = False
+        self._start_lock = asyncio.Lock()
+        self._health_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start every server process and the background health checks."""
+        async with self._start_lock:
+            if self._started:
+                return
+            starts = await asyncio.gather(
+                *(slot.start() for slot in self._slots), return_exceptions=True
+            )
+            failures = [e for e in starts if isinstance(e, BaseException)]
+            if failures:
+                # Nothing would ever close the servers that did come up.
+                await asyncio.gather(*(slot.stop() for slot in self._slots))
+                raise failures[0]
+            self._started = True
+            if self.health_check_interval:
+                self._health_task = asyncio.create_task(self._health_loop())
+
+    async def create_session(
+        self, headers: Optional[dict[str, str]] = None
+    ) -> ClientSession:
+        """
+        Return the next pooled session, restarting its server if it died.
+
+        Args:
+            headers: Ignored; stdio sessions carry no headers. Accepted so the
+                pool can stand in for ADK's ``MCPSessionManager``.
+
+        Returns:
+            ClientSession: An initialized session
+        """
+        if not self._started:
+            await self.start()
+        slot = self._slots[self._next % self.size]
+        self._next += 1
+        if not slot.running:
+            await self._restart(slot)
+        return slot.session
+
+    async def check_health(self) -> int:
+        """
+        Ping every server and restart those that don't answer.
+
+        Returns:
+            int: Number of servers that were restarted
+        """
+        alive = await asyncio.gather(
+            *(slot.ping(self.health_check_timeout) for slot in self._slots)
+        )
+        dead = [slot for slot, ok in zip(self._slots, alive) if not ok]
+        await asyncio.gather(*(self._restart(slot) for slot in dead))
+        return len(dead)
+
+    @property
+    def healthy_count(self) -> int:
+        """Number of servers whose process and session are up."""
+        return sum(slot.running for slot in self._slots)
+
+    async def _restart(self, slot: _ServerSlot) -> None:
+        async with slot.lock:
+            # Another caller may have restarted the slot while we waited.
+            if slot.running:
+                return
+            logger.warning("Restarting MCP server %s", slot.server_params.command)
+            await slot.stop()
+            await slot.start()
+            self.restarts += 1
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                await self.check_health()
+            except Exception:
+                logger.exception("MCP server health check failed")
+
+    async def close(self) -> None:
+        """Stop the health checks and every server process."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+            self._health_task = None
+        await asyncio.gather(*(slot.stop() for slot in self._slots))
+        self._started = False
+
+
+# Server processes belong to the event loop that started them, so pools are
+# kept per loop and shared by every toolset with the same server command.
+_pools: "WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple, MCPServerPool]]" = (
+    WeakKeyDictionary()
+)
+
+
+def _pool_key(server_params: StdioServerParameters, size: int) -> tuple:
+    return (
+        server_params.command,
+        tuple(server_params.args),
+        tuple(sorted((server_params.env or {}).items())),
+        str(server_params.cwd),
+        size,
+    )
+
+
+def get_mcp_server_pool(
+    connection_params: Union[StdioServerParameters, StdioConnectionParams],
+    size: Optional[int] = None,
+) -> MCPServerPool:
+    """
+    Return the shared pool for a server on the running event loop.
+
+    Args:
+        connection_params: How to start the server
+        size: Number of server processes; defaults to ``default_pool_size()``
+
+    Returns:
+        MCPServerPool: The pool, created (but not started) on first use
+    """
+    size = size if size is not None else default_pool_size()
+    server_params, _ = _stdio_params(connection_params)
+    pools = _pools.setdefault(asyncio.get_running_loop(), {})
+    key = _pool_key(server_params, size)
+    pool = pools.get(key)
+    if pool is None:
+        pool = pools[key] = MCPServerPool(connection_params, size=size)
+    return pool
+
+
+async def close_mcp_server_pools() -> None:
+    """Close every shared pool of the running event loop."""
+    pools = _pools.pop(asyncio.get_running_loop(), {})
+    await asyncio.gather(*(pool.close() for pool in pools.values()))
+
+
+class PooledMCPToolset(MCPToolset):
+    """
+    An ``MCPToolset`` whose sessions come from a shared :class:`MCPServerPool`.
+
+    Closing the toolset (which ADK runners do when they close) leaves the
+    shared servers running; use :func:`close_mcp_server_pools` or close the
+    pool passed in to stop them.
+    """
+
+    def __init__(
+        self,
+        *,
+        connection_params: Union[StdioServerParameters, StdioConnectionParams],
+        pool_size: Optional[int] = None,
+        pool: Optional[MCPServerPool] = None,
+        **kwargs,
+    ):
+        """
+        Args:
+            connection_params: How to start the server; only stdio is supported
+            pool_size: Size of the shared pool used when no pool is given
+            pool: A specific pool to use instead of the shared one
+            **kwargs: Passed on to ``MCPToolset``
+        """
+        _stdio_params(connection_params)
+        super().__init__(connection_params=connection_params, **kwargs)
+        self._pool = pool
+        self._pool_size = pool_size
+        # MCPToolset.get_tools and every MCPTool it creates call
+        # create_session() on this object.
+        self._mcp_session_manager = self
+
+    @property
+    def pool(self) -> MCPServerPool:
+        """The pool serving this toolset on the running event loop."""
+        if self._pool is not None:
+            return self._pool
+        return get_mcp_server_pool(self._connection_params, self._pool_size)
+
+    async def create_session(
+        self, headers: Optional[dict[str, str]] = None
+    ) -> ClientSession:
+        return await self.pool.create_session(headers=headers)
+
+    async def close(self) -> None:
+        """Leave the shared server processes running for other toolsets."""
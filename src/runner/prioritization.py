@@ -0,0 +1,132 @@
+"""Order scenarios by their history so regressions show up first.
+
+``ScenarioHistory`` keeps a few numbers per scenario across runs (keyed by
+the scenario hash, so renaming a scenario keeps its history).
+``prioritize`` then orders a suite as:
+
+1. scenarios whose last run failed, most recent failure first;
+2. flaky scenarios, whose verdict changed between runs, flakiest first;
+3. the remaining known scenarios, slowest first;
+4. scenarios without history, in their original order.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from src.models import Scenario, ScenarioResult
+from src.runner.result_cache import scenario_hash
+
+DEFAULT_HISTORY_PATH = Path(".magic_eval_cache") / "scenario_history.json"
+
+FAILED = 0
+FLAKY = 1
+KNOWN = 2
+UNSEEN = 3
+
+
+class ScenarioStats(BaseModel):
+    """Run history of one scenario."""
+
+    name: str = Field(..., description="Name of the scenario when last run")
+    runs: int = Field(0, description="Number of recorded runs")
+    failures: int = Field(0, description="Number of failing runs")
+    flips: int = Field(0, description="Times the verdict differed from the previous run")
+    last_passed: bool = Field(True, description="Verdict of the last run")
+    last_run_at: float = Field(0.0, description="Unix time of the last run")
+    mean_latency_seconds: float = Field(0.0, description="Mean latency of all runs")
+
+    @property
+    def flip_rate(self) -> float:
+        return self.flips / (self.runs - 1) if self.runs > 1 else 0.0
+
+    def record(self, result: ScenarioResult, at: float) -> None:
+        """Add one run to the history."""
+        if self.runs and result.passed != self.last_passed:
+            self.flips += 1
+        self.mean_latency_seconds += (
+            result.latency_seconds - self.mean_latency_seconds
+        ) / (self.runs + 1)
+        self.runs += 1
+        self.failures += not result.passed
+        self.last_passed = result.passed
+        self.last_run_at = at
+        self.name = result.scenario_name
+
+
+class ScenarioHistory(BaseModel):
+    """Run history of every scenario, by scenario hash."""
+
+    entries: dict[str, ScenarioStats] = Field(
+        default_factory=dict, description="Stats by scenario hash"
+    )
+
+    @classmethod
+    def load(cls, path: Path | str = DEFAULT_HISTORY_PATH) -> "ScenarioHistory":
+        """Load a history, returning an empty one if the file does not exist."""
+        try:
+            return cls.model_validate_json(Path(path).read_bytes())
+        except FileNotFoundError:
+            return cls()
+
+    def save(self, path: Path | str = DEFAULT_HISTORY_PATH) -> None:
+        """Write the history atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(self.model_dump_json())
+        os.replace(tmp_path, path)
+
+    def get(self, scenario: Scenario) -> Optional[ScenarioStats]:
+        """Return the stats of a scenario, or None if it never ran."""
+        return self.entries.get(scenario_hash(scenario))
+
+    def record(
+        self,
+        scenarios: list[Scenario],
+        results: list[Optional[ScenarioResult]],
+    ) -> None:
+        """
+        Add the results of a run.
+
+        Args:
+            scenarios: The scenarios of the run
+            results: Their results, in the same order. Skipped scenarios
+                (None) and results reused from the result cache are ignored.
+        """
+        now = time.time()
+        for scenario, result in zip(scenarios, results):
+            if result is None or result.provenance is not None:
+                continue
+            key = scenario_hash(scenario)
+            stats = self.entries.setdefault(key, ScenarioStats(name=scenario.name))
+            stats.record(result, now)
+
+
+def priority(stats: Optional[ScenarioStats]) -> tuple:
+    """Return the sort key of a scenario; lower runs earlier."""
+    if stats is None:
+        return (UNSEEN,)
+    if not stats.last_passed:
+        return (FAILED, -stats.last_run_at)
+    if stats.flips:
+        return (FLAKY, -stats.flip_rate)
+    return (KNOWN, -stats.mean_latency_seconds)
+
+
+def prioritize(scenarios: list[Scenario], history: ScenarioHistory) -> list[Scenario]:
+    """
+    Order scenarios failed first, then flaky, then slow, then the rest.
+
+    Args:
+        scenarios: The scenarios to run
+        history: Their run history
+
+    Returns:
+        list[Scenario]: The same scenarios, reordered. The sort is stable, so
+            scenarios without history keep their relative order.
+    """
+    return sorted(scenarios, key=lambda scenario: priority(history.get(scenario)))
@@ -0,0 +1,224 @@
+"""Persistent cache of scenario results, to skip unchanged scenarios.
+
+A result is stored under a hash of the agent's fingerprint (model,
+instructions, tools, sub-agents) and of the scenario's query and expected
+tool call. As long as neither changes, later runs reuse the cached verdict
+instead of running the agent again; the reused result carries a
+``ResultProvenance`` saying which run produced it. Only passing results are
+cached by default, so failures are always rerun.
+
+The cache is a plain directory of JSON files written with an atomic rename,
+so CI workers can share one directory (``MAGIC_EVAL_CACHE_DIR``).
+"""
+
+import hashlib
+import json
+import os
+import socket
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field
+
+from src.fingerprint import agent_fingerprint
+from src.models import ResultProvenance, Scenario, ScenarioResult
+
+DEFAULT_CACHE_DIR = Path(".magic_eval_cache") / "results"
+DEFAULT_MAX_ENTRIES = 100_000
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+# MAGIC_EVAL_RESULT_CACHE=off runs everything, =refresh reruns everything
+# and overwrites the cached results.
+CACHE_MODE_ENV = "MAGIC_EVAL_RESULT_CACHE"
+CACHE_DIR_ENV = "MAGIC_EVAL_CACHE_DIR"
+
+
+def scenario_hash(scenario: Scenario) -> str:
+    """Hash the parts of a scenario that decide its verdict."""
+    scenario_json = json.dumps(
+        {"query": scenario.query, "expected_tool_call": scenario.expected_tool_call},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(scenario_json.encode()).hexdigest()
+
+
+def result_key(fingerprint: str, scenario: Scenario) -> str:
+    """
+    Return the cache key of a scenario run against an agent.
+
+    Args:
+        fingerprint: ``agent_fingerprint()`` of the agent under test
+        scenario: The scenario
+
+    Returns:
+        str: Hex sha256 digest of the fingerprint and the scenario hash
+    """
+    digest = hashlib.sha256(fingerprint.encode())
+    digest.update(b"\0" + scenario_hash(scenario).encode())
+    return digest.hexdigest()
+
+
+class ResultCacheEntry(BaseModel):
+    """A cached scenario result as stored on disk."""
+
+    key: str = Field(..., description="Key the entry is stored under")
+    agent_fingerprint: str = Field(..., description="Fingerprint of the agent")
+    scenario_hash: str = Field(..., description="Hash of the scenario")
+    provenance: ResultProvenance = Field(..., description="Run that produced it")
+    result: ScenarioResult = Field(..., description="The result as it was run")
+
+
+class ResultCache:
+    """
+    Directory of cached scenario results keyed by result_key().
+
+    Entries older than ``max_age_seconds`` are misses, so every scenario is
+    rerun periodically even if nothing changed. When the directory holds
+    more than ``max_entries`` files or ``max_bytes`` bytes, the least
+    recently used entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        directory: Path | str = DEFAULT_CACHE_DIR,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+        cache_failures: bool = False,
+        run_id: Optional[str] = None,
+    ):
+        """
+        Args:
+            directory: Where entries are stored; may be shared between workers
+            max_entries: Maximum number of cached results
+            max_bytes: Maximum total size of the cached results
+            max_age_seconds: Time to live of an entry
+            cache_failures: Also cache failing results instead of rerunning them
+            run_id: Recorded in the provenance of results this cache stores
+        """
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.cache_failures = cache_failures
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, agent: Any, scenario: Scenario) -> Optional[ScenarioResult]:
+        """Return the cached result with its provenance, or None on a miss."""
+        return self.get_by_fingerprint(agent_fingerprint(agent), scenario)
+
+    def get_by_fingerprint(
+        self, fingerprint: str, scenario: Scenario
+    ) -> Optional[ScenarioResult]:
+        """Like :meth:`get`, for callers that already fingerprinted the agent."""
+        path = self._path(result_key(fingerprint, scenario))
+        try:
+            entry = ResultCacheEntry.model_validate_json(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            # Corrupt or outdated entry: treat as a miss and drop it.
+            path.unlink(missing_ok=True)
+            return None
+
+        if time.time() - entry.provenance.recorded_at > self.max_age_seconds:
+            path.unlink(missing_ok=True)
+            return None
+
+        # Bump the mtime so size-based eviction is least-recently-used.
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return entry.result.model_copy(
+            update={"scenario_name": scenario.name, "provenance": entry.provenance}
+        )
+
+    def put(self, agent: Any, scenario: Scenario, result: ScenarioResult) -> bool:
+        """Cache a result; returns False if the cache doesn't keep it."""
+        return self.put_by_fingerprint(agent_fingerprint(agent), scenario, result)
+
+    def put_by_fingerprint(
+        self, fingerprint: str, scenario: Scenario, result: ScenarioResult
+    ) -> bool:
+        """Like :meth:`put`, for callers that already fingerprinted the agent."""
+        if not result.passed and not self.cache_failures:
+            return False
+
+        key = result_key(fingerprint, scenario)
+        entry = ResultCacheEntry(
+            key=key,
+            agent_fingerprint=fingerprint,
+            scenario_hash=scenario_hash(scenario),
+            provenance=ResultProvenance(
+                cache_key=key,
+                run_id=self.run_id,
+                host=socket.gethostname(),
+                recorded_at=time.time(),
+            ),
+            result=result.model_copy(update={"provenance": None}),
+        )
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent readers, possibly on other hosts
+        # sharing the directory, never see a partial file.
+        tmp_path = self._path(key).with_suffix(f".{uuid.uuid4().hex}.tmp")
+        tmp_path.write_text(entry.model_dump_json())
+        os.replace(tmp_path, self._path(key))
+        return True
+
+    def evict(self) -> int:
+        """Apply the age and size limits. Returns the number of entries removed."""
+        if not self.directory.exists():
+            return 0
+
+        now = time.time()
+        entries = []
+        removed = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.max_age_seconds:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        while entries and (
+            len(entries) > self.max_entries or total_bytes > self.max_bytes
+        ):
+            _, size, path = entries.pop(0)
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Remove every cached result."""
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+def default_result_cache() -> Optional[ResultCache]:
+    """Return the cache configured by the environment, or None if disabled."""
+    if os.getenv(CACHE_MODE_ENV, "").lower() == "off":
+        return None
+    cache_dir = os.getenv(CACHE_DIR_ENV)
+    if cache_dir:
+        return ResultCache(Path(cache_dir) / "results")
+    return ResultCache()
+
+
+def refresh_requested() -> bool:
+    """Whether the environment asks to rerun and overwrite cached results."""
+    return os.getenv(CACHE_MODE_ENV, "").lower() == "refresh"
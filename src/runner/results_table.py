@@ -0,0 +1,259 @@
+"""Columnar, array-backed storage and aggregation for scenario run results."""
+
+from pathlib import Path
+from typing import Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+from src.models import ScenarioResult
+
+NO_TOOL = "<none>"
+DEFAULT_PERCENTILES = (50.0, 90.0, 95.0, 99.0)
+
+_INITIAL_CAPACITY = 64
+# Numeric columns and their dtypes. Tool names are stored as integer codes
+# into ``tool_names``, with code 0 reserved for "no tool", and missing
+# timings are stored as NaN.
+_COLUMNS = {
+    "passed": np.bool_,
+    "latency_seconds": np.float64,
+    "event_count": np.int64,
+    "time_to_first_event_seconds": np.float64,
+    "time_to_first_function_call_seconds": np.float64,
+    "input_tokens": np.int64,
+    "output_tokens": np.int64,
+    "expected_code": np.int32,
+    "observed_code": np.int32,
+    "tool_call_offset": np.int64,
+}
+
+
+def _or_nan(value: Optional[float]) -> float:
+    return np.nan if value is None else value
+
+
+def _or_none(value: np.float64) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+def _observed_code(expected: int, codes: list[int]) -> int:
+    if expected and expected in codes:
+        return expected
+    return codes[0] if codes else 0
+
+
+class ResultsTable:
+    """
+    Scenario results stored column-wise in growable numpy arrays.
+
+    Each row is one ``ScenarioResult``. The observed tool calls of every row
+    are kept as one flat array of tool codes plus per-row offsets, and
+    ``observed_code`` holds the single tool the confusion matrix compares
+    against the expectation: the expected tool if it was called, otherwise
+    the first tool called, otherwise "no tool".
+    """
+
+    def __init__(self, capacity: int = _INITIAL_CAPACITY):
+        self._size = 0
+        self._columns = {
+            name: np.zeros(max(capacity, 1), dtype=dtype)
+            for name, dtype in _COLUMNS.items()
+        }
+        self._names: list[str] = []
+        self._tool_calls = np.zeros(max(capacity, 1), dtype=np.int32)
+        self._tool_call_count = 0
+        self.tool_names: list[str] = [NO_TOOL]
+        self._tool_codes = {NO_TOOL: 0}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a read-only view of a numeric column."""
+        view = self._columns[name][: self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def scenario_names(self) -> list[str]:
+        return list(self._names)
+
+    def _tool_code(self, tool_name: Optional[str]) -> int:
+        if tool_name is None:
+            return 0
+        code = self._tool_codes.get(tool_name)
+        if code is None:
+            code = self._tool_codes[tool_name] = len(self.tool_names)
+            self.tool_names.append(tool_name)
+        return code
+
+    def _reserve(self, rows: int, tool_calls: int) -> None:
+        capacity = len(self._columns["passed"])
+        if self._size + rows > capacity:
+            new_capacity = max(capacity * 2, self._size + rows)
+            for name, array in self._columns.items():
+                grown = np.zeros(new_capacity, dtype=array.dtype)
+                grown[: self._size] = array[: self._size]
+                self._columns[name] = grown
+        if self._tool_call_count + tool_calls > len(self._tool_calls):
+            grown = np.zeros(
+                max(len(self._tool_calls) * 2, self._tool_call_count + tool_calls),
+                dtype=np.int32,
+            )
+            grown[: self._tool_call_count] = self._tool_calls[: self._tool_call_count]
+            self._tool_calls = grown
+
+    def append(self, result: ScenarioResult) -> None:
+        """Append one scenario result as a new row."""
+        self.extend([result])
+
+    def extend(self, results: Iterable[ScenarioResult]) -> None:
+        """Append many scenario results, growing the columns at most once."""
+        results = list(results)
+        self._reserve(len(results), sum(len(r.tool_calls) for r in results))
+        columns = self._columns
+        for result in results:
+            row = self._size
+            codes = [self._tool_code(name) for name in result.tool_calls]
+            columns["passed"][row] = result.passed
+            columns["latency_seconds"][row] = result.latency_seconds
+            columns["event_count"][row] = result.event_count
+            columns["time_to_first_event_seconds"][row] = _or_nan(
+                result.time_to_first_event_seconds
+            )
+            columns["time_to_first_function_call_seconds"][row] = _or_nan(
+                result.time_to_first_function_call_seconds
+            )
+            columns["input_tokens"][row] = result.input_tokens
+            columns["output_tokens"][row] = result.output_tokens
+            expected = self._tool_code(result.expected_tool_call)
+            columns["expected_code"][row] = expected
+            columns["observed_code"][row] = _observed_code(expected, codes)
+            columns["tool_call_offset"][row] = self._tool_call_count
+            self._tool_calls[
+                self._tool_call_count : self._tool_call_count + len(codes)
+            ] = codes
+            self._tool_call_count += len(codes)
+            self._names.append(result.scenario_name)
+            self._size += 1
+
+    @classmethod
+    def from_results(cls, results: Sequence[ScenarioResult]) -> "ResultsTable":
+        """Build a table from a list of scenario results."""
+        table = cls(capacity=len(results))
+        table.extend(results)
+        return table
+
+    def row(self, index: int) -> ScenarioResult:
+        """Rebuild the ``ScenarioResult`` stored at a row."""
+        if not -self._size <= index < self._size:
+            raise IndexError("row index out of range")
+        index %= self._size
+        columns = self._columns
+        start = columns["tool_call_offset"][index]
+        end = (
+            columns["tool_call_offset"][index + 1]
+            if index + 1 < self._size
+            else self._tool_call_count
+        )
+        expected = int(columns["expected_code"][index])
+        return ScenarioResult(
+            scenario_name=self._names[index],
+            expected_tool_call=self.tool_names[expected] if expected else None,
+            passed=bool(columns["passed"][index]),
+            latency_seconds=float(columns["latency_seconds"][index]),
+            event_count=int(columns["event_count"][index]),
+            time_to_first_event_seconds=_or_none(
+                columns["time_to_first_event_seconds"][index]
+            ),
+            time_to_first_function_call_seconds=_or_none(
+                columns["time_to_first_function_call_seconds"][index]
+            ),
+            tool_calls=[self.tool_names[c] for c in self._tool_calls[start:end]],
+            input_tokens=int(columns["input_tokens"][index]),
+            output_tokens=int(columns["output_tokens"][index]),
+        )
+
+    def pass_rate(self) -> float:
+        """Return the fraction of scenarios that passed, or NaN for an empty table."""
+        if not self._size:
+            return float("nan")
+        return float(self.column("passed").mean())
+
+    def pass_rate_by_tool(self) -> dict[str, float]:
+        """Return the pass rate of the scenarios expecting each tool."""
+        expected = self.column("expected_code")
+        totals = np.bincount(expected, minlength=len(self.tool_names))
+        passes = np.bincount(
+            expected, weights=self.column("passed"), minlength=len(self.tool_names)
+        )
+        return {
+            self.tool_names[code]: float(passes[code] / totals[code])
+            for code in np.flatnonzero(totals)
+        }
+
+    def confusion_matrix(self) -> tuple[list[str], np.ndarray]:
+        """
+        Count expected tool calls against the tool the agent actually called.
+
+        Returns:
+            tuple[list[str], np.ndarray]: The labels, with ``NO_TOOL`` first,
+                and a square matrix whose rows are the expected tool and whose
+                columns are the observed tool
+        """
+        size = len(self.tool_names)
+        flat = self.column("expected_code").astype(np.int64) * size + self.column(
+            "observed_code"
+        )
+        matrix = np.bincount(flat, minlength=size * size).reshape(size, size)
+        return list(self.tool_names), matrix
+
+    def latency_percentiles(
+        self, percentiles: Sequence[float] = DEFAULT_PERCENTILES
+    ) -> dict[float, float]:
+        """Return latency percentiles in seconds, keyed by percentile."""
+        if not self._size:
+            return {p: float("nan") for p in percentiles}
+        values = np.percentile(self.column("latency_seconds"), percentiles)
+        return dict(zip(percentiles, values.tolist()))
+
+    def token_totals(self) -> tuple[int, int]:
+        """Return the total input and output tokens over every row."""
+        return (
+            int(self.column("input_tokens").sum()),
+            int(self.column("output_tokens").sum()),
+        )
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write the table to a compressed ``.npz`` file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f,
+                scenario_names=np.array(self._names, dtype=np.str_),
+                tool_names=np.array(self.tool_names, dtype=np.str_),
+                tool_calls=self._tool_calls[: self._tool_call_count],
+                **{name: self.column(name) for name in _COLUMNS},
+            )
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ResultsTable":
+        """Read a table written by ``save``."""
+        with np.load(path, allow_pickle=False) as data:
+            size = len(data["passed"])
+            table = cls(capacity=size)
+            for name in _COLUMNS:
+                # Tables saved before a column existed load it as missing.
+                table._columns[name][:size] = (
+                    data[name] if name in data.files else np.nan
+                )
+            table._names = data["scenario_names"].tolist()
+            table.tool_names = data["tool_names"].tolist()
+            tool_calls = data["tool_calls"]
+        table._size = size
+        table._tool_codes = {name: code for code, name in enumerate(table.tool_names)}
+        table._tool_calls = np.array(tool_calls, dtype=np.int32)
+        table._tool_call_count = len(tool_calls)
+        return table
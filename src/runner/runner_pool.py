@@ -0,0 +1,220 @@
+"""Long-lived ADK runners sharing one session service across agent calls."""
+
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
+from google.adk.agents import Agent
+from google.adk.runners import Runner
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, InMemorySessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.adk.sessions.state import State
+
+
+class DisposableSessionService(InMemorySessionService):
+    """
+    In-memory sessions that are deleted as soon as their agent call is over.
+
+    ``InMemorySessionService`` deep-copies a session every time it is created,
+    read or deleted (deletion copies it, events included, just to check that
+    it exists), and for a pooled call those copies cost more than reusing the
+    runner saves. A disposable session is only ever used by the one call that
+    created it, so here the stored session itself is handed out, events are
+    appended to it once, and a deleted session is simply dropped along with
+    the maps it leaves empty.
+    """
+
+    def _create_session_impl(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        if session_id is None or not session_id.strip():
+            session_id = str(uuid.uuid4())
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id.strip(),
+            state=state or {},
+            last_update_time=time.time(),
+        )
+        self.sessions.setdefault(app_name, {}).setdefault(user_id, {})[
+            session.id
+        ] = session
+        return self._merge_state(app_name, user_id, session)
+
+    def _get_session_impl(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        if config is not None:
+            return super()._get_session_impl(
+                app_name=app_name,
+                user_id=user_id,
+                session_id=session_id,
+                config=config,
+            )
+        session = self.sessions.get(app_name, {}).get(user_id, {}).get(session_id)
+        if session is None:
+            return None
+        return self._merge_state(app_name, user_id, session)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        stored = self.sessions.get(session.app_name, {}).get(session.user_id, {})
+        if stored.get(session.id) is not session:
+            return await super().append_event(session=session, event=event)
+        # The base class would append the event to the stored session a second
+        # time, so only its app and user state handling is repeated here.
+        await BaseSessionService.append_event(self, session=session, event=event)
+        session.last_update_time = event.timestamp
+        if event.actions and event.actions.state_delta:
+            for key, value in event.actions.state_delta.items():
+                if key.startswith(State.APP_PREFIX):
+                    self.app_state.setdefault(session.app_name, {})[
+                        key.removeprefix(State.APP_PREFIX)
+                    ] = value
+                if key.startswith(State.USER_PREFIX):
+                    self.user_state.setdefault(session.app_name, {}).setdefault(
+                        session.user_id, {}
+                    )[key.removeprefix(State.USER_PREFIX)] = value
+        return event
+
+    def _delete_session_impl(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        users = self.sessions.get(app_name, {})
+        sessions = users.get(user_id, {})
+        sessions.pop(session_id, None)
+        if not sessions:
+            users.pop(user_id, None)
+        if not users:
+            self.sessions.pop(app_name, None)
+
+
+class RunnerPool:
+    """
+    Cache of ADK runners keyed by (agent, app_name).
+
+    All runners share a single session service, a
+    :class:`DisposableSessionService` unless one is given. Sessions are handed
+    out per call through :meth:`open_session` (or :meth:`session`) and deleted
+    as soon as the call finishes, so memory stays flat no matter how many
+    scenarios run through the pool.
+    """
+
+    def __init__(self, session_service: Optional[BaseSessionService] = None):
+        self.session_service = session_service or DisposableSessionService()
+        self._runners: dict[tuple[int, str], Runner] = {}
+        self._live_sessions: set[tuple[str, str, str]] = set()
+
+    def get_runner(self, agent: Agent, app_name: str) -> Runner:
+        """Return the pooled runner for an agent, creating it on first use."""
+        # The runner holds a reference to the agent, so its id() can't be
+        # reused by another object while the entry is cached.
+        key = (id(agent), app_name)
+        runner = self._runners.get(key)
+        if runner is None:
+            runner = Runner(
+                agent=agent, app_name=app_name, session_service=self.session_service
+            )
+            self._runners[key] = runner
+        return runner
+
+    async def open_session(
+        self, agent: Agent, app_name: str, user_id: str, session_id: str
+    ) -> tuple[Session, Runner]:
+        """
+        Create a session for one agent call.
+
+        The session must be handed back to :meth:`close_session` once the call
+        is over; :meth:`session` does both around a block.
+
+        Args:
+            agent: The ADK agent to run
+            app_name: The application name used for the runner and session
+            user_id: The user id for the session
+            session_id: The preferred session id. If a session with this id is
+                already live in the pool, a unique suffix is added.
+
+        Returns:
+            tuple[Session, Runner]: The new session and the pooled runner
+        """
+        runner = self.get_runner(agent, app_name)
+        if (app_name, user_id, session_id) in self._live_sessions:
+            session_id = f"{session_id}-{uuid.uuid4().hex[:8]}"
+        key = (app_name, user_id, session_id)
+        self._live_sessions.add(key)
+        try:
+            session = await self.session_service.create_session(
+                app_name=app_name, user_id=user_id, session_id=session_id
+            )
+        except BaseException:
+            self._live_sessions.discard(key)
+            raise
+        return session, runner
+
+    async def close_session(self, session: Session) -> None:
+        """Delete a session created by :meth:`open_session`."""
+        self._live_sessions.discard((session.app_name, session.user_id, session.id))
+        await self.session_service.delete_session(
+            app_name=session.app_name, user_id=session.user_id, session_id=session.id
+        )
+
+    @asynccontextmanager
+    async def session(
+        self, agent: Agent, app_name: str, user_id: str, session_id: str
+    ) -> AsyncIterator[tuple[Session, Runner]]:
+        """
+        Create a session for one agent call and delete it afterwards.
+
+        Args:
+            agent: The ADK agent to run
+            app_name: The application name used for the runner and session
+            user_id: The user id for the session
+            session_id: The preferred session id, see :meth:`open_session`
+
+        Yields:
+            tuple[Session, Runner]: The new session and the pooled runner
+        """
+        session, runner = await self.open_session(agent, app_name, user_id, session_id)
+        try:
+            yield session, runner
+        finally:
+            await self.close_session(session)
+
+    @property
+    def live_session_count(self) -> int:
+        """Number of sessions currently handed out by the pool."""
+        return len(self._live_sessions)
+
+    @property
+    def runner_count(self) -> int:
+        """Number of cached runners."""
+        return len(self._runners)
+
+    async def close(self) -> None:
+        """Close every pooled runner and forget it."""
+        runners = list(self._runners.values())
+        self._runners.clear()
+        for runner in runners:
+            await runner.close()
+
+
+_default_runner_pool: Optional[RunnerPool] = None
+
+
+def get_default_runner_pool() -> RunnerPool:
+    """Return the process-wide runner pool used by ``call_agent_async``."""
+    global _default_runner_pool
+    if _default_runner_pool is None:
+        _default_runner_pool = RunnerPool()
+    return _default_runner_pool
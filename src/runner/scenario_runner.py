@@ -1,11 +1,32 @@
 """Scenario runner utilities for Google ADK agent interactions."""
 
+import asyncio
+import time
+import uuid
+from contextlib import aclosing
+from contextvars import ContextVar
+from typing import AsyncIterator, Callable, Optional
+
 from google.adk.agents import Agent
+from google.adk.events import Event
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
-from src.creation.scenario_creator import Scenario
+from src.models import Scenario, ScenarioResult, ToolInfo
+from src.fingerprint import agent_fingerprint
+from src.runner.cassette import CassetteMode, active_cassettes, is_recording
+from src.runner.result_cache import ResultCache
+from src.runner.runner_pool import RunnerPool, get_default_runner_pool
+from src.runner.telemetry import (
+    AGENT_RUN_PHASE,
+    SCENARIO_SPAN,
+    SCORING_PHASE,
+    SESSION_SETUP_PHASE,
+    get_telemetry,
+)
+
+DEFAULT_MAX_CONCURRENCY = 8
 
 
 async def setup_session_and_runner(
@@ -20,41 +41,372 @@ async def setup_session_and_runner(
     return session, runner
 
 
+async def stream_agent_events(
+    agent: Agent,
+    query,
+    user_id: str,
+    session_id: str,
+    app_name: str,
+    runner_pool: Optional[RunnerPool] = None,
+) -> AsyncIterator[Event]:
+    """Call agent asynchronously with a query and yield events as they arrive.
+
+    Closing the generator early stops the agent turn, so no further LLM or
+    tool calls are made for it. Inside ``use_cassettes(...)`` the events are
+    recorded to, or replayed from, a cassette.
+    """
+    telemetry = get_telemetry()
+    turn = _active_turn.get()
+    cassettes = active_cassettes()
+    if cassettes is not None and cassettes.mode is CassetteMode.REPLAY:
+        with telemetry.phase(AGENT_RUN_PHASE, **{"magic_eval.replay": True}):
+            for event in cassettes.load(agent, query):
+                if turn is not None:
+                    turn.mark_arrival(event)
+                yield event
+        return
+
+    recorded = [] if cassettes is not None else None
+    content = types.Content(role="user", parts=[types.Part(text=query)])
+    pool = runner_pool or get_default_runner_pool()
+    with telemetry.phase(SESSION_SETUP_PHASE):
+        session, runner = await pool.open_session(
+            agent, app_name, user_id, session_id
+        )
+    try:
+        with telemetry.phase(AGENT_RUN_PHASE):
+            events = runner.run_async(
+                user_id=user_id, session_id=session.id, new_message=content
+            )
+            async with aclosing(events):
+                async for event in events:
+                    if turn is not None:
+                        turn.mark_arrival(event)
+                    if recorded is not None:
+                        recorded.append(event)
+                    yield event
+    finally:
+        await pool.close_session(session)
+
+    # Only complete agent turns are recorded; a stream closed early never
+    # reaches this point.
+    if recorded is not None:
+        cassettes.save(agent, query, recorded)
+
+
 async def call_agent_async(
-    agent: Agent, query, user_id: str, session_id: str, app_name: str
+    agent: Agent,
+    query,
+    user_id: str,
+    session_id: str,
+    app_name: str,
+    runner_pool: Optional[RunnerPool] = None,
 ):
-    """Call agent asynchronously with a query and return all events."""
-    content = types.Content(role="user", parts=[types.Part(text=query)])
-    _, runner = await setup_session_and_runner(agent, app_name, user_id, session_id)
-    events = runner.run_async(
-        user_id=user_id, session_id=session_id, new_message=content
-    )
+    """Call agent asynchronously with a query and return all events.
 
+    The runner comes from ``runner_pool`` (the process-wide pool by default)
+    and the session is deleted once the agent turn is over.
+    """
+    events = stream_agent_events(
+        agent, query, user_id, session_id, app_name, runner_pool
+    )
     all_events = [event async for event in events]
     return all_events
 
 
-async def run_scenario(scenario: Scenario, agent: Agent) -> bool:
-    """Run a scenario and return True if successful, False otherwise."""
-    expected_tool_call = scenario.expected_tool_call
+def _function_call_name(function_call) -> str:
+    """Return the tool name of a function call reported by an event."""
+    return getattr(function_call, "name", function_call)
+
+
+def early_verdict(expected_tool_call: Optional[str], function_calls) -> Optional[bool]:
+    """
+    Return the scenario verdict if it is already certain, otherwise None.
+
+    Any tool call fails a scenario that expects none, and the expected tool
+    call passes a scenario that expects it, no matter what happens next.
+
+    Args:
+        expected_tool_call: The tool the scenario expects, or None
+        function_calls: Function calls seen so far in the agent turn
+
+    Returns:
+        Optional[bool]: The final verdict, or None if more events could change it
+    """
+    if expected_tool_call is None:
+        return False if function_calls else None
+
+    for function_call in function_calls:
+        if _function_call_name(function_call) == expected_tool_call:
+            return True
+    return None
+
+
+def final_verdict(expected_tool_call: Optional[str], function_calls) -> bool:
+    """Return the scenario verdict once the agent turn is complete."""
+    verdict = early_verdict(expected_tool_call, function_calls)
+    if verdict is None:
+        # Nothing decisive happened: a None expectation passes, a tool
+        # expectation fails.
+        return expected_tool_call is None
+    return verdict
+
+
+def _token_count(usage, field: str) -> int:
+    count = getattr(usage, field, None)
+    return count if isinstance(count, int) else 0
+
+
+class _TurnObserver:
+    """Collects the measurements of one agent turn as its events are consumed."""
 
-    # Filler names
-    user_id = "123"
-    session_id = "456"
-    app_name = "789"
+    def __init__(self, scenario: Scenario):
+        self.scenario = scenario
+        self.started = time.perf_counter()
+        self.first_event_at: Optional[float] = None
+        self.first_function_call_at: Optional[float] = None
+        self.event_count = 0
+        self.tool_calls: list[str] = []
+        self.input_tokens = 0
+        self.output_tokens = 0
 
-    events = await call_agent_async(
+    def mark_arrival(self, event: Event) -> None:
+        """Note when the first event and first function call arrived.
+
+        ``stream_agent_events`` calls this as events come off the runner, so
+        the timings are right even when the events are scored only after the
+        whole turn was collected.
+        """
+        now = time.perf_counter()
+        if self.first_event_at is None:
+            self.first_event_at = now
+        if self.first_function_call_at is None and event.get_function_calls():
+            self.first_function_call_at = now
+
+    def observe(self, event: Event) -> list:
+        """Record an event and return its function calls."""
+        self.mark_arrival(event)
+        self.event_count += 1
+        function_calls = event.get_function_calls()
+        self.tool_calls.extend(str(_function_call_name(call)) for call in function_calls)
+        usage = getattr(event, "usage_metadata", None)
+        if usage is not None:
+            self.input_tokens += _token_count(usage, "prompt_token_count")
+            self.output_tokens += _token_count(usage, "candidates_token_count")
+        return function_calls
+
+    def _since_start(self, timestamp: Optional[float]) -> Optional[float]:
+        return None if timestamp is None else timestamp - self.started
+
+    def result(self, passed: bool) -> ScenarioResult:
+        return ScenarioResult(
+            scenario_name=self.scenario.name,
+            expected_tool_call=self.scenario.expected_tool_call,
+            passed=passed,
+            latency_seconds=time.perf_counter() - self.started,
+            event_count=self.event_count,
+            time_to_first_event_seconds=self._since_start(self.first_event_at),
+            time_to_first_function_call_seconds=self._since_start(
+                self.first_function_call_at
+            ),
+            tool_calls=self.tool_calls,
+            input_tokens=self.input_tokens,
+            output_tokens=self.output_tokens,
+        )
+
+
+# The turn being scored in the current task, so stream_agent_events can time
+# event arrivals without changing the call_agent_async signature.
+_active_turn: ContextVar[Optional[_TurnObserver]] = ContextVar(
+    "magic_eval_active_turn", default=None
+)
+
+
+async def run_scenario(
+    scenario: Scenario,
+    agent: Agent,
+    user_id: str = "123",
+    session_id: str = "456",
+    app_name: str = "789",
+    streaming: bool = False,
+) -> ScenarioResult:
+    """Run a scenario and return its verdict along with latency, events and tokens.
+
+    With ``streaming=True`` events are scored as they arrive and the agent
+    turn is cut short as soon as the verdict is certain; the measurements then
+    only cover the events consumed before the cut.
+
+    The run is traced as a span with session setup, agent run and scoring
+    child spans, and its measurements are recorded as OpenTelemetry metrics.
+    """
+    telemetry = get_telemetry()
+    observer = _TurnObserver(scenario)
+    token = _active_turn.set(observer)
+    try:
+        with telemetry.span(
+            SCENARIO_SPAN,
+            **{
+                "magic_eval.scenario.name": scenario.name,
+                "magic_eval.scenario.streaming": streaming,
+            },
+        ) as span:
+            if streaming:
+                result = await _run_scenario_streaming(
+                    scenario, agent, user_id, session_id, app_name, observer
+                )
+            else:
+                events = await call_agent_async(
+                    agent, scenario.query, user_id, session_id, app_name
+                )
+                with telemetry.phase(SCORING_PHASE):
+                    all_function_calls = []
+                    for event in events:
+                        all_function_calls.extend(observer.observe(event))
+                    result = observer.result(
+                        final_verdict(scenario.expected_tool_call, all_function_calls)
+                    )
+            telemetry.record_scenario(span, result)
+    finally:
+        _active_turn.reset(token)
+    return result
+
+
+async def _run_scenario_streaming(
+    scenario: Scenario,
+    agent: Agent,
+    user_id: str,
+    session_id: str,
+    app_name: str,
+    observer: _TurnObserver,
+) -> ScenarioResult:
+    """Score a scenario event by event, stopping the agent once it is decided.
+
+    While recording cassettes the turn always runs to completion, so the
+    cassette can be re-scored later under different pass criteria.
+    """
+    expected_tool_call = scenario.expected_tool_call
+    stop_early = not is_recording()
+    verdict = None
+    events = stream_agent_events(
         agent, scenario.query, user_id, session_id, app_name
     )
+    async with aclosing(events):
+        async for event in events:
+            function_calls = observer.observe(event)
+            if verdict is None:
+                verdict = early_verdict(expected_tool_call, function_calls)
+            if verdict is not None and stop_early:
+                break
+
+    with get_telemetry().phase(SCORING_PHASE):
+        if verdict is None:
+            verdict = final_verdict(expected_tool_call, [])
+        return observer.result(verdict)
+
+
+async def run_scenarios_concurrently(
+    scenarios: list[Scenario],
+    agent: Agent,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    streaming: bool = False,
+    result_cache: Optional[ResultCache] = None,
+    refresh: bool = False,
+    fail_fast: bool = False,
+    time_budget_seconds: Optional[float] = None,
+    on_result: Optional[Callable[[int, ScenarioResult], None]] = None,
+    tools: Optional[list[ToolInfo]] = None,
+) -> list[Optional[ScenarioResult]]:
+    """
+    Run scenarios on a bounded pool of asyncio workers.
+
+    Every scenario gets its own session identity so runs can overlap safely.
+    Scenarios are started in list order, so put the most informative ones
+    first (see ``src.runner.prioritization``).
+
+    Args:
+        scenarios: The scenarios to run
+        agent: The ADK agent under test
+        max_concurrency: Maximum number of scenarios in flight at once
+        streaming: Stop each agent turn as soon as its verdict is certain
+        result_cache: Reuse cached results of unchanged scenarios and cache
+            the new ones. Reused results have ``provenance`` set.
+        refresh: Run every scenario even on a cache hit, overwriting entries
+        fail_fast: Start no new scenario once one has failed; scenarios
+            already in flight still finish
+        time_budget_seconds: Start no new scenario after this many seconds
+            and cancel the ones still running when it is up
+        on_result: Called with (index, result) as soon as each result is
+            known, including cached ones
+        tools: The agent's discovered tools; they are part of the result
+            cache key, so cached results are not reused once a toolset's
+            tools change
+
+    Returns:
+        list[Optional[ScenarioResult]]: One entry per scenario, in the same
+            order as ``scenarios``; None for scenarios skipped by
+            ``fail_fast`` or ``time_budget_seconds``
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    run_id = uuid.uuid4().hex[:12]
+    user_id = f"user-{run_id}"
+    app_name = getattr(agent, "name", None) or "magic_eval"
+    deadline = None
+    if time_budget_seconds is not None:
+        deadline = asyncio.get_running_loop().time() + time_budget_seconds
+    stop = asyncio.Event()
+
+    results: list[ScenarioResult | None] = [None] * len(scenarios)
+    pending = iter(enumerate(scenarios))
+    fingerprint = agent_fingerprint(agent, tools) if result_cache is not None else None
+
+    def finish(index: int, result: ScenarioResult) -> None:
+        results[index] = result
+        if on_result is not None:
+            on_result(index, result)
+        if fail_fast and not result.passed:
+            stop.set()
 
-    all_function_calls = []
-    for event in events:
-        all_function_calls.extend(event.get_function_calls())
+    if result_cache is not None and not refresh:
+        uncached = []
+        for index, scenario in pending:
+            cached = result_cache.get_by_fingerprint(fingerprint, scenario)
+            if cached is None:
+                uncached.append((index, scenario))
+            else:
+                finish(index, cached)
+        pending = iter(uncached)
 
-    if expected_tool_call is None and len(all_function_calls) == 0:
-        return True
+    async def worker():
+        # Workers share one iterator, so at most max_concurrency scenarios are
+        # ever in flight and no task is created per scenario up front.
+        for index, scenario in pending:
+            if stop.is_set():
+                return
+            try:
+                async with asyncio.timeout_at(deadline) as budget:
+                    result = await run_scenario(
+                        scenario,
+                        agent,
+                        user_id=user_id,
+                        session_id=f"session-{run_id}-{index}",
+                        app_name=app_name,
+                        streaming=streaming,
+                    )
+            except TimeoutError:
+                if not budget.expired():
+                    raise
+                stop.set()
+                return
+            if result_cache is not None:
+                result_cache.put_by_fingerprint(fingerprint, scenario, result)
+            finish(index, result)
 
-    if expected_tool_call is not None and expected_tool_call in all_function_calls:
-        return True
+    async with asyncio.TaskGroup() as group:
+        for _ in range(min(max_concurrency, len(scenarios))):
+            group.create_task(worker())
 
-    return False
+    if result_cache is not None:
+        result_cache.evict()
+    return results
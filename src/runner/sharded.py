@@ -0,0 +1,543 @@
+"""Run scenarios across worker processes through a file-based work queue.
+
+One event loop in one process is limited by the GIL: event parsing, pydantic
+validation and scoring all compete for it. In sharded mode a coordinator
+splits the scenarios into work items in a queue directory, and worker
+processes, each with its own agent and its own pool of asyncio workers
+(``run_scenarios_concurrently``), pull items until the queue is empty. The
+coordinator then merges the results back into scenario order.
+
+The queue is a directory with ``pending/``, ``claimed/`` and ``done/``
+subdirectories. A worker claims an item by renaming it from ``pending/`` to
+``claimed/``; the rename is atomic, so exactly one worker gets each item,
+also when several machines share the directory. Workers refresh the mtime
+of their claims while they work on them, and claims not refreshed within
+the lease are put back, so items of crashed workers are rerun.
+
+Item ids start with the id of the run that enqueued them, so a directory can
+be reused (or shared by several coordinators) and each coordinator only
+waits for and merges its own items.
+
+Local workers are started by :func:`run_sharded`. Workers on other machines
+pointed at a shared directory are started with::
+
+    python -m src.runner.sharded worker --queue /shared/queue \\
+        --agent example_agent.agent:create_root_agent
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from pydantic import BaseModel, Field
+
+from src.models import Scenario, ScenarioResult
+
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_LEASE_SECONDS = 120.0
+DEFAULT_POLL_SECONDS = 0.2
+
+
+class WorkItem(BaseModel):
+    """A batch of scenarios, with their positions in the whole run."""
+
+    id: str = Field(..., description="Unique id of the item in its queue")
+    indices: list[int] = Field(..., description="Positions of the scenarios")
+    scenarios: list[Scenario] = Field(..., description="Scenarios to run")
+
+
+class WorkResult(BaseModel):
+    """The results of one work item."""
+
+    id: str = Field(..., description="Id of the work item")
+    worker_id: str = Field(..., description="Worker that ran the item")
+    indices: list[int] = Field(..., description="Positions of the scenarios")
+    results: list[ScenarioResult] = Field(..., description="Results, in item order")
+    started_at: float = Field(..., description="Unix time the worker started the item")
+    finished_at: float = Field(..., description="Unix time the item finished")
+
+
+def _write_atomic(path: Path, data: str) -> None:
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(data)
+    os.replace(tmp_path, path)
+
+
+class WorkQueue:
+    """A durable work queue in a (possibly shared) directory."""
+
+    def __init__(self, directory: Path | str):
+        self.directory = Path(directory)
+        self.pending_dir = self.directory / "pending"
+        self.claimed_dir = self.directory / "claimed"
+        self.done_dir = self.directory / "done"
+        for path in (self.pending_dir, self.claimed_dir, self.done_dir):
+            path.mkdir(parents=True, exist_ok=True)
+
+    def enqueue(
+        self,
+        scenarios: Iterable[Scenario],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        run_id: Optional[str] = None,
+    ) -> list[str]:
+        """
+        Split scenarios into work items and add them to the queue.
+
+        Args:
+            scenarios: The scenarios, in the order results are reported
+            batch_size: Scenarios per work item
+            run_id: Prefix of the new item ids; a fresh random one by default
+
+        Returns:
+            list[str]: Ids of the new items
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        run_id = run_id or uuid.uuid4().hex[:12]
+        if not run_id.replace("-", "").isalnum():
+            raise ValueError(f"run_id must be alphanumeric, got {run_id!r}")
+        ids = []
+        batch: list[Scenario] = []
+        start = 0
+        for index, scenario in enumerate(scenarios):
+            batch.append(scenario)
+            if len(batch) == batch_size:
+                ids.append(self._put(run_id, start, batch))
+                start, batch = index + 1, []
+        if batch:
+            ids.append(self._put(run_id, start, batch))
+        return ids
+
+    def _put(self, run_id: str, start: int, batch: list[Scenario]) -> str:
+        item = WorkItem(
+            id=f"{run_id}-{start:010d}",
+            indices=list(range(start, start + len(batch))),
+            scenarios=batch,
+        )
+        _write_atomic(self.pending_dir / f"{item.id}.json", item.model_dump_json())
+        return item.id
+
+    def _claim_path(self, item_id: str, worker_id: str) -> Path:
+        return self.claimed_dir / f"{item_id}.{worker_id}.json"
+
+    def claim(self, worker_id: str) -> Optional[WorkItem]:
+        """Take the next pending item, or return None if there is none."""
+        for path in sorted(self.pending_dir.glob("*.json")):
+            item_id = path.stem
+            claim_path = self._claim_path(item_id, worker_id)
+            try:
+                os.rename(path, claim_path)
+            except FileNotFoundError:
+                continue  # Another worker got it first.
+            if (self.done_dir / f"{item_id}.json").exists():
+                # Requeued after its first worker finished after all.
+                claim_path.unlink(missing_ok=True)
+                continue
+            os.utime(claim_path)
+            return WorkItem.model_validate_json(claim_path.read_bytes())
+        return None
+
+    def renew(self, item_id: str, worker_id: str) -> None:
+        """Extend the lease on a claimed item."""
+        try:
+            os.utime(self._claim_path(item_id, worker_id))
+        except FileNotFoundError:
+            pass
+
+    def complete(self, result: WorkResult) -> None:
+        """Store the results of a claimed item and release the claim."""
+        _write_atomic(self.done_dir / f"{result.id}.json", result.model_dump_json())
+        self._claim_path(result.id, result.worker_id).unlink(missing_ok=True)
+
+    def requeue(
+        self,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        dead_workers: Iterable[str] = (),
+    ) -> int:
+        """
+        Put claims back in the queue when their lease ran out or their worker died.
+
+        Args:
+            lease_seconds: Age after which an unrenewed claim is abandoned
+            dead_workers: Ids of workers known to have exited
+
+        Returns:
+            int: Number of items put back
+        """
+        dead_workers = set(dead_workers)
+        now = time.time()
+        requeued = 0
+        for path in self.claimed_dir.glob("*.json"):
+            item_id, worker_id = path.stem.split(".", 1)
+            try:
+                expired = now - path.stat().st_mtime > lease_seconds
+                if expired or worker_id in dead_workers:
+                    os.rename(path, self.pending_dir / f"{item_id}.json")
+                    requeued += 1
+            except FileNotFoundError:
+                continue
+        return requeued
+
+    def counts(self) -> dict[str, int]:
+        """Number of pending, claimed and done items."""
+        return {
+            "pending": sum(1 for _ in self.pending_dir.glob("*.json")),
+            "claimed": sum(1 for _ in self.claimed_dir.glob("*.json")),
+            "done": sum(1 for _ in self.done_dir.glob("*.json")),
+        }
+
+    def is_done(self, item_ids: Iterable[str]) -> bool:
+        """Whether every one of the given items has finished."""
+        return all((self.done_dir / f"{item_id}.json").exists() for item_id in item_ids)
+
+    def is_drained(self) -> bool:
+        """Whether no item is pending or being worked on."""
+        # Claims are checked first: a claim requeued in between is then seen
+        # in pending/ instead of slipping past both checks.
+        return not any(self.claimed_dir.glob("*.json")) and not any(
+            self.pending_dir.glob("*.json")
+        )
+
+    def work_results(
+        self, item_ids: Optional[Iterable[str]] = None
+    ) -> list[WorkResult]:
+        """Return the results of the given finished items; all of them by default."""
+        if item_ids is None:
+            paths = sorted(self.done_dir.glob("*.json"))
+        else:
+            paths = [self.done_dir / f"{item_id}.json" for item_id in item_ids]
+        return [
+            WorkResult.model_validate_json(path.read_bytes())
+            for path in paths
+            if path.exists()
+        ]
+
+    def results(
+        self, item_ids: Optional[Iterable[str]] = None
+    ) -> list[Optional[ScenarioResult]]:
+        """
+        Merge the results of finished items into scenario order.
+
+        Args:
+            item_ids: Items of one run, as returned by :meth:`enqueue`. Defaults
+                to every finished item, which only makes sense for a queue
+                holding a single run.
+
+        Returns:
+            list[Optional[ScenarioResult]]: Results by scenario position
+        """
+        merged: dict[int, ScenarioResult] = {}
+        for work_result in self.work_results(item_ids):
+            merged.update(zip(work_result.indices, work_result.results))
+        size = max(merged) + 1 if merged else 0
+        return [merged.get(index) for index in range(size)]
+
+
+def load_agent(spec: str) -> Any:
+    """
+    Import an agent from a ``module:attribute`` spec.
+
+    The attribute may be the agent itself or a function returning one, such
+    as ``example_agent.agent:create_root_agent``.
+    """
+    module_name, _, attribute = spec.partition(":")
+    if not attribute:
+        raise ValueError(f"Agent spec must look like module:attribute, got {spec!r}")
+    target = getattr(importlib.import_module(module_name), attribute)
+    from google.adk.agents import BaseAgent
+
+    return target if isinstance(target, BaseAgent) else target()
+
+
+def scenario_from_eval_case(eval_case: Any) -> Scenario:
+    """Turn the first invocation of an ADK EvalCase into a Scenario."""
+    invocation = eval_case.conversation[0]
+    query = " ".join(part.text for part in invocation.user_content.parts if part.text)
+    tool_uses = (
+        invocation.intermediate_data.tool_uses if invocation.intermediate_data else []
+    )
+    return Scenario(
+        name=eval_case.eval_id,
+        query=query,
+        why_its_suitable=f"Eval case {eval_case.eval_id}",
+        expected_tool_call=tool_uses[0].name if tool_uses else None,
+    )
+
+
+def load_eval_set_scenarios(path: Path | str) -> list[Scenario]:
+    """
+    Load an ADK eval set and turn each of its eval cases into a Scenario.
+
+    Args:
+        path: A ``.json`` eval set, or a ``.jsonl`` one as written by
+            ``evaluation.eval_set_stream.write_eval_set_jsonl``
+
+    Returns:
+        list[Scenario]: One scenario per eval case, in file order
+    """
+    path = Path(path)
+    if path.suffix == ".jsonl":
+        from evaluation.eval_set_stream import iter_eval_cases
+
+        eval_cases = iter_eval_cases(path)
+    else:
+        from evaluation.eval_set import EvalSet
+
+        eval_cases = EvalSet.model_validate_json(path.read_bytes()).eval_cases
+    return [scenario_from_eval_case(case) for case in eval_cases]
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname().replace('.', '-')}-{os.getpid()}"
+
+
+async def run_worker(
+    queue: WorkQueue,
+    agent: Any,
+    worker_id: Optional[str] = None,
+    max_concurrency: int = 8,
+    streaming: bool = False,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    poll_seconds: float = DEFAULT_POLL_SECONDS,
+) -> int:
+    """
+    Run work items from the queue until none is pending or claimed.
+
+    While other workers still hold claims the worker keeps polling, so an
+    item put back after its worker crashed is picked up again. Claims whose
+    lease ran out are put back by the polling workers themselves.
+
+    Args:
+        queue: The work queue
+        agent: The agent this worker runs scenarios against
+        worker_id: Unique id of this worker; defaults to host and pid
+        max_concurrency: Scenarios in flight at once within this worker
+        streaming: Stop each agent turn as soon as its verdict is certain
+        lease_seconds: Lease of a claim; it is renewed at a third of that
+        poll_seconds: Wait between polls while only other workers' claims
+            are left
+
+    Returns:
+        int: Number of scenarios this worker ran
+    """
+    from src.runner.scenario_runner import run_scenarios_concurrently
+
+    worker_id = worker_id or default_worker_id()
+    ran = 0
+    while True:
+        item = queue.claim(worker_id)
+        if item is None:
+            if queue.is_drained():
+                return ran
+            await asyncio.sleep(poll_seconds)
+            queue.requeue(lease_seconds)
+            continue
+
+        async def keep_lease(item_id=item.id):
+            while True:
+                await asyncio.sleep(lease_seconds / 3)
+                queue.renew(item_id, worker_id)
+
+        lease = asyncio.create_task(keep_lease())
+        started_at = time.time()
+        try:
+            results = await run_scenarios_concurrently(
+                item.scenarios,
+                agent,
+                max_concurrency=max_concurrency,
+                streaming=streaming,
+            )
+        finally:
+            lease.cancel()
+        queue.complete(
+            WorkResult(
+                id=item.id,
+                worker_id=worker_id,
+                indices=item.indices,
+                results=results,
+                started_at=started_at,
+                finished_at=time.time(),
+            )
+        )
+        ran += len(results)
+
+
+def _worker_command(
+    queue_dir: Path,
+    agent_spec: str,
+    worker_id: str,
+    max_concurrency: int,
+    streaming: bool,
+    lease_seconds: float,
+) -> list[str]:
+    command = [
+        sys.executable,
+        "-m",
+        "src.runner.sharded",
+        "worker",
+        "--queue",
+        str(queue_dir),
+        "--agent",
+        agent_spec,
+        "--worker-id",
+        worker_id,
+        "--max-concurrency",
+        str(max_concurrency),
+        "--lease-seconds",
+        str(lease_seconds),
+    ]
+    if streaming:
+        command.append("--streaming")
+    return command
+
+
+def run_sharded(
+    scenarios: list[Scenario],
+    agent_spec: str,
+    workers: int = os.cpu_count() or 1,
+    queue_dir: Optional[Path | str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_concurrency: int = 8,
+    streaming: bool = False,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+) -> list[Optional[ScenarioResult]]:
+    """
+    Run scenarios on worker processes and merge their results.
+
+    Args:
+        scenarios: The scenarios to run
+        agent_spec: ``module:attribute`` of the agent or agent factory each
+            worker loads (see :func:`load_agent`)
+        workers: Local worker processes to start. With 0 the coordinator
+            only waits for workers started elsewhere on a shared ``queue_dir``.
+        queue_dir: Queue directory; a temporary one by default
+        batch_size: Scenarios per work item
+        max_concurrency: Scenarios in flight at once within each worker
+        streaming: Stop each agent turn as soon as its verdict is certain
+        lease_seconds: Time after which a silent worker's items are rerun
+
+    Returns:
+        list[Optional[ScenarioResult]]: One result per scenario, in order
+    """
+    with tempfile.TemporaryDirectory(prefix="magic_eval_queue_") as tmp:
+        queue = WorkQueue(queue_dir or tmp)
+        item_ids = queue.enqueue(scenarios, batch_size)
+
+        processes = {}
+        for i in range(workers):
+            worker_id = f"{default_worker_id()}-w{i}"
+            processes[worker_id] = subprocess.Popen(
+                _worker_command(
+                    queue.directory,
+                    agent_spec,
+                    worker_id,
+                    max_concurrency,
+                    streaming,
+                    lease_seconds,
+                )
+            )
+
+        try:
+            while not queue.is_done(item_ids):
+                time.sleep(DEFAULT_POLL_SECONDS)
+                dead = [wid for wid, p in processes.items() if p.poll() is not None]
+                queue.requeue(lease_seconds, dead_workers=dead)
+                if (
+                    workers
+                    and len(dead) == len(processes)
+                    and not queue.is_done(item_ids)
+                ):
+                    raise RuntimeError(
+                        f"All workers exited with work left: {queue.counts()}"
+                    )
+        finally:
+            for process in processes.values():
+                if process.poll() is None:
+                    process.terminate()
+                process.wait()
+
+        results = queue.results(item_ids)
+    return results + [None] * (len(scenarios) - len(results))
+
+
+def _load_scenarios(args: argparse.Namespace) -> list[Scenario]:
+    if args.scenarios:
+        from src.models import ScenarioList
+
+        return ScenarioList.model_validate_json(
+            Path(args.scenarios).read_bytes()
+        ).scenarios
+    return load_eval_set_scenarios(args.eval_set)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Coordinate a sharded run")
+    source = run.add_mutually_exclusive_group(required=True)
+    source.add_argument("--scenarios", help="JSON file holding a ScenarioList")
+    source.add_argument("--eval-set", help="ADK eval set (.json or .jsonl)")
+    run.add_argument("--output", required=True, help="Where to save the results (.npz)")
+    run.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    run.add_argument("--queue", help="Queue directory, e.g. one shared with other hosts")
+    run.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    worker = commands.add_parser("worker", help="Run items from a queue")
+    worker.add_argument("--queue", required=True)
+    worker.add_argument("--worker-id")
+
+    for command in (run, worker):
+        command.add_argument("--agent", required=True, help="module:attribute")
+        command.add_argument("--max-concurrency", type=int, default=8)
+        command.add_argument("--streaming", action="store_true")
+        command.add_argument(
+            "--lease-seconds", type=float, default=DEFAULT_LEASE_SECONDS
+        )
+    args = parser.parse_args(argv)
+
+    if args.command == "worker":
+        ran = asyncio.run(
+            run_worker(
+                WorkQueue(args.queue),
+                load_agent(args.agent),
+                worker_id=args.worker_id,
+                max_concurrency=args.max_concurrency,
+                streaming=args.streaming,
+                lease_seconds=args.lease_seconds,
+            )
+        )
+        print(json.dumps({"worker_id": args.worker_id, "scenarios": ran}))
+        return
+
+    from src.runner.results_table import ResultsTable
+
+    scenarios = _load_scenarios(args)
+    results = run_sharded(
+        scenarios,
+        args.agent,
+        workers=args.workers,
+        queue_dir=args.queue,
+        batch_size=args.batch_size,
+        max_concurrency=args.max_concurrency,
+        streaming=args.streaming,
+        lease_seconds=args.lease_seconds,
+    )
+    ran = [result for result in results if result is not None]
+    table = ResultsTable.from_results(ran)
+    table.save(args.output)
+    print(f"{len(ran)}/{len(scenarios)} scenarios, pass rate {table.pass_rate():.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""OpenTelemetry spans and metrics for scenario runs.
+
+Only the OpenTelemetry API is used here, so everything is a no-op until a
+tracer or meter provider is configured (see ``src.weave_config``).
+"""
+
+import time
+from typing import Optional
+
+from opentelemetry import metrics, trace
+from opentelemetry.metrics import Histogram, MeterProvider
+from opentelemetry.trace import Span, TracerProvider
+
+from src.models import ScenarioResult
+
+INSTRUMENTATION_NAME = "magic_eval.runner"
+
+SCENARIO_SPAN = "magic_eval.run_scenario"
+SESSION_SETUP_PHASE = "session_setup"
+AGENT_RUN_PHASE = "agent_run"
+SCORING_PHASE = "scoring"
+
+
+class ScenarioTelemetry:
+    """The tracer and histograms used to instrument scenario runs."""
+
+    def __init__(
+        self,
+        tracer_provider: Optional[TracerProvider] = None,
+        meter_provider: Optional[MeterProvider] = None,
+    ):
+        self.tracer = trace.get_tracer(
+            INSTRUMENTATION_NAME, tracer_provider=tracer_provider
+        )
+        meter = metrics.get_meter(INSTRUMENTATION_NAME, meter_provider=meter_provider)
+        self.duration = meter.create_histogram(
+            "magic_eval.scenario.duration",
+            unit="s",
+            description="Wall-clock time of a scenario run",
+        )
+        self.phase_duration = meter.create_histogram(
+            "magic_eval.scenario.phase.duration",
+            unit="s",
+            description="Time spent in each phase of a scenario run",
+        )
+        self.time_to_first_event = meter.create_histogram(
+            "magic_eval.scenario.time_to_first_event",
+            unit="s",
+            description="Time from sending the query to the first agent event",
+        )
+        self.time_to_first_function_call = meter.create_histogram(
+            "magic_eval.scenario.time_to_first_function_call",
+            unit="s",
+            description="Time from sending the query to the first tool call",
+        )
+        self.events = meter.create_histogram(
+            "magic_eval.scenario.events",
+            unit="{event}",
+            description="Agent events consumed per scenario",
+        )
+        self.tokens = meter.create_histogram(
+            "magic_eval.scenario.tokens",
+            unit="{token}",
+            description="Model tokens used per scenario",
+        )
+
+    def span(self, name: str, **attributes) -> "_SpanScope":
+        """Run a block in a span, made current only when it belongs to a trace.
+
+        Without a configured provider the span is invalid and is never attached
+        to the context: attaching costs more than the rest of a phase on the
+        runner's hot path, and there is no trace for nested spans to join.
+        Sampled-out spans are still attached so their children stay unsampled.
+        """
+        return _SpanScope(self.tracer, name, attributes)
+
+    def phase(self, name: str, **attributes) -> "_SpanScope":
+        """Run a block in a child span and record its duration by phase."""
+        return _SpanScope(
+            self.tracer,
+            f"magic_eval.{name}",
+            attributes,
+            self.phase_duration,
+            {"magic_eval.phase": name},
+        )
+
+    def record_scenario(self, span: Span, result: ScenarioResult) -> None:
+        """Attach a scenario's measurements to its span and histograms."""
+        attributes = {
+            "magic_eval.scenario.expected_tool_call": result.expected_tool_call or "",
+            "magic_eval.scenario.passed": result.passed,
+        }
+        span.set_attributes(
+            {
+                "magic_eval.scenario.events": result.event_count,
+                "magic_eval.scenario.tokens.input": result.input_tokens,
+                "magic_eval.scenario.tokens.output": result.output_tokens,
+                "magic_eval.scenario.tool_calls": result.tool_calls,
+                **attributes,
+            }
+        )
+        if result.time_to_first_event_seconds is not None:
+            span.set_attribute(
+                "magic_eval.scenario.time_to_first_event_ms",
+                result.time_to_first_event_seconds * 1000,
+            )
+            self.time_to_first_event.record(
+                result.time_to_first_event_seconds, attributes
+            )
+        if result.time_to_first_function_call_seconds is not None:
+            span.set_attribute(
+                "magic_eval.scenario.time_to_first_function_call_ms",
+                result.time_to_first_function_call_seconds * 1000,
+            )
+            self.time_to_first_function_call.record(
+                result.time_to_first_function_call_seconds, attributes
+            )
+
+        self.duration.record(result.latency_seconds, attributes)
+        self.events.record(result.event_count, attributes)
+        self.tokens.record(
+            result.input_tokens, {**attributes, "magic_eval.token.type": "input"}
+        )
+        self.tokens.record(
+            result.output_tokens, {**attributes, "magic_eval.token.type": "output"}
+        )
+
+
+class _SpanScope:
+    """Context manager behind :meth:`ScenarioTelemetry.span` and ``phase``.
+
+    A plain class rather than ``@contextmanager``: entering and leaving a
+    generator-based context manager costs more than a no-op span, and these
+    wrap every agent call.
+    """
+
+    __slots__ = (
+        "_tracer",
+        "_name",
+        "_attributes",
+        "_histogram",
+        "_labels",
+        "_start",
+        "_span",
+        "_scope",
+    )
+
+    def __init__(
+        self,
+        tracer: trace.Tracer,
+        name: str,
+        attributes: dict,
+        histogram: Optional[Histogram] = None,
+        labels: Optional[dict] = None,
+    ):
+        self._tracer = tracer
+        self._name = name
+        self._attributes = attributes
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self) -> Span:
+        self._start = time.perf_counter()
+        span = self._tracer.start_span(self._name, attributes=self._attributes)
+        self._span = span
+        self._scope = None
+        if span.get_span_context().is_valid:
+            self._scope = trace.use_span(span, end_on_exit=True)
+            self._scope.__enter__()
+        return span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._scope is not None:
+            self._scope.__exit__(exc_type, exc, tb)
+        else:
+            self._span.end()
+        if self._histogram is not None:
+            self._histogram.record(time.perf_counter() - self._start, self._labels)
+
+
+_telemetry = ScenarioTelemetry()
+
+
+def get_telemetry() -> ScenarioTelemetry:
+    """Return the telemetry used by the scenario runner.
+
+    By default it follows the global OpenTelemetry providers.
+    """
+    return _telemetry
+
+
+def configure_telemetry(
+    tracer_provider: Optional[TracerProvider] = None,
+    meter_provider: Optional[MeterProvider] = None,
+) -> ScenarioTelemetry:
+    """Point the scenario runner at explicit providers instead of the global ones.
+
+    Args:
+        tracer_provider: Provider of the runner's spans; None for the global one
+        meter_provider: Provider of the runner's histograms; None for the
+            global one
+
+    Returns:
+        ScenarioTelemetry: The telemetry now used by the runner
+    """
+    global _telemetry
+    _telemetry = ScenarioTelemetry(tracer_provider, meter_provider)
+    return _telemetry
@@ -0,0 +1,308 @@
+"""In-process stand-ins for an agent's tools.
+
+Scenarios only check which tool the agent chose, so evaluations don't need
+the real tools behind it. ``stub_tools`` builds one ``StubTool`` per
+``ToolInfo`` (as returned by ``get_tools_from_agent``): the model sees the
+same name, description and parameters, but calling the tool returns a canned
+or schema-shaped result without spawning a process or doing any I/O.
+``stub_agent`` swaps the tools of an agent and each of its sub-agents for
+stubs, each agent keeping its own, so the agents' reasoning and delegation
+still run while tool selection becomes deterministic and cheap.
+"""
+
+import os
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.tools import BaseTool, FunctionTool
+from google.adk.tools.base_toolset import BaseToolset
+from google.genai import types
+
+from src.creation.get_tools import declared_tool_info
+from src.models import AgentTools, ToolInfo
+
+STUB_TOOLS_ENV = "MAGIC_EVAL_STUB_TOOLS"
+
+# A canned response, or a function building one from the call arguments.
+StubResponse = Union[Any, Callable[[dict[str, Any]], Any]]
+
+_JSON_TYPES = {
+    "string": types.Type.STRING,
+    "str": types.Type.STRING,
+    "integer": types.Type.INTEGER,
+    "int": types.Type.INTEGER,
+    "number": types.Type.NUMBER,
+    "float": types.Type.NUMBER,
+    "boolean": types.Type.BOOLEAN,
+    "bool": types.Type.BOOLEAN,
+    "array": types.Type.ARRAY,
+    "list": types.Type.ARRAY,
+    "object": types.Type.OBJECT,
+    "dict": types.Type.OBJECT,
+}
+
+_PLACEHOLDERS = {
+    types.Type.STRING: "stub",
+    types.Type.INTEGER: 0,
+    types.Type.NUMBER: 0.0,
+    types.Type.BOOLEAN: False,
+    types.Type.ARRAY: [],
+    types.Type.OBJECT: {},
+}
+
+
+def stub_tools_enabled() -> bool:
+    """Return whether ``MAGIC_EVAL_STUB_TOOLS`` asks for stubbed tools."""
+    return os.getenv(STUB_TOOLS_ENV, "").strip().lower() in ("1", "true", "yes")
+
+
+def _schema(spec: Any) -> types.Schema:
+    """Convert a JSON schema, or just a type name, into a genai Schema."""
+    if not isinstance(spec, dict):
+        return types.Schema(type=_JSON_TYPES.get(str(spec).lower(), types.Type.STRING))
+
+    json_type = spec.get("type", "object" if "properties" in spec else "string")
+    if isinstance(json_type, list):
+        # ["string", "null"] and the like: take the first non-null type.
+        json_type = next((t for t in json_type if t != "null"), "string")
+    schema = types.Schema(
+        type=_JSON_TYPES.get(json_type, types.Type.STRING),
+        description=spec.get("description"),
+        enum=[str(value) for value in spec["enum"]] if "enum" in spec else None,
+    )
+    if "items" in spec:
+        schema.items = _schema(spec["items"])
+    if "properties" in spec:
+        schema.properties = {
+            name: _schema(prop) for name, prop in spec["properties"].items()
+        }
+        schema.required = spec.get("required")
+    return schema
+
+
+def parameters_schema(parameters: Optional[dict]) -> Optional[types.Schema]:
+    """
+    Build the parameter schema of a stub from ``ToolInfo.parameters``.
+
+    Args:
+        parameters: Either a JSON schema object, or a flat mapping of
+            parameter names to type names such as ``{"timezone": "string"}``
+
+    Returns:
+        Optional[types.Schema]: The object schema, or None without parameters
+    """
+    if not parameters:
+        return None
+    if "properties" in parameters:
+        return _schema(parameters)
+    return types.Schema(
+        type=types.Type.OBJECT,
+        properties={name: _schema(spec) for name, spec in parameters.items()},
+    )
+
+
+def _placeholder(schema: types.Schema) -> Any:
+    if schema.enum:
+        return schema.enum[0]
+    if schema.type == types.Type.OBJECT and schema.properties:
+        return {name: _placeholder(prop) for name, prop in schema.properties.items()}
+    return _PLACEHOLDERS.get(schema.type, "stub")
+
+
+class StubTool(BaseTool):
+    """A tool with a real tool's declaration that answers in-process."""
+
+    def __init__(self, tool_info: ToolInfo, response: StubResponse = None):
+        """
+        Args:
+            tool_info: Name, description and parameters of the real tool
+            response: What calls return: a value, or a function of the call
+                arguments. Defaults to a result shaped like the parameters.
+        """
+        super().__init__(name=tool_info.name, description=tool_info.description)
+        # Kept as given so get_tools_from_agent() on a stubbed agent
+        # reports the same ToolInfo.
+        self.parameters = tool_info.parameters
+        self.parameters_schema = parameters_schema(tool_info.parameters)
+        self.response = response
+        self.calls: list[dict[str, Any]] = []
+
+    def _get_declaration(self) -> Optional[types.FunctionDeclaration]:
+        return types.FunctionDeclaration(
+            name=self.name,
+            description=self.description,
+            parameters=self.parameters_schema,
+        )
+
+    def default_response(self, args: dict[str, Any]) -> dict[str, Any]:
+        """Echo the arguments, filling missing parameters with typed placeholders."""
+        arguments = dict(args)
+        schema = self.parameters_schema
+        if schema is not None and schema.properties:
+            for name, prop in schema.properties.items():
+                arguments.setdefault(name, _placeholder(prop))
+        return {"status": "success", "tool": self.name, "arguments": arguments}
+
+    async def run_async(self, *, args: dict[str, Any], tool_context) -> Any:
+        self.calls.append(args)
+        if self.response is None:
+            return self.default_response(args)
+        if callable(self.response):
+            return self.response(args)
+        return self.response
+
+
+def stub_tools(
+    tools: Union[AgentTools, Iterable[ToolInfo]],
+    responses: Optional[dict[str, StubResponse]] = None,
+) -> list[StubTool]:
+    """
+    Build in-process stubs for a set of tools.
+
+    Args:
+        tools: The tools to stub, e.g. from ``get_tools_from_agent``.
+            Repeated tool names are stubbed once.
+        responses: Canned responses by tool name; other tools answer with
+            ``StubTool.default_response``
+
+    Returns:
+        list[StubTool]: One stub per distinct tool name
+    """
+    if isinstance(tools, AgentTools):
+        tools = tools.tools
+    responses = responses or {}
+    stubs: dict[str, StubTool] = {}
+    for tool_info in tools:
+        if tool_info.name not in stubs:
+            stubs[tool_info.name] = StubTool(tool_info, responses.get(tool_info.name))
+    return list(stubs.values())
+
+
+class StubToolset(BaseToolset):
+    """Stands in for a toolset such as ``MCPToolset`` with stubs of its tools."""
+
+    def __init__(
+        self,
+        toolset: BaseToolset,
+        tools: Optional[Iterable[ToolInfo]] = None,
+        responses: Optional[dict[str, StubResponse]] = None,
+    ):
+        """
+        Args:
+            toolset: The real toolset
+            tools: Its tools, if already discovered. Otherwise the real
+                toolset is asked for them once, on first use; its tools are
+                never called.
+            responses: Canned responses by tool name
+        """
+        super().__init__(tool_filter=toolset.tool_filter)
+        self.toolset = toolset
+        self.tool_infos = list(tools) if tools is not None else None
+        self.responses = responses
+        self._stubs: Optional[list[StubTool]] = None
+
+    async def get_tools(
+        self, readonly_context: Optional[ReadonlyContext] = None
+    ) -> list[BaseTool]:
+        if self._stubs is None:
+            if self.tool_infos is None:
+                self.tool_infos = [
+                    declared_tool_info(tool) for tool in await self.toolset.get_tools()
+                ]
+            self._stubs = stub_tools(self.tool_infos, self.responses)
+        return [
+            stub
+            for stub in self._stubs
+            if self._is_tool_selected(stub, readonly_context)
+        ]
+
+    async def close(self) -> None:
+        """Nothing to release; the real toolset belongs to the original agent."""
+
+
+def _walk(agent: BaseAgent) -> Iterator[BaseAgent]:
+    yield agent
+    for sub_agent in agent.sub_agents:
+        yield from _walk(sub_agent)
+
+
+def _tool_entries(agent: BaseAgent) -> list[Any]:
+    return list(getattr(agent, "tools", None) or [])
+
+
+def _as_tool(entry: Any) -> Optional[BaseTool]:
+    """Return the tool of a ``tools`` entry, or None for toolsets and the like."""
+    if isinstance(entry, BaseTool):
+        return entry
+    if callable(entry) and not isinstance(entry, BaseToolset):
+        return FunctionTool(entry)
+    return None
+
+
+def _stub_entry(
+    entry: Any,
+    known: dict[str, ToolInfo],
+    toolset_tools: Optional[list[ToolInfo]],
+    responses: dict[str, StubResponse],
+) -> Any:
+    """Return the stand-in for one entry of an agent's ``tools`` list."""
+    if isinstance(entry, BaseToolset):
+        return StubToolset(entry, toolset_tools, responses)
+    tool = _as_tool(entry)
+    if tool is None:
+        return entry
+    tool_info = known.get(tool.name) or declared_tool_info(tool)
+    return StubTool(tool_info, responses.get(tool_info.name))
+
+
+def stub_agent(
+    agent: BaseAgent,
+    tools: Optional[Union[AgentTools, Iterable[ToolInfo]]] = None,
+    responses: Optional[dict[str, StubResponse]] = None,
+) -> BaseAgent:
+    """
+    Return a copy of an agent tree whose tools are replaced by in-process stubs.
+
+    Every agent in the tree keeps its own tools, in the same place: each tool
+    becomes a ``StubTool`` and each toolset a ``StubToolset``.
+
+    Args:
+        agent: The root of the agent tree to evaluate; it is left unchanged
+        tools: The discovered tools of the tree, e.g. from ``discover_tools``.
+            They are used for the declarations of tools with the same name,
+            and, when the tree has a single toolset, as that toolset's tools.
+            Other tools are stubbed from their own declarations.
+        responses: Canned responses by tool name
+
+    Returns:
+        BaseAgent: A clone of the tree with the same models, instructions and
+            sub-agents, but stub tools
+    """
+    if isinstance(tools, AgentTools):
+        tools = tools.tools
+    discovered = list(tools or [])
+    responses = responses or {}
+    known = {tool_info.name: tool_info for tool_info in reversed(discovered)}
+
+    # Discovery lists a toolset's tools without saying which toolset they
+    # came from. Those not declared by a plain tool belong to the toolset
+    # when there is only one; several toolsets are asked for their own.
+    entries = [entry for node in _walk(agent) for entry in _tool_entries(node)]
+    toolsets = [entry for entry in entries if isinstance(entry, BaseToolset)]
+    toolset_tools = None
+    if discovered and len(toolsets) == 1:
+        plain_tools = (_as_tool(entry) for entry in entries)
+        declared = {tool.name for tool in plain_tools if tool is not None}
+        toolset_tools = [t for t in discovered if t.name not in declared]
+
+    def stub(node: BaseAgent) -> BaseAgent:
+        update: dict[str, Any] = {"sub_agents": [stub(sub) for sub in node.sub_agents]}
+        if "tools" in type(node).model_fields:
+            update["tools"] = [
+                _stub_entry(entry, known, toolset_tools, responses)
+                for entry in _tool_entries(node)
+            ]
+        return node.clone(update=update)
+
+    return stub(agent)
@@ -0,0 +1,224 @@
+"""Adaptive multi-trial runs with sequential stopping.
+
+A single run of a nondeterministic agent is a noisy verdict, and running
+every scenario a fixed number of times wastes most of the runs on scenarios
+that always pass or always fail. ``run_trials`` reruns one scenario until one
+of these holds, checked after every run once ``min_trials`` are done:
+
+- Wald's sequential probability ratio test decides between "mostly passes"
+  (pass rate ``sprt_p1``) and "mostly fails" (``sprt_p0``). A stable scenario
+  reaches either decision after a couple of runs.
+- The Wilson score interval of the pass rate is at most ``max_ci_width`` wide.
+- ``max_trials`` runs have been made. Flaky scenarios end up here.
+"""
+
+import asyncio
+import math
+import uuid
+from statistics import NormalDist
+from typing import Optional
+
+from google.adk.agents import Agent
+from pydantic import BaseModel, Field, model_validator
+
+from src.models import Scenario, TrialResult
+from src.runner.scenario_runner import DEFAULT_MAX_CONCURRENCY, run_scenario
+
+SPRT_PASS = "sprt_pass"
+SPRT_FAIL = "sprt_fail"
+CI_WIDTH = "ci_width"
+MAX_TRIALS = "max_trials"
+
+
+def wilson_interval(
+    passes: int, trials: int, confidence: float = 0.95
+) -> tuple[float, float]:
+    """
+    Wilson score interval of a pass rate.
+
+    Args:
+        passes: Number of passing runs
+        trials: Number of runs
+        confidence: Two-sided confidence level
+
+    Returns:
+        tuple[float, float]: Lower and upper bound; (0, 1) without trials
+    """
+    if trials == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = passes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials**2))
+    margin /= denominator
+    low = 0.0 if passes == 0 else max(0.0, center - margin)
+    high = 1.0 if passes == trials else min(1.0, center + margin)
+    return low, high
+
+
+class TrialPolicy(BaseModel):
+    """When to stop rerunning a scenario."""
+
+    min_trials: int = Field(2, ge=1, description="Runs made before any stop check")
+    max_trials: int = Field(10, ge=1, description="Hard budget of runs per scenario")
+    confidence: float = Field(
+        0.95, gt=0.0, lt=1.0, description="Confidence level of the Wilson interval"
+    )
+    max_ci_width: float = Field(
+        0.3, gt=0.0, le=1.0, description="Stop once the interval is this narrow"
+    )
+    sprt_p0: float = Field(
+        0.2, gt=0.0, lt=1.0, description="Pass rate of a scenario that mostly fails"
+    )
+    sprt_p1: float = Field(
+        0.8, gt=0.0, lt=1.0, description="Pass rate of a scenario that mostly passes"
+    )
+    sprt_alpha: float = Field(
+        0.1, gt=0.0, lt=1.0, description="Chance of calling a failing scenario passing"
+    )
+    sprt_beta: float = Field(
+        0.1, gt=0.0, lt=1.0, description="Chance of calling a passing scenario failing"
+    )
+
+    @model_validator(mode="after")
+    def _check_bounds(self) -> "TrialPolicy":
+        if self.min_trials > self.max_trials:
+            raise ValueError("min_trials must not exceed max_trials")
+        if self.sprt_p0 >= self.sprt_p1:
+            raise ValueError("sprt_p0 must be below sprt_p1")
+        return self
+
+    def sprt_decision(self, passes: int, trials: int) -> Optional[str]:
+        """Return SPRT_PASS or SPRT_FAIL once the test decides, else None."""
+        failures = trials - passes
+        log_ratio = passes * math.log(self.sprt_p1 / self.sprt_p0)
+        log_ratio += failures * math.log((1 - self.sprt_p1) / (1 - self.sprt_p0))
+        if log_ratio >= math.log((1 - self.sprt_beta) / self.sprt_alpha):
+            return SPRT_PASS
+        if log_ratio <= math.log(self.sprt_beta / (1 - self.sprt_alpha)):
+            return SPRT_FAIL
+        return None
+
+    def stop_reason(self, passes: int, trials: int) -> Optional[str]:
+        """Return why trials should stop after this many runs, or None."""
+        if trials >= self.max_trials:
+            return MAX_TRIALS
+        if trials < self.min_trials:
+            return None
+        decision = self.sprt_decision(passes, trials)
+        if decision is not None:
+            return decision
+        low, high = wilson_interval(passes, trials, self.confidence)
+        if high - low <= self.max_ci_width:
+            return CI_WIDTH
+        return None
+
+
+async def run_trials(
+    scenario: Scenario,
+    agent: Agent,
+    policy: Optional[TrialPolicy] = None,
+    user_id: str = "123",
+    session_id: str = "456",
+    app_name: str = "789",
+    streaming: bool = False,
+) -> TrialResult:
+    """
+    Rerun a scenario until the policy says its pass rate is known well enough.
+
+    Args:
+        scenario: The scenario to run
+        agent: The ADK agent under test
+        policy: When to stop; defaults to ``TrialPolicy()``
+        user_id: The user id for the sessions
+        session_id: Prefix of the per-trial session ids
+        app_name: The application name
+        streaming: Stop each agent turn as soon as its verdict is certain
+
+    Returns:
+        TrialResult: Pass rate, Wilson interval, trial count and every run
+    """
+    policy = policy or TrialPolicy()
+    results = []
+    passes = 0
+    while True:
+        result = await run_scenario(
+            scenario,
+            agent,
+            user_id=user_id,
+            session_id=f"{session_id}-trial-{len(results)}",
+            app_name=app_name,
+            streaming=streaming,
+        )
+        results.append(result)
+        passes += result.passed
+        reason = policy.stop_reason(passes, len(results))
+        if reason is not None:
+            break
+
+    ci_low, ci_high = wilson_interval(passes, len(results), policy.confidence)
+    return TrialResult(
+        scenario_name=scenario.name,
+        expected_tool_call=scenario.expected_tool_call,
+        trials=len(results),
+        passes=passes,
+        pass_rate=passes / len(results),
+        ci_low=ci_low,
+        ci_high=ci_high,
+        stop_reason=reason,
+        results=results,
+    )
+
+
+async def run_trials_concurrently(
+    scenarios: list[Scenario],
+    agent: Agent,
+    policy: Optional[TrialPolicy] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    streaming: bool = False,
+) -> list[TrialResult]:
+    """
+    Run adaptive trials for many scenarios on a bounded pool of workers.
+
+    Trials of one scenario run one after another, since each stop decision
+    depends on the previous runs; different scenarios run concurrently.
+
+    Args:
+        scenarios: The scenarios to run
+        agent: The ADK agent under test
+        policy: When to stop; defaults to ``TrialPolicy()``
+        max_concurrency: Maximum number of scenarios in flight at once
+        streaming: Stop each agent turn as soon as its verdict is certain
+
+    Returns:
+        list[TrialResult]: One result per scenario, in the same order as
+            ``scenarios``
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    run_id = uuid.uuid4().hex[:12]
+    user_id = f"user-{run_id}"
+    app_name = getattr(agent, "name", None) or "magic_eval"
+
+    results: list[TrialResult | None] = [None] * len(scenarios)
+    pending = iter(enumerate(scenarios))
+
+    async def worker():
+        for index, scenario in pending:
+            results[index] = await run_trials(
+                scenario,
+                agent,
+                policy,
+                user_id=user_id,
+                session_id=f"session-{run_id}-{index}",
+                app_name=app_name,
+                streaming=streaming,
+            )
+
+    async with asyncio.TaskGroup() as group:
+        for _ in range(min(max_concurrency, len(scenarios))):
+            group.create_task(worker())
+
+    return results
@@ -1,62 +1,240 @@
-"""Weave configuration for ADK integration with OTEL tracing."""
+"""Weave configuration for ADK integration with OTEL tracing.
+
+Tracing is configured through a profile, chosen with ``setup_weave_tracing``
+or the ``MAGIC_EVAL_TRACING`` environment variable:
+
+- ``off``: no exporters and no ``weave.init``; a no-op provider is installed,
+  so spans are dropped even if a library (crewai) would export them.
+- ``sampled``: like ``batched`` but only a ratio of traces is kept
+  (``MAGIC_EVAL_TRACE_SAMPLE_RATIO``, default 0.1).
+- ``batched``: spans are exported to OTLP in background batches.
+- ``file``: spans are written in background batches to a local JSON-lines
+  file (``MAGIC_EVAL_TRACE_FILE``).
+- ``console``: every span is printed synchronously; for debugging only.
+
+``sampled`` and ``batched`` export to W&B Weave by default. Setting
+``MAGIC_EVAL_OTLP_ENDPOINT`` points them at another OTLP/HTTP collector,
+such as a local one, and then ``weave.init`` is skipped. Without the
+environment variable the profile is ``batched`` when ``WANDB_API_KEY`` is
+set and ``off`` otherwise, so offline runs never try to reach W&B.
+"""
 
 import os
 import base64
+import threading
+from enum import Enum
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
 import weave
 from dotenv import load_dotenv
-from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry import metrics, trace
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
 from opentelemetry.sdk.trace.export import (
     BatchSpanProcessor,
     SimpleSpanProcessor,
     ConsoleSpanExporter,
+    SpanExporter,
+    SpanExportResult,
 )
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
 from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from pydantic import BaseModel, Field
+
+from src.runner.telemetry import configure_telemetry
 
 # Load environment variables
 load_dotenv()
 
+WANDB_BASE_URL = "https://trace.wandb.ai"
+WANDB_OTLP_ENDPOINT = f"{WANDB_BASE_URL}/otel/v1/traces"
+PROJECT_ID = "Magic_evals"  # You can update this to include entity if needed
 
-def setup_weave_tracing():
-    """Set up Weave with OTEL tracing for ADK integration."""
+TRACING_ENV = "MAGIC_EVAL_TRACING"
+SAMPLE_RATIO_ENV = "MAGIC_EVAL_TRACE_SAMPLE_RATIO"
+TRACE_FILE_ENV = "MAGIC_EVAL_TRACE_FILE"
+OTLP_ENDPOINT_ENV = "MAGIC_EVAL_OTLP_ENDPOINT"
 
-    # Initialize Weave with your project
-    weave.init("Magic_evals")
+DEFAULT_SAMPLE_RATIO = 0.1
+DEFAULT_TRACE_FILE = Path(".magic_eval_cache") / "traces.jsonl"
 
-    # Set up OpenTelemetry tracing
-    trace.set_tracer_provider(TracerProvider())
 
-    # Configure Weave tracing parameters
-    WANDB_BASE_URL = "https://trace.wandb.ai"
-    PROJECT_ID = "Magic_evals"  # You can update this to include entity if needed
-    WANDB_API_KEY = os.getenv("WANDB_API_KEY")
+class TracingProfile(str, Enum):
+    """Named tracing setups, from no tracing to printing every span."""
 
-    OTEL_EXPORTER_OTLP_ENDPOINT = f"{WANDB_BASE_URL}/otel/v1/traces"
+    OFF = "off"
+    SAMPLED = "sampled"
+    BATCHED = "batched"
+    FILE = "file"
+    CONSOLE = "console"
 
-    # Create authorization header
-    AUTH = base64.b64encode(f"api:{WANDB_API_KEY}".encode()).decode()
 
-    OTEL_EXPORTER_OTLP_HEADERS = {
-        "Authorization": f"Basic {AUTH}",
-        "project_id": PROJECT_ID,
-    }
+class TracingConfig(BaseModel):
+    """How spans are sampled and where they are exported."""
 
-    # Configure the OTLP HTTP exporter
-    otlp_exporter = OTLPSpanExporter(
-        endpoint=OTEL_EXPORTER_OTLP_ENDPOINT,
-        headers=OTEL_EXPORTER_OTLP_HEADERS,
+    profile: TracingProfile = Field(
+        TracingProfile.OFF, description="Which tracing profile to use"
+    )
+    sample_ratio: float = Field(
+        DEFAULT_SAMPLE_RATIO,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of traces kept by the sampled profile",
+    )
+    trace_file: Path = Field(
+        DEFAULT_TRACE_FILE, description="Output file of the file profile"
+    )
+    otlp_endpoint: Optional[str] = Field(
+        None,
+        description="OTLP/HTTP traces endpoint; None means W&B Weave",
     )
 
-    # Add span processors
-    span_processor = BatchSpanProcessor(otlp_exporter)
-    trace.get_tracer_provider().add_span_processor(span_processor)
-
-    # Optionally, print the spans to the console for debugging
-    trace.get_tracer_provider().add_span_processor(
-        SimpleSpanProcessor(ConsoleSpanExporter())
+    @classmethod
+    def from_env(cls) -> "TracingConfig":
+        """Read the tracing configuration from the environment."""
+        profile = os.getenv(TRACING_ENV)
+        if not profile:
+            profile = "batched" if os.getenv("WANDB_API_KEY") else "off"
+        return cls(
+            profile=profile.strip().lower(),
+            sample_ratio=float(os.getenv(SAMPLE_RATIO_ENV, DEFAULT_SAMPLE_RATIO)),
+            trace_file=os.getenv(TRACE_FILE_ENV, DEFAULT_TRACE_FILE),
+            otlp_endpoint=os.getenv(OTLP_ENDPOINT_ENV) or None,
+        )
+
+    @property
+    def exports_to_weave(self) -> bool:
+        return (
+            self.profile in (TracingProfile.SAMPLED, TracingProfile.BATCHED)
+            and self.otlp_endpoint is None
+        )
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Appends finished spans to a file, one JSON document per line."""
+
+    def __init__(self, path: Union[str, Path]):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        with self._lock:
+            if self._file.closed:
+                return SpanExportResult.FAILURE
+            self._file.write(lines)
+            self._file.flush()
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def _weave_headers() -> dict[str, str]:
+    # Create authorization header
+    auth = base64.b64encode(f"api:{os.getenv('WANDB_API_KEY')}".encode()).decode()
+    return {"Authorization": f"Basic {auth}", "project_id": PROJECT_ID}
+
+
+def build_tracer_provider(config: TracingConfig) -> trace.TracerProvider:
+    """
+    Build the tracer provider for a tracing profile.
+
+    Args:
+        config: The tracing configuration
+
+    Returns:
+        trace.TracerProvider: The provider; a no-op one for the ``off`` profile
+    """
+    if config.profile is TracingProfile.OFF:
+        return trace.NoOpTracerProvider()
+
+    if config.profile is TracingProfile.SAMPLED:
+        provider = TracerProvider(
+            sampler=ParentBased(TraceIdRatioBased(config.sample_ratio))
+        )
+    else:
+        provider = TracerProvider()
+
+    if config.profile is TracingProfile.FILE:
+        processor = BatchSpanProcessor(JsonLinesSpanExporter(config.trace_file))
+    elif config.profile is TracingProfile.CONSOLE:
+        processor = SimpleSpanProcessor(ConsoleSpanExporter())
+    elif config.otlp_endpoint is not None:
+        processor = BatchSpanProcessor(OTLPSpanExporter(endpoint=config.otlp_endpoint))
+    else:
+        processor = BatchSpanProcessor(
+            OTLPSpanExporter(endpoint=WANDB_OTLP_ENDPOINT, headers=_weave_headers())
+        )
+    provider.add_span_processor(processor)
+    return provider
+
+
+def build_meter_provider(config: TracingConfig) -> Optional[MeterProvider]:
+    """Build a meter provider exporting to a custom OTLP collector, if one is set.
+
+    W&B Weave only ingests traces, so metrics are only exported when the
+    sampled or batched profile points at another collector.
+    """
+    if (
+        config.profile not in (TracingProfile.SAMPLED, TracingProfile.BATCHED)
+        or config.otlp_endpoint is None
+    ):
+        return None
+    endpoint = config.otlp_endpoint
+    if endpoint.endswith("/v1/traces"):
+        endpoint = endpoint[: -len("/v1/traces")] + "/v1/metrics"
+    return MeterProvider(
+        metric_readers=[
+            PeriodicExportingMetricReader(OTLPMetricExporter(endpoint=endpoint))
+        ]
     )
 
-    return trace.get_tracer(__name__)
+
+def setup_weave_tracing(
+    config: Optional[Union[TracingConfig, TracingProfile, str]] = None,
+) -> trace.Tracer:
+    """Set up Weave with OTEL tracing for ADK integration.
+
+    Args:
+        config: A TracingConfig, or just a profile name. Defaults to the
+            configuration from the environment.
+
+    Returns:
+        trace.Tracer: A tracer for the caller; a no-op one when tracing is off
+    """
+    if config is None:
+        config = TracingConfig.from_env()
+    elif not isinstance(config, TracingConfig):
+        config = TracingConfig.from_env().model_copy(
+            update={"profile": TracingProfile(config)}
+        )
+
+    # crewai installs a global provider exporting to its own telemetry
+    # endpoint unless told not to, and the global provider can only be set
+    # once; keep it from claiming it (and our spans) when imported later.
+    os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+
+    if config.exports_to_weave:
+        # Initialize Weave with your project
+        weave.init(PROJECT_ID)
+
+    tracer_provider = build_tracer_provider(config)
+    trace.set_tracer_provider(tracer_provider)
+    meter_provider = build_meter_provider(config)
+    if meter_provider is not None:
+        metrics.set_meter_provider(meter_provider)
+    # Hand the providers to the runner directly, in case another global
+    # provider was installed first.
+    configure_telemetry(tracer_provider, meter_provider)
+
+    return tracer_provider.get_tracer(__name__)
 
 
 def create_weave_op(func):
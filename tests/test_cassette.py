@@ -0,0 +1,139 @@
+import pytest
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.events import Event
+from google.genai import types
+
+from src.fingerprint import agent_fingerprint
+from src.models import Scenario, ToolInfo
+from src.runner.cassette import CassetteNotFoundError, use_cassettes
+from src.runner.scenario_runner import call_agent_async, run_scenario
+
+
+class ToolCallingAgent(BaseAgent):
+    """Agent that emits a get_current_time call followed by a text answer."""
+
+    calls: int = 0
+
+    async def _run_async_impl(self, ctx):
+        self.calls += 1
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            content=types.Content(
+                role="model",
+                parts=[
+                    types.Part(
+                        function_call=types.FunctionCall(
+                            name="get_current_time", args={"timezone": "UTC"}
+                        )
+                    )
+                ],
+            ),
+        )
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            content=types.Content(role="model", parts=[types.Part(text="12:00")]),
+        )
+
+
+@pytest.fixture
+def agent():
+    return ToolCallingAgent(name="time_agent")
+
+
+@pytest.fixture
+def scenario():
+    return Scenario(
+        name="time_query",
+        query="What time is it?",
+        why_its_suitable="Tests tool usage",
+        expected_tool_call="get_current_time",
+    )
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay(agent, tmp_path):
+    """Test that replayed events match the recorded ones without running the agent."""
+    with use_cassettes(tmp_path, "record"):
+        recorded = await call_agent_async(agent, "What time is it?", "u", "s", "app")
+    assert agent.calls == 1
+
+    with use_cassettes(tmp_path, "replay"):
+        replayed = await call_agent_async(agent, "What time is it?", "u", "s", "app")
+
+    assert agent.calls == 1
+    assert [e.model_dump() for e in replayed] == [e.model_dump() for e in recorded]
+    assert replayed[0].get_function_calls()[0].name == "get_current_time"
+
+
+@pytest.mark.asyncio
+async def test_replay_without_cassette_raises(agent, tmp_path):
+    """Test that replaying an unrecorded call fails instead of calling the agent."""
+    with use_cassettes(tmp_path, "replay"):
+        with pytest.raises(CassetteNotFoundError):
+            await call_agent_async(agent, "Unrecorded query", "u", "s", "app")
+    assert agent.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_streaming_records_full_turn(agent, scenario, tmp_path):
+    """Test that early exit is skipped while recording so the cassette is complete."""
+    with use_cassettes(tmp_path, "record") as cassettes:
+        assert (await run_scenario(scenario, agent, streaming=True)).passed is True
+        assert len(cassettes.load(agent, scenario.query)) == 2
+
+
+@pytest.mark.asyncio
+async def test_rescore_from_cassette(agent, scenario, tmp_path):
+    """Test that a recorded run can be re-scored under a different expectation."""
+    with use_cassettes(tmp_path, "record"):
+        await run_scenario(scenario, agent)
+
+    no_tool = scenario.model_copy(update={"expected_tool_call": None})
+    with use_cassettes(tmp_path, "replay"):
+        assert (await run_scenario(scenario, agent, streaming=True)).passed is True
+        assert (await run_scenario(no_tool, agent)).passed is False
+    assert agent.calls == 1
+
+
+def test_fingerprint_tracks_agent_config():
+    """Test that instruction and model changes produce different fingerprints."""
+    base = LlmAgent(name="a", model="model-a", instruction="Be helpful.")
+
+    assert agent_fingerprint(base) == agent_fingerprint(
+        LlmAgent(name="a", model="model-a", instruction="Be helpful.")
+    )
+    assert agent_fingerprint(base) != agent_fingerprint(
+        LlmAgent(name="a", model="model-a", instruction="Be terse.")
+    )
+    assert agent_fingerprint(base) != agent_fingerprint(
+        LlmAgent(name="a", model="model-b", instruction="Be helpful.")
+    )
+
+
+def test_fingerprint_tracks_tool_declarations():
+    """Test that tool docstrings, signatures and discovered schemas count."""
+
+    def lookup(city: str) -> str:
+        """Look up the time in a city."""
+
+    def lookup_v2(city: str) -> str:
+        """Look up the local time in a city."""
+
+    def lookup_v3(city: str, utc: bool) -> str:
+        """Look up the time in a city."""
+
+    lookup_v2.__name__ = lookup_v3.__name__ = "lookup"
+    fingerprints = {
+        agent_fingerprint(LlmAgent(name="a", model="m", tools=[tool]))
+        for tool in (lookup, lookup_v2, lookup_v3)
+    }
+    assert len(fingerprints) == 3
+
+    agent = LlmAgent(name="a", model="m")
+    tool = ToolInfo(name="get_time", description="Get the time", parameters={})
+    changed = tool.model_copy(update={"parameters": {"timezone": "string"}})
+    assert agent_fingerprint(agent, [tool]) == agent_fingerprint(agent, [tool])
+    assert agent_fingerprint(agent, [tool]) != agent_fingerprint(agent, [changed])
+    assert agent_fingerprint(agent, [tool]) != agent_fingerprint(agent)
@@ -0,0 +1,101 @@
+import asyncio
+import json
+
+import pytest
+
+from src.creation.main import create_scenarios, create_scenarios_async, shard_tools
+from src.creation.scenario_cache import ScenarioCache
+from src.models import Scenario, ToolInfo
+
+
+def make_tools(count):
+    return [
+        ToolInfo(name=f"tool_{i}", description=f"Tool number {i}", parameters=None)
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def mock_kickoff(mocker):
+    """Patch the crew so each kickoff returns one scenario per tool in its shard."""
+    state = {"in_flight": 0, "peak": 0, "inputs": []}
+
+    async def kickoff_async(inputs):
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        state["inputs"].append(inputs)
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        result = mocker.Mock()
+        result.json_dict = {
+            "scenarios": [
+                Scenario(
+                    name=f"{tool['name']}_scenario",
+                    query=f"Use {tool['name']}",
+                    why_its_suitable="Tests tool usage",
+                    expected_tool_call=tool["name"],
+                ).model_dump()
+                for tool in map(json.loads, inputs["tools"].splitlines())
+            ]
+        }
+        return result
+
+    crew_class = mocker.patch("src.creation.main.Scenario_Eval_Crew")
+    crew_class.return_value.crew.return_value.kickoff_async = kickoff_async
+    return state
+
+
+def test_shard_tools():
+    """Test that tools are split into consecutive shards."""
+    shards = shard_tools(make_tools(5), 2)
+
+    assert [[tool.name for tool in shard] for shard in shards] == [
+        ["tool_0", "tool_1"],
+        ["tool_2", "tool_3"],
+        ["tool_4"],
+    ]
+    with pytest.raises(ValueError):
+        shard_tools(make_tools(1), 0)
+
+
+def test_shards_are_merged_in_order(mock_kickoff):
+    """Test that shard results are merged in tool order."""
+    scenarios = create_scenarios(make_tools(7), use_cache=False, shard_size=3)
+
+    assert [s.expected_tool_call for s in scenarios] == [
+        f"tool_{i}" for i in range(7)
+    ]
+    assert [
+        len(inputs["tools"].splitlines()) for inputs in mock_kickoff["inputs"]
+    ] == [3, 3, 1]
+
+
+def test_kickoffs_run_concurrently_up_to_limit(mock_kickoff):
+    """Test that no more than max_concurrency kickoffs overlap."""
+    create_scenarios(
+        make_tools(10), use_cache=False, shard_size=1, max_concurrency=3
+    )
+
+    assert len(mock_kickoff["inputs"]) == 10
+    assert mock_kickoff["peak"] == 3
+
+
+def test_scenario_count_scales_with_shard(mock_kickoff):
+    """Test that each shard asks for scenarios_per_tool scenarios per tool."""
+    create_scenarios(
+        make_tools(5), use_cache=False, shard_size=4, scenarios_per_tool=3
+    )
+
+    assert [inputs["num_scenarios"] for inputs in mock_kickoff["inputs"]] == [12, 3]
+
+
+@pytest.mark.asyncio
+async def test_only_changed_shards_are_regenerated(mock_kickoff, tmp_path):
+    """Test that cached shards are reused when another shard changes."""
+    cache = ScenarioCache(tmp_path)
+    tools = make_tools(4)
+    await create_scenarios_async(tools, cache=cache, shard_size=2)
+    tools[3] = tools[3].model_copy(update={"description": "Changed"})
+    await create_scenarios_async(tools, cache=cache, shard_size=2)
+
+    assert len(mock_kickoff["inputs"]) == 3
@@ -0,0 +1,135 @@
+import random
+import string
+
+import pytest
+
+from src.creation.dedup import (
+    MinHasher,
+    StreamingDeduplicator,
+    deduplicate_scenarios,
+    jaccard,
+    normalize_query,
+    shingles,
+)
+from src.models import Scenario
+
+
+def make_scenario(name, query, expected_tool_call="get_current_time"):
+    return Scenario(
+        name=name,
+        query=query,
+        why_its_suitable="Tests tool usage",
+        expected_tool_call=expected_tool_call,
+    )
+
+
+def test_normalize_query():
+    """Test that case, punctuation and whitespace are normalized."""
+    assert normalize_query("  What TIME is it,   now?! ") == "what time is it now"
+
+
+def test_paraphrases_are_collapsed():
+    """Test that near-paraphrases expecting the same tool are collapsed."""
+    scenarios = [
+        make_scenario("a", "What time is it?"),
+        make_scenario("b", "What time is it now?"),
+        make_scenario("c", "what time is it"),
+    ]
+
+    result = deduplicate_scenarios(scenarios)
+
+    assert [s.name for s in result.scenarios] == ["a"]
+    assert result.runs_saved == 2
+    assert [d.name for d in result.groups[0].duplicates] == ["b", "c"]
+
+
+def test_different_queries_are_kept():
+    """Test that distinct queries survive deduplication."""
+    scenarios = [
+        make_scenario("a", "What time is it in Tokyo?"),
+        make_scenario("b", "What time is it in Paris?"),
+        make_scenario("c", "Convert 3pm EST to London time"),
+    ]
+
+    result = deduplicate_scenarios(scenarios)
+
+    assert [s.name for s in result.scenarios] == ["a", "b", "c"]
+    assert result.runs_saved == 0
+
+
+def test_streaming_batches_are_checked_against_earlier_ones():
+    """Test that later batches only pass on scenarios unlike anything kept."""
+    dedup = StreamingDeduplicator()
+
+    first = dedup.add([make_scenario("a", "What time is it?")])
+    second = dedup.add(
+        [
+            make_scenario("b", "what time is it"),
+            make_scenario("c", "Roll a twenty sided die for me"),
+        ]
+    )
+
+    assert [s.name for s in first] == ["a"]
+    assert [s.name for s in second] == ["c"]
+    assert [s.name for s in dedup.kept] == ["a", "c"]
+    assert dedup.duplicates == 1
+
+
+def test_duplicates_are_grouped_by_expected_tool_call():
+    """Test that identical queries with different expectations are both kept."""
+    scenarios = [
+        make_scenario("a", "What time is it?", "get_current_time"),
+        make_scenario("b", "What time is it?", None),
+    ]
+
+    assert deduplicate_scenarios(scenarios).runs_saved == 0
+
+
+def test_minhash_estimates_jaccard():
+    """Test that signature agreement approximates the exact Jaccard similarity."""
+    a = shingles(normalize_query("the quick brown fox jumps over the lazy dog"))
+    b = shingles(normalize_query("the quick brown fox jumped over a lazy dog"))
+    signatures = MinHasher(num_perm=256).signatures([a, b])
+
+    estimate = (signatures[0] == signatures[1]).mean()
+    assert estimate == pytest.approx(jaccard(a, b), abs=0.1)
+
+
+def test_large_input_with_many_copies():
+    """Test that many copies of the same query collapse into one scenario."""
+    scenarios = [make_scenario(str(i), "What time is it?") for i in range(5000)]
+
+    result = deduplicate_scenarios(scenarios)
+
+    assert len(result.scenarios) == 1
+    assert result.runs_saved == 4999
+
+
+def test_streaming_matches_one_shot_on_many_batches():
+    """Test that deduplicating in small batches gives the one-shot result."""
+    rng = random.Random(0)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=6)) for _ in range(2000)]
+    queries = [" ".join(rng.choices(words, k=8)) for _ in range(500)]
+    scenarios = [
+        make_scenario(f"{i}-{copy}", query)
+        for i, query in enumerate(queries)
+        for copy in range(2)
+    ]
+    dedup = StreamingDeduplicator()
+
+    kept = [
+        scenario
+        for start in range(0, len(scenarios), 16)
+        for scenario in dedup.add(scenarios[start : start + 16])
+    ]
+
+    assert [s.name for s in kept] == [
+        s.name for s in deduplicate_scenarios(scenarios).scenarios
+    ]
+    assert dedup.duplicates == len(scenarios) - len(kept)
+
+
+def test_invalid_band_configuration():
+    """Test that num_perm must split evenly into bands."""
+    with pytest.raises(ValueError):
+        deduplicate_scenarios([], num_perm=10, bands=3)
@@ -0,0 +1,121 @@
+import json
+
+import pytest
+
+from evaluation.eval_set_stream import (
+    build_index,
+    convert_eval_set_file,
+    index_path,
+    iter_eval_cases,
+    load_eval_cases,
+    load_eval_selection,
+    read_eval_set_header,
+    write_eval_set_jsonl,
+)
+
+
+def make_case(eval_id, text="What time is it?"):
+    return {
+        "eval_id": eval_id,
+        "conversation": [
+            {
+                "invocation_id": f"inv-{eval_id}",
+                "user_content": {"parts": [{"text": text}], "role": "user"},
+                "intermediate_data": {
+                    "tool_uses": [{"args": {}, "name": "get_current_time"}],
+                    "intermediate_responses": [],
+                },
+            }
+        ],
+    }
+
+
+def make_eval_set(count):
+    return {
+        "eval_set_id": "test_set",
+        "name": "Test Set",
+        "eval_cases": [make_case(f"case_{i}", f"query {i}") for i in range(count)],
+    }
+
+
+@pytest.fixture
+def jsonl_path(tmp_path):
+    return write_eval_set_jsonl(make_eval_set(50), tmp_path / "set.jsonl")
+
+
+def test_iter_eval_cases_streams_all_cases(jsonl_path):
+    """Test that every case is yielded in file order."""
+    cases = list(iter_eval_cases(jsonl_path))
+
+    assert [c.eval_id for c in cases] == [f"case_{i}" for i in range(50)]
+    assert cases[3].conversation[0].user_content.parts[0].text == "query 3"
+
+
+def test_header_round_trip(jsonl_path):
+    """Test that the eval set fields are stored on the first line."""
+    header = read_eval_set_header(jsonl_path)
+
+    assert header.eval_set_id == "test_set"
+    assert header.name == "Test Set"
+    assert header.eval_cases == []
+
+
+def test_load_selected_cases_in_requested_order(jsonl_path):
+    """Test that indexed lookups return the requested cases in order."""
+    cases = load_eval_cases(jsonl_path, ["case_42", "case_0", "case_7"])
+
+    assert [c.eval_id for c in cases] == ["case_42", "case_0", "case_7"]
+
+
+def test_unknown_eval_id_raises(jsonl_path):
+    """Test that a missing eval_id raises KeyError."""
+    with pytest.raises(KeyError):
+        load_eval_cases(jsonl_path, ["missing"])
+
+
+def test_stale_index_is_rebuilt(jsonl_path):
+    """Test that the index is rebuilt after the eval set file changes."""
+    write_eval_set_jsonl(make_eval_set(60), jsonl_path)
+    index_path(jsonl_path).write_bytes(b"garbage")
+
+    assert load_eval_cases(jsonl_path, ["case_55"])[0].eval_id == "case_55"
+
+
+def test_missing_index_is_built(jsonl_path):
+    """Test that a missing index is created on first lookup."""
+    index_path(jsonl_path).unlink()
+
+    assert load_eval_cases(jsonl_path, ["case_1"])[0].eval_id == "case_1"
+    assert index_path(jsonl_path).exists()
+
+
+def test_selection_syntax(jsonl_path):
+    """Test the path and path:eval_id,eval_id selection forms."""
+    assert len(list(load_eval_selection(str(jsonl_path)))) == 50
+    selected = load_eval_selection(f"{jsonl_path}:case_2, case_3")
+    assert [c.eval_id for c in selected] == ["case_2", "case_3"]
+
+
+def test_convert_existing_eval_set(tmp_path):
+    """Test converting the repo's JSON eval set to JSONL."""
+    json_path = tmp_path / "set.test.json"
+    json_path.write_text(json.dumps(make_eval_set(3)))
+
+    jsonl_path = convert_eval_set_file(json_path)
+
+    assert jsonl_path.suffix == ".jsonl"
+    assert [c.eval_id for c in iter_eval_cases(jsonl_path)] == [
+        "case_0",
+        "case_1",
+        "case_2",
+    ]
+
+
+def test_empty_eval_set(tmp_path):
+    """Test that an eval set without cases can be indexed and queried."""
+    path = write_eval_set_jsonl(make_eval_set(0), tmp_path / "empty.jsonl")
+    build_index(path)
+
+    assert list(iter_eval_cases(path)) == []
+    with pytest.raises(KeyError):
+        load_eval_cases(path, ["case_0"])
@@ -1,6 +1,13 @@
+import asyncio
+
 import pytest
-from src.creation.get_tools import get_tools_from_agent
+from google.adk.agents import LlmAgent
+from google.adk.tools.base_toolset import BaseToolset
+
+from src.creation.get_tools import discover_tools, get_tools_from_agent
+from src.creation.tool_cache import ToolCache
 from src.models import AgentTools, ToolInfo
+from src.runner.tool_stubs import stub_tools
 from example_agent.agent import root_agent
 
 
@@ -132,3 +139,90 @@ def test_agent_tools_structure():
     assert agent_tools.agent_name == "test_agent"
     assert len(agent_tools.tools) == 1
     assert agent_tools.tools[0].name == "test_tool"
+
+
+class SlowToolset(BaseToolset):
+    """Toolset that takes a while to list its tools, like a remote server."""
+
+    def __init__(self, tools: list[ToolInfo]):
+        super().__init__()
+        self.tools = tools
+        self.calls = 0
+
+    async def get_tools(self, readonly_context=None):
+        self.calls += 1
+        await asyncio.sleep(0.2)
+        return stub_tools(self.tools)
+
+    async def close(self):
+        pass
+
+
+def get_weather(city: str) -> str:
+    """Get the weather in a city."""
+    return "sunny"
+
+
+@pytest.fixture
+def agent_tree():
+    time_toolset = SlowToolset(
+        [
+            ToolInfo(
+                name="get_current_time",
+                description="Get the current time",
+                parameters={
+                    "type": "object",
+                    "properties": {"timezone": {"type": "string"}},
+                    "required": ["timezone"],
+                },
+            ),
+            ToolInfo(name="convert_time", description="Convert a time"),
+        ]
+    )
+    search_toolset = SlowToolset([ToolInfo(name="search", description="Search")])
+    weather_agent = LlmAgent(
+        name="weather_agent", model="fake-model", tools=[get_weather, search_toolset]
+    )
+    return LlmAgent(
+        name="root_agent",
+        model="fake-model",
+        tools=[time_toolset],
+        sub_agents=[weather_agent],
+    )
+
+
+@pytest.mark.asyncio
+async def test_discover_tools_resolves_toolsets_and_sub_agents(agent_tree):
+    """Test that toolsets are expanded concurrently across the agent tree."""
+    start = asyncio.get_running_loop().time()
+    result = await discover_tools(agent_tree, use_cache=False)
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert result.agent_name == "root_agent"
+    assert [tool.name for tool in result.tools] == [
+        "get_current_time",
+        "convert_time",
+        "get_weather",
+        "search",
+    ]
+    assert result.tools[0].parameters["properties"]["timezone"]["type"] == "string"
+    assert result.tools[0].parameters["required"] == ["timezone"]
+    assert result.tools[2].description == "Get the weather in a city."
+    assert elapsed < 0.4
+
+
+@pytest.mark.asyncio
+async def test_discover_tools_is_cached_by_fingerprint(agent_tree, tmp_path):
+    """Test that an unchanged agent is not rediscovered, even by a new process."""
+    toolset = agent_tree.tools[0]
+    first = await discover_tools(agent_tree, cache=ToolCache(tmp_path))
+    second = await discover_tools(agent_tree, cache=ToolCache(tmp_path))
+    assert second == first
+    assert toolset.calls == 1
+
+    await discover_tools(agent_tree, cache=ToolCache(tmp_path), refresh=True)
+    assert toolset.calls == 2
+
+    changed = agent_tree.clone(update={"instruction": "Be brief."})
+    await discover_tools(changed, cache=ToolCache(tmp_path))
+    assert toolset.calls == 3
@@ -0,0 +1,178 @@
+import pytest
+
+from src.creation.incremental import (
+    ScenarioManifest,
+    ToolScenarios,
+    create_scenarios_incremental,
+    iter_scenario_batches_incremental,
+    plan_regeneration,
+    tool_fingerprint,
+)
+from src.models import Scenario, ScenarioList, ToolInfo
+
+
+def make_tool(name, description="A tool"):
+    return ToolInfo(name=name, description=description, parameters={"x": "string"})
+
+
+def fake_generate(calls):
+    """Return a generate function that records the tools it was called with."""
+
+    def generate(tools):
+        calls.append([tool.name for tool in tools])
+        return [
+            Scenario(
+                name=f"{tool.name}_scenario",
+                query=f"Use {tool.name} ({tool.description})",
+                why_its_suitable="Tests tool usage",
+                expected_tool_call=tool.name,
+            )
+            for tool in tools
+        ]
+
+    return generate
+
+
+@pytest.fixture
+def manifest_path(tmp_path):
+    return tmp_path / "manifest.json"
+
+
+def test_tool_fingerprint_covers_all_fields():
+    """Test that name, description and parameters all change the fingerprint."""
+    tool = make_tool("a")
+
+    assert tool_fingerprint(tool) == tool_fingerprint(make_tool("a"))
+    assert tool_fingerprint(tool) != tool_fingerprint(make_tool("b"))
+    assert tool_fingerprint(tool) != tool_fingerprint(make_tool("a", "Other"))
+    assert tool_fingerprint(tool) != tool_fingerprint(
+        tool.model_copy(update={"parameters": {"y": "int"}})
+    )
+
+
+def test_first_run_generates_every_tool(manifest_path):
+    """Test that an empty manifest generates scenarios for all tools."""
+    calls = []
+    scenarios = create_scenarios_incremental(
+        [make_tool("a"), make_tool("b")], manifest_path, fake_generate(calls)
+    )
+
+    assert calls == [["a", "b"]]
+    assert [s.name for s in scenarios] == ["a_scenario", "b_scenario"]
+    assert manifest_path.exists()
+
+
+def test_only_changed_and_added_tools_are_generated(manifest_path):
+    """Test that unchanged tools are reused and removed tools are dropped."""
+    create_scenarios_incremental(
+        [make_tool("a"), make_tool("b"), make_tool("c")],
+        manifest_path,
+        fake_generate([]),
+    )
+
+    calls = []
+    scenarios = create_scenarios_incremental(
+        [make_tool("a"), make_tool("b", "Changed"), make_tool("d")],
+        manifest_path,
+        fake_generate(calls),
+    )
+
+    assert calls == [["b", "d"]]
+    assert [s.query for s in scenarios] == [
+        "Use a (A tool)",
+        "Use b (Changed)",
+        "Use d (A tool)",
+    ]
+    manifest = ScenarioManifest.load(manifest_path)
+    assert sorted(e.tool.name for e in manifest.entries.values()) == ["a", "b", "d"]
+
+
+def test_unchanged_tools_make_no_calls(manifest_path):
+    """Test that rerunning with identical tools never calls the generator."""
+    tools = [make_tool("a"), make_tool("a")]
+    create_scenarios_incremental(tools, manifest_path, fake_generate([]))
+
+    calls = []
+    scenarios = create_scenarios_incremental(tools, manifest_path, fake_generate(calls))
+
+    assert calls == []
+    assert [s.name for s in scenarios] == ["a_scenario"]
+
+
+def test_generation_inputs_are_part_of_the_manifest_key(manifest_path):
+    """Test that a new model or scenario count regenerates every tool."""
+    tools = [make_tool("a"), make_tool("b")]
+    create_scenarios_incremental(tools, manifest_path, fake_generate([]))
+
+    calls = []
+    create_scenarios_incremental(
+        tools, manifest_path, fake_generate(calls), scenarios_per_tool=3
+    )
+    create_scenarios_incremental(tools, manifest_path, fake_generate(calls), model="m")
+
+    assert calls == [["a", "b"], ["a", "b"]]
+
+
+@pytest.mark.asyncio
+async def test_streaming_reuses_and_attributes_by_expected_tool(
+    manifest_path, mocker
+):
+    """Test that reused scenarios come first and new ones are filed per tool."""
+    create_scenarios_incremental([make_tool("a")], manifest_path, fake_generate([]))
+
+    async def generate(tools, num_scenarios):
+        names = [tool.name for tool in tools]
+        return ScenarioList(
+            scenarios=fake_generate([])(tools)
+            + [
+                Scenario(
+                    name=f"no_tool_{'_'.join(names)}",
+                    query="Just chat",
+                    why_its_suitable="Tests restraint",
+                    expected_tool_call=None,
+                )
+            ]
+        )
+
+    generate_mock = mocker.patch(
+        "src.creation.main._generate_scenarios", side_effect=generate
+    )
+    tools = [make_tool("a"), make_tool("b"), make_tool("c")]
+    batches = [
+        batch
+        async for batch in iter_scenario_batches_incremental(
+            tools, manifest_path, use_cache=False
+        )
+    ]
+
+    assert [[s.name for s in batch] for batch in batches] == [
+        ["a_scenario"],
+        ["b_scenario", "c_scenario", "no_tool_b_c"],
+    ]
+    assert generate_mock.call_count == 1
+    manifest = ScenarioManifest.load(manifest_path)
+    assert {
+        entry.tool.name: [s.name for s in entry.scenarios]
+        for entry in manifest.entries.values()
+    } == {
+        "a": ["a_scenario"],
+        "b": ["b_scenario", "no_tool_b_c"],
+        "c": ["c_scenario"],
+    }
+
+
+def test_plan_regeneration():
+    """Test the diff between a tool list and a manifest."""
+    manifest = ScenarioManifest()
+    old = make_tool("old")
+    kept = make_tool("kept")
+    for tool in (old, kept):
+        manifest.entries[tool_fingerprint(tool)] = ToolScenarios(
+            tool=tool, scenarios=[]
+        )
+
+    plan = plan_regeneration([kept, make_tool("new")], manifest)
+
+    assert [tool.name for tool in plan.to_generate] == ["new"]
+    assert plan.unchanged == [tool_fingerprint(kept)]
+    assert plan.removed == [tool_fingerprint(old)]
@@ -0,0 +1,53 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+HEAVY_PACKAGES = ["crewai", "litellm", "weave", "google.adk", "google.genai"]
+
+
+def imported_heavy_packages(module):
+    """Import a module in a fresh interpreter and list the heavy packages loaded."""
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-W",
+            "ignore",
+            "-c",
+            f"import json, sys; import {module}; "
+            f"print(json.dumps([m for m in {HEAVY_PACKAGES!r} if m in sys.modules]))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=PROJECT_ROOT,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["main", "example_agent.agent", "src.creation.main", "evaluation.eval_set_stream"],
+)
+def test_entry_points_import_no_heavy_dependencies(module):
+    """Test that importing an entry point does not load crewai, ADK, LiteLLM or Weave."""
+    assert imported_heavy_packages(module) == []
+
+
+def test_agent_is_built_on_first_access(monkeypatch):
+    """Test that root_agent is created lazily and then reused."""
+    import example_agent.agent as agent_module
+
+    built = []
+    monkeypatch.setattr(
+        agent_module, "create_root_agent", lambda: built.append(1) or object()
+    )
+    agent_module.get_root_agent.cache_clear()
+    try:
+        assert agent_module.root_agent is agent_module.root_agent
+        assert built == [1]
+    finally:
+        agent_module.get_root_agent.cache_clear()
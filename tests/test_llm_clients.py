@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from benchmarks.fakes import StubLLMServer
+from src.creation.llm import PooledLLM
+from src.llm_clients import ConnectionSettings, close_llm_clients, get_llm_client
+from src.runner.llm_client import PooledLiteLLMClient
+
+MODEL = "openai/stub-model"
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients(monkeypatch):
+    monkeypatch.setenv("MAGIC_EVAL_RATE_LIMIT", "off")
+    close_llm_clients()
+    yield
+    close_llm_clients()
+
+
+@pytest.fixture
+def server():
+    server = StubLLMServer()
+    yield server
+    server.close()
+
+
+def test_one_client_per_model_and_endpoint(monkeypatch):
+    """Test that the registry hands out one client per model and endpoint."""
+    monkeypatch.setenv("MAGIC_EVAL_LLM_MAX_CONNECTIONS", "8")
+    client = get_llm_client(MODEL, "http://localhost:1/v1", "key")
+
+    assert get_llm_client(MODEL, "http://localhost:1/v1", "key") is client
+    assert get_llm_client(MODEL, "http://localhost:2/v1", "key") is not client
+    assert client.settings == ConnectionSettings(
+        max_connections=8, max_keepalive_connections=8
+    )
+    sync_client = client.sync_client()
+    assert client.completion_kwargs(is_async=False) == {"client": sync_client}
+    assert str(sync_client.base_url) == "http://localhost:1/v1/"
+
+    # LiteLLM only takes an OpenAI client for OpenAI-compatible providers.
+    assert get_llm_client("anthropic/claude-model", api_key="key").sync_client() is None
+
+
+def test_async_clients_are_per_event_loop():
+    """Test that each event loop gets its own async client, reused within it."""
+    client = get_llm_client(MODEL, "http://localhost:1/v1", "key")
+
+    async def clients():
+        return client.async_client(), client.async_client()
+
+    first, again = asyncio.run(clients())
+    second, _ = asyncio.run(clients())
+
+    assert first is again
+    assert second is not first
+
+
+def test_agent_and_crew_calls_reuse_connections(server):
+    """Test that repeated calls from an agent and a crew stay on warm connections."""
+    lite_llm_client = PooledLiteLLMClient()
+
+    async def agent_calls():
+        for i in range(5):
+            response = await lite_llm_client.acompletion(
+                MODEL,
+                [{"role": "user", "content": f"question {i}"}],
+                None,
+                api_base=server.api_base,
+                api_key="test-key",
+            )
+            assert response.choices[0].message.content == "hi"
+
+    asyncio.run(agent_calls())
+    assert server.connections == 1
+
+    llm = PooledLLM(model=MODEL, base_url=server.api_base, api_key="test-key")
+    assert [llm.call("What time is it?") for _ in range(5)] == ["hi"] * 5
+
+    # The crew shares the model's pooled client, on its synchronous pool.
+    assert server.ok == 10
+    assert server.connections == 2
+
+
+def test_async_clients_close_with_their_event_loop():
+    """Test that an async client is closed, and forgotten, when its loop shuts down."""
+    client = get_llm_client(MODEL, "http://localhost:1/v1", "key")
+
+    async def open_client():
+        return client.async_client()
+
+    async_client = asyncio.run(open_client())
+
+    assert async_client.is_closed()
+    assert len(client._async_clients) == 0
@@ -0,0 +1,135 @@
+import asyncio
+import os
+import signal
+import sys
+
+import anyio
+import pytest
+from google.adk.tools.mcp_tool.mcp_session_manager import SseConnectionParams
+from mcp import StdioServerParameters
+
+from src.runner.mcp_pool import (
+    MCPServerPool,
+    PooledMCPToolset,
+    close_mcp_server_pools,
+    get_mcp_server_pool,
+)
+
+SERVER = '''
+import os
+
+from mcp.server.fastmcp import FastMCP
+
+server = FastMCP("pid")
+
+
+@server.tool()
+def pid() -> int:
+    """Return the server's process id."""
+    return os.getpid()
+
+
+server.run()
+'''
+
+
+@pytest.fixture
+def server_params(tmp_path):
+    script = tmp_path / "pid_server.py"
+    script.write_text(SERVER)
+    return StdioServerParameters(command=sys.executable, args=[str(script)])
+
+
+async def server_pid(session) -> int:
+    result = await session.call_tool("pid", {})
+    return int(result.content[0].text)
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_reused_round_robin(server_params):
+    """Test that calls share a fixed set of processes instead of spawning more."""
+    pool = MCPServerPool(server_params, size=2, health_check_interval=None)
+    try:
+        pids = [await server_pid(await pool.create_session()) for _ in range(6)]
+    finally:
+        await pool.close()
+
+    assert len(set(pids)) == 2
+    assert pids[:2] == pids[2:4] == pids[4:]
+    assert pool.restarts == 0
+    assert pool.healthy_count == 0
+
+
+@pytest.mark.asyncio
+async def test_crashed_server_is_restarted(server_params):
+    """Test that a killed server is replaced after a failed ping or tool call."""
+    pool = MCPServerPool(server_params, size=2, health_check_interval=None)
+    try:
+        first = await server_pid(await pool.create_session())
+        os.kill(first, signal.SIGKILL)
+        await asyncio.sleep(0.5)
+
+        assert await pool.check_health() == 1
+        assert pool.healthy_count == 2
+
+        session = await pool.create_session()
+        second = await server_pid(session)
+        os.kill(second, signal.SIGKILL)
+        await asyncio.sleep(0.5)
+        with pytest.raises(anyio.ClosedResourceError):
+            await server_pid(session)
+        assert pool.healthy_count == 1
+
+        pids = {await server_pid(await pool.create_session()) for _ in range(2)}
+    finally:
+        await pool.close()
+
+    assert not {first, second} & pids
+    assert len(pids) == 2
+    assert pool.restarts == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_start_stops_the_servers_that_started(server_params, mocker):
+    """Test that a pool whose server fails to start leaves no process behind."""
+    pool = MCPServerPool(server_params, size=2, health_check_interval=None)
+    started, failing = pool._slots
+    mocker.patch.object(failing, "start", side_effect=RuntimeError("no server"))
+    stop = mocker.spy(started, "stop")
+
+    with pytest.raises(RuntimeError, match="no server"):
+        await pool.start()
+
+    stop.assert_awaited()
+    assert pool.healthy_count == 0
+    assert started.session is None
+
+
+@pytest.mark.asyncio
+async def test_toolsets_share_the_pool(server_params):
+    """Test that toolsets with the same server use the same pooled processes."""
+    toolsets = [
+        PooledMCPToolset(connection_params=server_params, pool_size=1)
+        for _ in range(2)
+    ]
+    try:
+        tools = [await toolset.get_tools() for toolset in toolsets]
+        results = await asyncio.gather(
+            *(t[0].run_async(args={}, tool_context=None) for t in tools * 3)
+        )
+        for toolset in toolsets:
+            await toolset.close()
+        pool = get_mcp_server_pool(server_params, size=1)
+        assert pool is toolsets[0].pool is toolsets[1].pool
+        assert pool.healthy_count == 1
+    finally:
+        await close_mcp_server_pools()
+
+    assert len({result.content[0].text for result in results}) == 1
+    assert pool.healthy_count == 0
+
+
+def test_only_stdio_connections_are_pooled():
+    """Test that remote connection parameters are rejected."""
+    with pytest.raises(ValueError):
+        MCPServerPool(SseConnectionParams(url="http://localhost:1/sse"))
@@ -0,0 +1,218 @@
+import asyncio
+
+import pytest
+
+from src.models import Scenario, ScenarioResult
+from src.pipeline import AutoAcceptReviewer, Reviewer, run_pipeline
+from src.runner.prioritization import ScenarioHistory
+
+
+WORDS = "alpha bravo charlie delta echo foxtrot golf hotel india juliet kilo lima".split()
+
+
+def make_scenario(i, tool="get_current_time", query=None):
+    words = [f"{word}{i}" for word in WORDS]
+    return Scenario(
+        name=f"scenario_{i}",
+        query=query if query is not None else " ".join(words),
+        why_its_suitable="Tests the pipeline",
+        expected_tool_call=tool,
+    )
+
+
+def make_result(scenario, passed=True):
+    return ScenarioResult(
+        scenario_name=scenario.name,
+        expected_tool_call=scenario.expected_tool_call,
+        passed=passed,
+        latency_seconds=0.0,
+        event_count=1,
+    )
+
+
+async def batches_of(scenarios, size=2, produced=None):
+    for start in range(0, len(scenarios), size):
+        batch = scenarios[start : start + size]
+        if produced is not None:
+            produced.extend(batch)
+        yield batch
+
+
+class GatedReviewer(Reviewer):
+    """Accepts everything, but holds scenario ``gate_at`` until released."""
+
+    def __init__(self, gate_at):
+        self.gate_at = gate_at
+        self.reached = asyncio.Event()
+        self.release = asyncio.Event()
+        self.reviewed = 0
+
+    async def review(self, scenario):
+        if self.reviewed == self.gate_at:
+            self.reached.set()
+            await self.release.wait()
+        self.reviewed += 1
+        return True
+
+
+@pytest.fixture
+def agent(mocker):
+    agent = mocker.MagicMock()
+    agent.name = "test_agent"
+    return agent
+
+
+@pytest.fixture
+def ran(mocker):
+    ran = []
+
+    async def fake_run_scenario(scenario, agent, **kwargs):
+        ran.append(scenario.name)
+        return make_result(scenario, passed=scenario.query != "fail")
+
+    mocker.patch("src.pipeline.run_scenario", side_effect=fake_run_scenario)
+    return ran
+
+
+@pytest.mark.asyncio
+async def test_accepted_scenarios_run_while_review_continues(agent, ran):
+    """Test that earlier scenarios run while a later one is still under review."""
+    scenarios = [make_scenario(i) for i in range(6)]
+    reviewer = GatedReviewer(gate_at=4)
+
+    pipeline = asyncio.create_task(
+        run_pipeline(
+            batches_of(scenarios),
+            agent,
+            reviewer,
+            max_concurrency=2,
+            deduplicate=False,
+        )
+    )
+    await asyncio.wait_for(reviewer.reached.wait(), timeout=5)
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert sorted(ran) == [f"scenario_{i}" for i in range(4)]
+
+    reviewer.release.set()
+    outcome = await asyncio.wait_for(pipeline, timeout=5)
+    assert [s.name for s in outcome.accepted] == [s.name for s in scenarios]
+    assert [r.scenario_name for r in outcome.results] == [s.name for s in scenarios]
+
+
+@pytest.mark.asyncio
+async def test_auto_accept_rules_and_deduplication(agent, ran):
+    """Test that rule-based review and streaming dedup filter what runs."""
+    scenarios = [
+        make_scenario(0),
+        make_scenario(1, tool="no_such_tool"),
+        make_scenario(2, query="   "),
+        make_scenario(3, tool=None),
+        make_scenario(0).model_copy(update={"name": "copy_of_0"}),
+    ]
+    reviewer = AutoAcceptReviewer(
+        ["get_current_time"],
+        rules=[lambda s: "no tool" if s.expected_tool_call is None else None],
+    )
+
+    outcome = await run_pipeline(batches_of(scenarios), agent, reviewer)
+
+    assert sorted(ran) == ["scenario_0"]
+    assert outcome.duplicates == 1
+    assert reviewer.rejections == {
+        "scenario_1": "expects unknown tool 'no_such_tool'",
+        "scenario_2": "empty query",
+        "scenario_3": "no tool",
+    }
+    assert [s.name for s in outcome.rejected] == [
+        "scenario_1",
+        "scenario_2",
+        "scenario_3",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bounded_queues_hold_back_generation(agent, ran):
+    """Test that generation stops a queue's length ahead of a stalled review."""
+    scenarios = [make_scenario(i) for i in range(40)]
+    produced = []
+    reviewer = GatedReviewer(gate_at=0)
+
+    pipeline = asyncio.create_task(
+        run_pipeline(
+            batches_of(scenarios, size=1, produced=produced),
+            agent,
+            reviewer,
+            queue_size=3,
+            deduplicate=False,
+        )
+    )
+    await asyncio.wait_for(reviewer.reached.wait(), timeout=5)
+    for _ in range(10):
+        await asyncio.sleep(0)
+    # One scenario under review, three queued, one waiting to be queued.
+    assert len(produced) == 5
+
+    reviewer.release.set()
+    outcome = await asyncio.wait_for(pipeline, timeout=5)
+    assert len(produced) == len(outcome.accepted) == 40
+
+
+@pytest.mark.asyncio
+async def test_fail_fast_stops_the_pipeline(agent, ran):
+    """Test that a failure stops generation, review and idle workers cleanly."""
+    scenarios = [make_scenario(i) for i in range(20)]
+    scenarios[1] = make_scenario(1, query="fail")
+
+    outcome = await asyncio.wait_for(
+        run_pipeline(
+            batches_of(scenarios, size=1),
+            agent,
+            AutoAcceptReviewer(),
+            max_concurrency=1,
+            queue_size=1,
+            deduplicate=False,
+            fail_fast=True,
+        ),
+        timeout=5,
+    )
+
+    assert ran == ["scenario_0", "scenario_1"]
+    assert outcome.results[1].passed is False
+    assert all(result is None for result in outcome.results[2:])
+
+
+@pytest.mark.asyncio
+async def test_waiting_scenarios_start_failures_first(agent, ran):
+    """Test that the run queue starts recently failed, then flaky scenarios first."""
+    scenarios = [make_scenario(i) for i in range(6)]
+    history = ScenarioHistory()
+    history.record(
+        [scenarios[2], scenarios[4]],
+        [make_result(scenarios[2]), make_result(scenarios[4], passed=False)],
+    )
+    history.record([scenarios[2]], [make_result(scenarios[2], passed=False)])
+    history.record([scenarios[2]], [make_result(scenarios[2])])
+
+    # Auto-accepting one batch queues every scenario before the single
+    # worker picks the first one.
+    await asyncio.wait_for(
+        run_pipeline(
+            batches_of(scenarios, size=6),
+            agent,
+            AutoAcceptReviewer(),
+            max_concurrency=1,
+            deduplicate=False,
+            history=history,
+        ),
+        timeout=5,
+    )
+
+    assert ran == [
+        "scenario_4",
+        "scenario_2",
+        "scenario_0",
+        "scenario_1",
+        "scenario_3",
+        "scenario_5",
+    ]
@@ -0,0 +1,76 @@
+import pytest
+
+from src.models import ResultProvenance, Scenario, ScenarioResult
+from src.runner.prioritization import ScenarioHistory, prioritize
+
+
+def scenario(name: str) -> Scenario:
+    return Scenario(
+        name=name,
+        query=f"query for {name}",
+        why_its_suitable="Tests prioritization",
+        expected_tool_call="get_current_time",
+    )
+
+
+def result(name: str, passed: bool, latency: float = 1.0) -> ScenarioResult:
+    return ScenarioResult(
+        scenario_name=name, passed=passed, latency_seconds=latency, event_count=1
+    )
+
+
+@pytest.fixture
+def history(mocker):
+    """History of five scenarios over three runs."""
+    history = ScenarioHistory()
+    scenarios = [scenario(name) for name in ("fast", "slow", "flaky", "old", "new")]
+    runs = [
+        {"fast": (True, 1), "slow": (True, 5), "flaky": (True, 1), "old": (False, 1)},
+        {"fast": (True, 1), "slow": (True, 7), "flaky": (False, 1), "old": (True, 1)},
+        {"fast": (True, 1), "slow": (True, 6), "flaky": (True, 1), "new": (False, 1)},
+    ]
+    clock = mocker.patch("src.runner.prioritization.time.time")
+    for at, run in enumerate(runs):
+        clock.return_value = float(at)
+        history.record(
+            scenarios,
+            [result(s.name, *run[s.name]) if s.name in run else None for s in scenarios],
+        )
+    return history
+
+
+def test_history_records_runs(history):
+    """Test that runs, failures, flips and mean latency are tracked."""
+    slow = history.get(scenario("slow"))
+    flaky = history.get(scenario("flaky"))
+
+    assert (slow.runs, slow.failures, slow.mean_latency_seconds) == (3, 0, 6.0)
+    assert (flaky.failures, flaky.flips, flaky.flip_rate) == (1, 2, 1.0)
+    assert history.get(scenario("never_ran")) is None
+
+
+def test_prioritize_failed_flaky_slow_then_rest(history, tmp_path):
+    """Test the failure-first order, and that it survives a save and load."""
+    history.save(tmp_path / "history.json")
+    history = ScenarioHistory.load(tmp_path / "history.json")
+    suite = [scenario(name) for name in ("unseen", "fast", "flaky", "slow", "old", "new")]
+
+    ordered = [s.name for s in prioritize(suite, history)]
+
+    assert ordered == ["new", "flaky", "old", "slow", "fast", "unseen"]
+
+
+def test_cached_and_skipped_results_are_not_recorded():
+    """Test that results reused from the cache don't count as runs."""
+    history = ScenarioHistory()
+    cached = result("a", False).model_copy(
+        update={
+            "provenance": ResultProvenance(
+                cache_key="k", run_id="r", host="h", recorded_at=0.0
+            )
+        }
+    )
+
+    history.record([scenario("a"), scenario("b")], [cached, None])
+
+    assert history.entries == {}
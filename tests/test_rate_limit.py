@@ -0,0 +1,129 @@
+import asyncio
+import time
+
+import pytest
+
+from benchmarks.fakes import StubLLMServer
+from src.creation.llm import RateLimitedLLM
+from src.rate_limit import (
+    RateLimitPolicy,
+    TokenBucket,
+    get_rate_limiter,
+    reset_rate_limiters,
+)
+from src.runner.llm_client import RateLimitedLiteLLMClient
+
+MODEL = "openai/mock-model"
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiters(monkeypatch):
+    monkeypatch.delenv("MAGIC_EVAL_RATE_LIMIT", raising=False)
+    reset_rate_limiters()
+    yield
+    reset_rate_limiters()
+
+
+@pytest.fixture
+def server():
+    server = StubLLMServer(capacity=4, latency=0.05)
+    yield server
+    server.close()
+
+
+def test_token_bucket_spaces_requests_and_pauses():
+    """Test the burst, the refill rate and that a pause empties the bucket."""
+    bucket = TokenBucket(requests_per_minute=600, burst=2)
+
+    assert bucket.try_take() == 0
+    assert bucket.try_take() == 0
+    assert 0.05 < bucket.try_take() <= 0.1
+
+    bucket.pause(1.0)
+    assert 0.9 < bucket.try_take() <= 1.0
+
+
+def test_limit_grows_additively_and_halves_once_per_window():
+    """Test AIMD: a burst of 429s cuts the limit once, successes grow it back."""
+    policy = RateLimitPolicy(initial_concurrency=8, max_concurrency=10, burst=100)
+    limiter = get_rate_limiter(MODEL, policy)
+
+    windows = [limiter.acquire() for _ in range(8)]
+    for window in windows:
+        limiter.release(window, 0.1, throttled=True)
+    assert limiter.limit == 4
+    assert limiter.decreases == 1
+
+    # One more slot per window of successful calls, up to the maximum.
+    for _ in range(5):
+        limiter.release(limiter.acquire(), 0.1)
+    assert limiter.limit == 5
+    for _ in range(100):
+        limiter.release(limiter.acquire(), 0.1)
+    assert limiter.limit == 10
+
+    slow = RateLimitPolicy(initial_concurrency=2, latency_target_seconds=1.0)
+    slow_limiter = get_rate_limiter("openai/slow-model", slow)
+    slow_limiter.release(slow_limiter.acquire(), 5.0)
+    slow_limiter.release(slow_limiter.acquire(), 5.0)
+    assert slow_limiter.limit == 1
+
+
+def test_limiters_are_shared_per_model_and_provider(monkeypatch):
+    """Test the registry: one limiter per model, one bucket per provider."""
+    limiter = get_rate_limiter("meta_llama/model-a")
+
+    assert get_rate_limiter("meta_llama/model-a") is limiter
+    other_model = get_rate_limiter("meta_llama/model-b")
+    assert other_model is not limiter
+    assert other_model.bucket is limiter.bucket
+    assert get_rate_limiter("openai/model-a").bucket is not limiter.bucket
+
+    monkeypatch.setenv("MAGIC_EVAL_RATE_LIMIT", "off")
+    assert get_rate_limiter("meta_llama/model-a") is None
+
+
+@pytest.mark.asyncio
+async def test_agent_calls_adapt_to_a_throttling_endpoint(server):
+    """Test that concurrent calls all succeed against an endpoint that 429s
+    above its quota, with the limit settling near the quota."""
+    policy = RateLimitPolicy(
+        requests_per_minute=60_000, burst=100, initial_concurrency=8, max_concurrency=32
+    )
+    limiter = get_rate_limiter(MODEL, policy)
+    client = RateLimitedLiteLLMClient()
+
+    responses = await asyncio.gather(
+        *[
+            client.acompletion(
+                MODEL,
+                [{"role": "user", "content": f"question {i}"}],
+                None,
+                api_base=server.api_base,
+                api_key="test-key",
+            )
+            for i in range(60)
+        ]
+    )
+
+    assert [r.choices[0].message.content for r in responses] == ["hi"] * 60
+    assert server.ok == 60
+    assert limiter.throttled == server.throttled > 0
+    # Cut once per window rather than once per 429, and never to the floor.
+    assert limiter.decreases < server.throttled
+    assert 2 <= limiter.limit <= 2 * server.capacity
+    assert limiter.in_flight == 0
+
+
+def test_crew_llm_retries_after_retry_after(server):
+    """Test that the scenario crew's LLM honors Retry-After and retries."""
+    server.fail_next = 2
+    llm = RateLimitedLLM(model=MODEL, base_url=server.api_base, api_key="test-key")
+    limiter = get_rate_limiter(MODEL)
+
+    start = time.monotonic()
+    assert llm.call("What time is it?") == "hi"
+
+    assert limiter.throttled == 2
+    assert server.ok == 1
+    assert time.monotonic() - start >= 0.1
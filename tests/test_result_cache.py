@@ -0,0 +1,113 @@
+import os
+import time
+
+import pytest
+from google.adk.agents import LlmAgent
+
+from src.fingerprint import agent_fingerprint
+from src.models import Scenario, ScenarioResult
+from src.runner.result_cache import ResultCache, result_key, scenario_hash
+from src.runner.scenario_runner import run_scenarios_concurrently
+
+
+def scenario(name: str, query: str = "What time is it?") -> Scenario:
+    return Scenario(
+        name=name,
+        query=query,
+        why_its_suitable="Tests tool usage",
+        expected_tool_call="get_current_time",
+    )
+
+
+def result(name: str, passed: bool = True) -> ScenarioResult:
+    return ScenarioResult(
+        scenario_name=name,
+        expected_tool_call="get_current_time",
+        passed=passed,
+        latency_seconds=1.5,
+        event_count=3,
+        tool_calls=["get_current_time"],
+    )
+
+
+@pytest.fixture
+def agent():
+    return LlmAgent(name="time_agent", model="fake-model", instruction="Be helpful.")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(tmp_path / "results", run_id="run-1")
+
+
+def test_result_key_changes_with_agent_and_scenario():
+    """Test that only the verdict-relevant inputs change the key."""
+    base = result_key("agent", scenario("a"))
+
+    assert result_key("agent", scenario("renamed")) == base
+    assert result_key("other_agent", scenario("a")) != base
+    assert result_key("agent", scenario("a", query="Time in Paris?")) != base
+    changed = scenario("a").model_copy(update={"expected_tool_call": None})
+    assert scenario_hash(changed) != scenario_hash(scenario("a"))
+
+
+def test_cached_results_carry_provenance(agent, cache, tmp_path):
+    """Test round trips, provenance, and that failures are not cached."""
+    assert cache.put(agent, scenario("a"), result("a"))
+    assert not cache.put(agent, scenario("b", "Hi"), result("b", passed=False))
+
+    # Another worker sharing the directory sees the entry.
+    cached = ResultCache(tmp_path / "results").get(agent, scenario("renamed"))
+    assert cached.passed is True
+    assert cached.scenario_name == "renamed"
+    assert cached.latency_seconds == 1.5
+    assert cached.provenance.run_id == "run-1"
+    assert cached.provenance.cache_key == result_key(
+        agent_fingerprint(agent), scenario("a")
+    )
+    assert cache.get(agent, scenario("b", "Hi")) is None
+
+    changed_agent = agent.clone(update={"instruction": "Be brief."})
+    assert cache.get(changed_agent, scenario("a")) is None
+
+
+def test_ttl_and_eviction(agent, tmp_path):
+    """Test that old entries are misses and the size limit evicts LRU entries."""
+    cache = ResultCache(tmp_path, max_entries=2, max_age_seconds=60)
+    fingerprint = agent_fingerprint(agent)
+    now = time.time()
+    for i in range(3):
+        cache.put(agent, scenario(f"s{i}", f"query {i}"), result(f"s{i}"))
+        path = tmp_path / f"{result_key(fingerprint, scenario('s', f'query {i}'))}.json"
+        os.utime(path, (now - 10 + i, now - 10 + i))
+
+    assert cache.evict() == 1
+    assert cache.get(agent, scenario("s0", "query 0")) is None
+    assert cache.get(agent, scenario("s2", "query 2")) is not None
+
+    expired = ResultCache(tmp_path, max_age_seconds=0)
+    assert expired.get(agent, scenario("s2", "query 2")) is None
+
+
+@pytest.mark.asyncio
+async def test_only_uncached_scenarios_run(agent, cache, mocker):
+    """Test that cached scenarios are reported without running the agent."""
+
+    async def fake_run_scenario(scenario, agent, **kwargs):
+        return result(scenario.name, passed=scenario.name != "failing")
+
+    run = mocker.patch(
+        "src.runner.scenario_runner.run_scenario", side_effect=fake_run_scenario
+    )
+    scenarios = [scenario("a", "q1"), scenario("failing", "q2"), scenario("c", "q3")]
+
+    first = await run_scenarios_concurrently(scenarios, agent, result_cache=cache)
+    second = await run_scenarios_concurrently(scenarios, agent, result_cache=cache)
+
+    assert run.call_count == 4
+    assert [r.provenance is None for r in first] == [True, True, True]
+    assert [r.provenance is not None for r in second] == [True, False, True]
+    assert [r.scenario_name for r in second] == ["a", "failing", "c"]
+
+    await run_scenarios_concurrently(scenarios, agent, result_cache=cache, refresh=True)
+    assert run.call_count == 7
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from src.models import ScenarioResult
+from src.runner.results_table import NO_TOOL, ResultsTable
+
+
+def make_result(name, expected, passed, latency=0.1, tool_calls=(), tokens=(0, 0)):
+    return ScenarioResult(
+        scenario_name=name,
+        expected_tool_call=expected,
+        passed=passed,
+        latency_seconds=latency,
+        event_count=len(tool_calls) + 1,
+        tool_calls=list(tool_calls),
+        input_tokens=tokens[0],
+        output_tokens=tokens[1],
+    )
+
+
+@pytest.fixture
+def results():
+    return [
+        make_result("time_ok", "get_time", True, 0.1, ["get_time"], (100, 10)),
+        make_result("time_late", "get_time", True, 0.2, ["search", "get_time"]),
+        make_result("time_wrong", "get_time", False, 0.3, ["search"]),
+        make_result("chat_ok", None, True, 0.4, [], (50, 5)),
+        make_result("chat_tool", None, False, 0.5, ["get_time"]),
+    ]
+
+
+def test_append_grows_past_capacity(results):
+    """Test that rows can be appended one at a time beyond the initial capacity."""
+    table = ResultsTable(capacity=1)
+    for result in results * 3:
+        table.append(result)
+
+    assert len(table) == 15
+    assert table.row(7) == results[2]
+    assert table.row(-1) == results[-1]
+    assert table.scenario_names[:2] == ["time_ok", "time_late"]
+
+
+def test_aggregations(results):
+    """Test pass rate, per-tool pass rate, tokens and latency percentiles."""
+    table = ResultsTable.from_results(results)
+
+    assert table.pass_rate() == pytest.approx(0.6)
+    assert table.pass_rate_by_tool() == pytest.approx(
+        {"get_time": 2 / 3, NO_TOOL: 0.5}
+    )
+    assert table.token_totals() == (150, 15)
+    percentiles = table.latency_percentiles((50, 100))
+    assert percentiles == pytest.approx({50: 0.3, 100: 0.5})
+
+
+def test_confusion_matrix(results):
+    """Test that rows are expected tools and columns the tool actually called."""
+    labels, matrix = ResultsTable.from_results(results).confusion_matrix()
+
+    assert labels == [NO_TOOL, "get_time", "search"]
+    np.testing.assert_array_equal(matrix, [[1, 1, 0], [0, 2, 1], [0, 0, 0]])
+
+
+def test_empty_table():
+    """Test that aggregations on an empty table do not fail."""
+    table = ResultsTable()
+
+    assert np.isnan(table.pass_rate())
+    assert np.isnan(table.latency_percentiles((50,))[50])
+    assert table.confusion_matrix()[1].tolist() == [[0]]
+    with pytest.raises(IndexError):
+        table.row(0)
+
+
+def test_save_and_load_round_trip(results, tmp_path):
+    """Test that a saved table loads back with every row intact and stays appendable."""
+    path = ResultsTable.from_results(results).save(tmp_path / "results.npz")
+
+    loaded = ResultsTable.load(path)
+    assert [loaded.row(i) for i in range(len(loaded))] == results
+
+    loaded.append(make_result("new", "lookup", True, tool_calls=["lookup"]))
+    assert loaded.row(-1).tool_calls == ["lookup"]
+    assert loaded.confusion_matrix()[0][-1] == "lookup"
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+from google.adk.agents import BaseAgent
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from src.runner.runner_pool import DisposableSessionService, RunnerPool
+from src.runner.scenario_runner import call_agent_async, stream_agent_events
+
+
+class EchoAgent(BaseAgent):
+    """Agent that replies with one text event without calling an LLM."""
+
+    async def _run_async_impl(self, ctx):
+        await asyncio.sleep(0)
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            content=types.Content(role="model", parts=[types.Part(text="ok")]),
+        )
+
+
+@pytest.fixture
+def agent():
+    return EchoAgent(name="echo_agent")
+
+
+def test_get_runner_is_cached_per_agent_and_app(agent):
+    """Test that the same runner is returned for the same agent and app name."""
+    pool = RunnerPool()
+
+    assert pool.get_runner(agent, "app") is pool.get_runner(agent, "app")
+    assert pool.get_runner(agent, "app") is not pool.get_runner(agent, "other_app")
+    assert pool.runner_count == 2
+
+
+@pytest.mark.asyncio
+async def test_disposable_sessions_are_appended_once_and_dropped():
+    """Test that events land once in a disposable session and nothing is left."""
+    service = DisposableSessionService()
+    session = await service.create_session(
+        app_name="app", user_id="user", session_id="session"
+    )
+    event = Event(
+        author="user",
+        actions=EventActions(state_delta={"user:name": "Ada", "step": 1}),
+    )
+
+    await service.append_event(session, event)
+    fetched = await service.get_session(
+        app_name="app", user_id="user", session_id="session"
+    )
+    assert fetched.events == [event]
+    assert fetched.state["step"] == 1
+
+    await service.delete_session(app_name="app", user_id="user", session_id="session")
+    assert service.sessions == {}
+    assert service.user_state == {"app": {"user": {"name": "Ada"}}}
+
+
+async def stored_sessions(pool, app_name="app", user_id="user"):
+    response = await pool.session_service.list_sessions(
+        app_name=app_name, user_id=user_id
+    )
+    return response.sessions
+
+
+@pytest.mark.asyncio
+async def test_call_agent_async_uses_pool_and_cleans_up(agent):
+    """Test that pooled calls return events and leave no sessions behind."""
+    pool = RunnerPool()
+
+    for i in range(3):
+        events = await call_agent_async(
+            agent, "hi", "user", f"session-{i}", "app", runner_pool=pool
+        )
+        assert len(events) == 1
+
+    assert pool.runner_count == 1
+    assert pool.live_session_count == 0
+    assert await stored_sessions(pool) == []
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_with_same_session_id(agent):
+    """Test that overlapping calls with the same session id don't collide."""
+    pool = RunnerPool()
+
+    results = await asyncio.gather(
+        *(
+            call_agent_async(agent, "hi", "user", "same", "app", runner_pool=pool)
+            for _ in range(5)
+        )
+    )
+
+    assert [len(events) for events in results] == [1] * 5
+    assert pool.live_session_count == 0
+
+
+@pytest.mark.asyncio
+async def test_session_is_deleted_when_call_fails(agent):
+    """Test that a session is cleaned up even if the agent call raises."""
+    pool = RunnerPool()
+
+    with pytest.raises(RuntimeError):
+        async with pool.session(agent, "app", "user", "session"):
+            assert pool.live_session_count == 1
+            raise RuntimeError("boom")
+
+    assert pool.live_session_count == 0
+    assert await stored_sessions(pool) == []
+
+
+@pytest.mark.asyncio
+async def test_closing_stream_early_releases_session(agent):
+    """Test that abandoning a streamed agent turn still cleans up the session."""
+    pool = RunnerPool()
+    events = stream_agent_events(agent, "hi", "user", "session", "app", pool)
+
+    await anext(events)
+    assert pool.live_session_count == 1
+    await events.aclose()
+
+    assert pool.live_session_count == 0
@@ -0,0 +1,164 @@
+import os
+import time
+
+import pytest
+
+from src.creation.main import create_scenarios
+from src.creation.scenario_cache import (
+    CONFIG_DIR,
+    CacheEntry,
+    ScenarioCache,
+    generation_key,
+)
+from src.models import Scenario, ScenarioList, ToolInfo
+
+
+@pytest.fixture
+def tools():
+    return [
+        ToolInfo(
+            name="get_current_time",
+            description="Get the current time",
+            parameters={"timezone": "string"},
+        )
+    ]
+
+
+@pytest.fixture
+def scenario_list():
+    return ScenarioList(
+        scenarios=[
+            Scenario(
+                name="time_query",
+                query="What time is it?",
+                why_its_suitable="Tests tool usage",
+                expected_tool_call="get_current_time",
+            )
+        ]
+    )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ScenarioCache(tmp_path / "scenarios")
+
+
+def test_generation_key_is_stable(tools):
+    """Test that identical inputs hash to the same key."""
+    assert generation_key(tools, "model") == generation_key(list(tools), "model")
+
+
+def test_generation_key_changes_with_inputs(tools, tmp_path):
+    """Test that tools, model and prompt config all change the key."""
+    base = generation_key(tools, "model")
+    changed_tool = [tools[0].model_copy(update={"description": "Other"})]
+
+    assert generation_key(changed_tool, "model") != base
+    assert generation_key(tools, "other_model") != base
+
+    for name in ("agents.yaml", "tasks.yaml"):
+        (tmp_path / name).write_bytes((CONFIG_DIR / name).read_bytes())
+    assert generation_key(tools, "model", tmp_path) == base
+    (tmp_path / "tasks.yaml").write_text("changed")
+    assert generation_key(tools, "model", tmp_path) != base
+
+
+def test_cache_round_trip(cache, scenario_list):
+    """Test that a stored entry is returned on the next lookup."""
+    assert cache.get("key") is None
+    cache.put("key", "model", scenario_list)
+
+    assert cache.get("key") == scenario_list
+
+
+def test_cache_expires_old_entries(tmp_path, scenario_list):
+    """Test that entries older than max_age_seconds are misses."""
+    cache = ScenarioCache(tmp_path, max_age_seconds=60)
+    path = tmp_path / "key.json"
+    entry = CacheEntry(
+        key="key",
+        model="model",
+        created_at=time.time() - 120,
+        scenario_list=scenario_list,
+    )
+    path.write_text(entry.model_dump_json())
+
+    assert cache.get("key") is None
+    assert not path.exists()
+
+
+def test_cache_evicts_least_recently_used(tmp_path, scenario_list):
+    """Test that the entry limit evicts the least recently used entry."""
+    cache = ScenarioCache(tmp_path, max_entries=2)
+    cache.put("a", "model", scenario_list)
+    cache.put("b", "model", scenario_list)
+    old = time.time() - 100
+    os.utime(tmp_path / "a.json", (old, old))
+    os.utime(tmp_path / "b.json", (old + 1, old + 1))
+    cache.get("a")
+
+    cache.put("c", "model", scenario_list)
+
+    assert sorted(p.stem for p in tmp_path.glob("*.json")) == ["a", "c"]
+
+
+def test_cache_evicts_by_size(tmp_path, scenario_list):
+    """Test that the byte limit keeps the cache under max_bytes."""
+    cache = ScenarioCache(tmp_path, max_bytes=1)
+    cache.put("a", "model", scenario_list)
+
+    assert list(tmp_path.glob("*.json")) == []
+
+
+def test_corrupt_entry_is_a_miss(cache, scenario_list):
+    """Test that an unreadable entry is dropped instead of raising."""
+    cache.put("key", "model", scenario_list)
+    (cache.directory / "key.json").write_text("{not json")
+
+    assert cache.get("key") is None
+
+
+class TestCreateScenariosCaching:
+    """Test cases for the cache integration in create_scenarios."""
+
+    @pytest.fixture
+    def mock_crew(self, mocker, scenario_list):
+        """Patch the crew so kickoff_async returns scenario_list."""
+        crew_class = mocker.patch("src.creation.main.Scenario_Eval_Crew")
+        kickoff = mocker.AsyncMock()
+        kickoff.return_value.json_dict = scenario_list.model_dump()
+        crew_class.return_value.crew.return_value.kickoff_async = kickoff
+        return kickoff
+
+    def test_second_call_hits_cache(self, mock_crew, tools, cache, scenario_list):
+        """Test that unchanged inputs only run the crew once."""
+        first = create_scenarios(tools, cache=cache)
+        second = create_scenarios(tools, cache=cache)
+
+        assert first == second == scenario_list.scenarios
+        assert mock_crew.call_count == 1
+
+    def test_refresh_regenerates(self, mock_crew, tools, cache):
+        """Test that refresh=True runs the crew despite a cached entry."""
+        create_scenarios(tools, cache=cache)
+        create_scenarios(tools, cache=cache, refresh=True)
+
+        assert mock_crew.call_count == 2
+
+    def test_bypass_cache(self, mock_crew, tools, cache):
+        """Test that use_cache=False neither reads nor writes the cache."""
+        create_scenarios(tools, use_cache=False, cache=cache)
+        create_scenarios(tools, use_cache=False, cache=cache)
+
+        assert mock_crew.call_count == 2
+        assert not cache.directory.exists()
+
+    def test_env_disables_cache(self, mock_crew, tools, monkeypatch, tmp_path):
+        """Test that MAGIC_EVAL_SCENARIO_CACHE=off bypasses the default cache."""
+        monkeypatch.setenv("MAGIC_EVAL_CACHE_DIR", str(tmp_path))
+        monkeypatch.setenv("MAGIC_EVAL_SCENARIO_CACHE", "off")
+        create_scenarios(tools)
+        create_scenarios(tools)
+
+        assert mock_crew.call_count == 2
+        assert list(tmp_path.iterdir()) == []
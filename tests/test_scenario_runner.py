@@ -1,6 +1,15 @@
+import asyncio
+
 import pytest
-from src.runner.scenario_runner import call_agent_async, run_scenario
-from src.models import Scenario
+from google.genai import types
+from src.runner.scenario_runner import (
+    call_agent_async,
+    early_verdict,
+    final_verdict,
+    run_scenario,
+    run_scenarios_concurrently,
+)
+from src.models import Scenario, ScenarioResult
 from example_agent.agent import root_agent
 
 
@@ -67,7 +76,7 @@ class TestRunScenario:
         )
         result = await run_scenario(scenario_no_tool_expected, mock_agent)
 
-        assert result is True
+        assert result.passed is True
 
     @pytest.mark.asyncio
     async def test_run_scenario_no_tool_expected_but_calls_made(
@@ -82,7 +91,7 @@ class TestRunScenario:
         )
         result = await run_scenario(scenario_no_tool_expected, mock_agent)
 
-        assert result is False
+        assert result.passed is False
 
     @pytest.mark.asyncio
     async def test_run_scenario_tool_expected_and_called(
@@ -97,7 +106,7 @@ class TestRunScenario:
         )
         result = await run_scenario(scenario_with_tool_expected, mock_agent)
 
-        assert result is True
+        assert result.passed is True
 
     @pytest.mark.asyncio
     async def test_run_scenario_tool_expected_but_not_called(
@@ -112,7 +121,7 @@ class TestRunScenario:
         )
         result = await run_scenario(scenario_with_tool_expected, mock_agent)
 
-        assert result is False
+        assert result.passed is False
 
     @pytest.mark.asyncio
     async def test_run_scenario_tool_expected_different_tool_called(
@@ -127,7 +136,7 @@ class TestRunScenario:
         )
         result = await run_scenario(scenario_with_tool_expected, mock_agent)
 
-        assert result is False
+        assert result.passed is False
 
     @pytest.mark.asyncio
     async def test_run_scenario_multiple_events_with_function_calls(
@@ -146,7 +155,7 @@ class TestRunScenario:
         )
         result = await run_scenario(scenario_with_tool_expected, mock_agent)
 
-        assert result is True
+        assert result.passed is True
 
     @pytest.mark.asyncio
     async def test_run_scenario_multiple_events_no_expected_call(
@@ -165,7 +174,7 @@ class TestRunScenario:
         )
         result = await run_scenario(scenario_with_tool_expected, mock_agent)
 
-        assert result is False
+        assert result.passed is False
 
     @pytest.mark.asyncio
     async def test_run_scenario_empty_events(
@@ -180,7 +189,7 @@ class TestRunScenario:
         )
         result = await run_scenario(scenario_no_tool_expected, mock_agent)
 
-        assert result is True
+        assert result.passed is True
 
     @pytest.mark.asyncio
     async def test_run_scenario_call_agent_async_parameters(
@@ -203,6 +212,32 @@ class TestRunScenario:
             "789",  # app_name
         )
 
+    @pytest.mark.asyncio
+    async def test_run_scenario_result_record(
+        self, mocker, mock_agent, scenario_with_tool_expected
+    ):
+        """Test that the result records tool calls, events and token usage."""
+        first = self.create_mock_event(mocker, ["search"])
+        first.usage_metadata = types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=120, candidates_token_count=8
+        )
+        second = self.create_mock_event(mocker, ["get_current_time"])
+        second.usage_metadata = None
+
+        mocker.patch(
+            "src.runner.scenario_runner.call_agent_async",
+            return_value=[first, second],
+        )
+        result = await run_scenario(scenario_with_tool_expected, mock_agent)
+
+        assert result.scenario_name == "tool_scenario"
+        assert result.expected_tool_call == "get_current_time"
+        assert result.passed is True
+        assert result.event_count == 2
+        assert result.tool_calls == ["search", "get_current_time"]
+        assert (result.input_tokens, result.output_tokens) == (120, 8)
+        assert result.latency_seconds >= 0
+
 
 class TestRunScenarioIntegration:
     """Integration tests for run_scenario function with real ADK agent."""
@@ -233,13 +268,13 @@ class TestRunScenarioIntegration:
     ):
         """Test that conversation scenario doesn't trigger tools."""
         result = await run_scenario(conversation_scenario_no_tool, root_agent)
-        assert result is True
+        assert result.passed is True
 
     @pytest.mark.asyncio
     async def test_run_scenario_math_no_tool(self, math_scenario_no_tool):
         """Test that math scenario doesn't trigger tools (agent has no math tools)."""
         result = await run_scenario(math_scenario_no_tool, root_agent)
-        assert result is True
+        assert result.passed is True
 
     @pytest.mark.asyncio
     async def test_run_scenario_weather_query_no_tool(self):
@@ -251,4 +286,241 @@ class TestRunScenarioIntegration:
             expected_tool_call=None,
         )
         result = await run_scenario(scenario, root_agent)
-        assert result is True
+        assert result.passed is True
+
+
+class TestRunScenariosConcurrently:
+    """Test cases for the run_scenarios_concurrently function."""
+
+    @pytest.fixture
+    def mock_agent(self, mocker):
+        """Create a mock agent for testing."""
+        agent = mocker.MagicMock()
+        agent.name = "test_agent"
+        return agent
+
+    def make_scenarios(self, count):
+        """Create numbered scenarios expecting get_current_time."""
+        return [
+            Scenario(
+                name=f"scenario_{i}",
+                query=f"query {i}",
+                why_its_suitable="Tests concurrency",
+                expected_tool_call="get_current_time",
+            )
+            for i in range(count)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_results_keep_input_order(self, mocker, mock_agent):
+        """Test that results come back in input order even if runs finish out of order."""
+        async def fake_run_scenario(scenario, agent, **kwargs):
+            index = int(scenario.query.split()[-1])
+            # Later scenarios finish first
+            await asyncio.sleep(0.001 * (10 - index))
+            return index % 2 == 0
+
+        mocker.patch(
+            "src.runner.scenario_runner.run_scenario", side_effect=fake_run_scenario
+        )
+        results = await run_scenarios_concurrently(
+            self.make_scenarios(10), mock_agent, max_concurrency=4
+        )
+
+        assert results == [i % 2 == 0 for i in range(10)]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, mocker, mock_agent):
+        """Test that no more than max_concurrency scenarios run at once."""
+        in_flight = 0
+        peak = 0
+
+        async def fake_run_scenario(scenario, agent, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return True
+
+        mocker.patch(
+            "src.runner.scenario_runner.run_scenario", side_effect=fake_run_scenario
+        )
+        results = await run_scenarios_concurrently(
+            self.make_scenarios(20), mock_agent, max_concurrency=3
+        )
+
+        assert all(results)
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_each_scenario_gets_unique_session(self, mocker, mock_agent):
+        """Test that every scenario runs under its own session id."""
+        mock_run = mocker.patch(
+            "src.runner.scenario_runner.run_scenario", return_value=True
+        )
+        await run_scenarios_concurrently(self.make_scenarios(5), mock_agent)
+
+        session_ids = {call.kwargs["session_id"] for call in mock_run.call_args_list}
+        assert len(session_ids) == 5
+
+    @pytest.mark.asyncio
+    async def test_empty_scenario_list(self, mock_agent):
+        """Test that an empty scenario list returns no results."""
+        assert await run_scenarios_concurrently([], mock_agent) == []
+
+    def make_result(self, scenario, passed):
+        return ScenarioResult(
+            scenario_name=scenario.name, passed=passed, latency_seconds=0.01, event_count=1
+        )
+
+    @pytest.mark.asyncio
+    async def test_fail_fast_stops_starting_scenarios(self, mocker, mock_agent):
+        """Test that no scenario starts after the first failure is reported."""
+        async def fake_run_scenario(scenario, agent, **kwargs):
+            await asyncio.sleep(0.001)
+            return self.make_result(scenario, scenario.name != "scenario_2")
+
+        mocker.patch(
+            "src.runner.scenario_runner.run_scenario", side_effect=fake_run_scenario
+        )
+        reported = []
+        results = await run_scenarios_concurrently(
+            self.make_scenarios(10),
+            mock_agent,
+            max_concurrency=2,
+            fail_fast=True,
+            on_result=lambda index, result: reported.append(index),
+        )
+
+        assert results[2].passed is False
+        assert results[-1] is None
+        assert sorted(reported) == [i for i, r in enumerate(results) if r is not None]
+        assert len(reported) <= 4
+
+    @pytest.mark.asyncio
+    async def test_time_budget_cancels_and_skips(self, mocker, mock_agent):
+        """Test that the budget cancels runs in flight and skips the rest."""
+        async def fake_run_scenario(scenario, agent, **kwargs):
+            await asyncio.sleep(0.01 if scenario.name == "scenario_0" else 10)
+            return self.make_result(scenario, True)
+
+        mocker.patch(
+            "src.runner.scenario_runner.run_scenario", side_effect=fake_run_scenario
+        )
+        start = asyncio.get_running_loop().time()
+        results = await run_scenarios_concurrently(
+            self.make_scenarios(6), mock_agent, max_concurrency=2, time_budget_seconds=0.2
+        )
+
+        assert asyncio.get_running_loop().time() - start < 1
+        assert results[0].passed is True
+        assert results[1:] == [None] * 5
+
+    @pytest.mark.asyncio
+    async def test_invalid_max_concurrency(self, mock_agent):
+        """Test that a non-positive max_concurrency is rejected."""
+        with pytest.raises(ValueError):
+            await run_scenarios_concurrently([], mock_agent, max_concurrency=0)
+
+
+class TestRunScenarioStreaming:
+    """Test cases for run_scenario in streaming mode."""
+
+    @pytest.fixture
+    def mock_agent(self, mocker):
+        """Create a mock agent for testing."""
+        agent = mocker.MagicMock()
+        agent.name = "test_agent"
+        return agent
+
+    def patch_stream(self, mocker, batches):
+        """Patch stream_agent_events to yield events with the given function calls.
+
+        Returns a dict tracking how many events were produced and whether the
+        stream was closed.
+        """
+        state = {"produced": 0, "closed": False}
+
+        async def fake_stream(*args, **kwargs):
+            try:
+                for calls in batches:
+                    state["produced"] += 1
+                    event = mocker.MagicMock()
+                    event.get_function_calls.return_value = calls
+                    yield event
+            finally:
+                state["closed"] = True
+
+        mocker.patch(
+            "src.runner.scenario_runner.stream_agent_events", side_effect=fake_stream
+        )
+        return state
+
+    @pytest.mark.asyncio
+    async def test_expected_call_passes_immediately(self, mocker, mock_agent):
+        """Test that the stream stops at the first event with the expected call."""
+        state = self.patch_stream(
+            mocker, [["get_current_time"], ["other"], ["another"]]
+        )
+        scenario = Scenario(
+            name="tool_scenario",
+            query="What time is it?",
+            why_its_suitable="Tests tool usage",
+            expected_tool_call="get_current_time",
+        )
+
+        assert (await run_scenario(scenario, mock_agent, streaming=True)).passed is True
+        assert state == {"produced": 1, "closed": True}
+
+    @pytest.mark.asyncio
+    async def test_unexpected_call_fails_immediately(self, mocker, mock_agent):
+        """Test that any tool call stops the stream for a None expectation."""
+        state = self.patch_stream(mocker, [[], ["get_current_time"], []])
+        scenario = Scenario(
+            name="no_tool_scenario",
+            query="Hello",
+            why_its_suitable="Tests basic conversation",
+            expected_tool_call=None,
+        )
+
+        assert (await run_scenario(scenario, mock_agent, streaming=True)).passed is False
+        assert state == {"produced": 2, "closed": True}
+
+    @pytest.mark.asyncio
+    async def test_undecided_stream_is_fully_consumed(self, mocker, mock_agent):
+        """Test that the verdict falls back to the end-of-turn rules."""
+        state = self.patch_stream(mocker, [["other"], []])
+        scenario = Scenario(
+            name="tool_scenario",
+            query="What time is it?",
+            why_its_suitable="Tests tool usage",
+            expected_tool_call="get_current_time",
+        )
+
+        assert (await run_scenario(scenario, mock_agent, streaming=True)).passed is False
+        assert state == {"produced": 2, "closed": True}
+
+
+class TestVerdicts:
+    """Test cases for early_verdict and final_verdict."""
+
+    def test_early_verdict_matches_function_call_names(self):
+        """Test that real FunctionCall objects are matched by tool name."""
+        calls = [types.FunctionCall(name="get_current_time", args={})]
+
+        assert early_verdict("get_current_time", calls) is True
+        assert early_verdict(None, calls) is False
+
+    def test_early_verdict_undecided(self):
+        """Test that nothing decisive yields None."""
+        assert early_verdict("get_current_time", []) is None
+        assert early_verdict("get_current_time", ["other"]) is None
+        assert early_verdict(None, []) is None
+
+    def test_final_verdict(self):
+        """Test the end-of-turn verdict rules."""
+        assert final_verdict(None, []) is True
+        assert final_verdict(None, ["other"]) is False
+        assert final_verdict("get_current_time", ["get_current_time"]) is True
+        assert final_verdict("get_current_time", []) is False
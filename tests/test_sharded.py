@@ -0,0 +1,231 @@
+import asyncio
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from src.models import Scenario, ScenarioResult
+from src.runner.sharded import (
+    WorkQueue,
+    WorkResult,
+    load_eval_set_scenarios,
+    run_sharded,
+    run_worker,
+    scenario_from_eval_case,
+)
+
+
+def make_scenarios(count):
+    return [
+        Scenario(
+            name=f"scenario_{i}",
+            query="What time is it?" if i % 2 == 0 else "Tell me a joke",
+            why_its_suitable="Tests sharding",
+            expected_tool_call="get_current_time" if i % 2 == 0 else None,
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return WorkQueue(tmp_path / "queue")
+
+
+def test_items_are_claimed_once_and_merged_in_order(queue):
+    """Test batching, exclusive claims and merging results by position."""
+    assert queue.enqueue(make_scenarios(5), batch_size=2, run_id="run1") == [
+        "run1-0000000000",
+        "run1-0000000002",
+        "run1-0000000004",
+    ]
+
+    first = queue.claim("worker-a")
+    second = queue.claim("worker-b")
+    assert (first.indices, second.indices) == ([0, 1], [2, 3])
+    assert queue.counts() == {"pending": 1, "claimed": 2, "done": 0}
+
+    for item, worker_id in ((second, "worker-b"), (first, "worker-a")):
+        queue.complete(
+            WorkResult(
+                id=item.id,
+                worker_id=worker_id,
+                indices=item.indices,
+                results=[
+                    ScenarioResult(
+                        scenario_name=s.name,
+                        passed=True,
+                        latency_seconds=0.1,
+                        event_count=1,
+                    )
+                    for s in item.scenarios
+                ],
+                started_at=0.0,
+                finished_at=1.0,
+            )
+        )
+
+    assert [r.scenario_name for r in queue.results()] == [
+        f"scenario_{i}" for i in range(4)
+    ]
+    assert not queue.is_drained()
+
+
+def test_abandoned_claims_are_requeued(queue):
+    """Test that claims of dead workers and expired leases go back to pending."""
+    queue.enqueue(make_scenarios(3), batch_size=1)
+    dead = queue.claim("dead-worker")
+    silent = queue.claim("silent-worker")
+    live = queue.claim("live-worker")
+    old = time.time() - 600
+    os.utime(queue.claimed_dir / f"{silent.id}.silent-worker.json", (old, old))
+
+    assert queue.requeue(lease_seconds=60, dead_workers=["dead-worker"]) == 2
+    assert {queue.claim("new-worker").id, queue.claim("new-worker").id} == {
+        dead.id,
+        silent.id,
+    }
+    assert queue.claim("new-worker") is None
+    assert live is not None
+
+
+@pytest.mark.asyncio
+async def test_workers_share_a_queue(queue):
+    """Test that concurrent workers split the items between them."""
+    from benchmarks.fakes import fake_time_agent
+
+    queue.enqueue(make_scenarios(12), batch_size=2)
+    ran = await asyncio.gather(
+        run_worker(queue, fake_time_agent(), worker_id="a"),
+        run_worker(queue, fake_time_agent(), worker_id="b"),
+    )
+
+    assert sum(ran) == 12
+    assert queue.is_drained()
+    assert all(result.passed for result in queue.results())
+
+
+@pytest.mark.asyncio
+async def test_items_of_a_killed_worker_are_rerun(queue):
+    """Test that a worker waits for claims held by others and reruns them."""
+    from benchmarks.fakes import fake_time_agent
+
+    item_ids = queue.enqueue(make_scenarios(4), batch_size=2)
+    killed = asyncio.create_task(
+        run_worker(
+            queue, fake_time_agent(llm_latency=60), worker_id="a", lease_seconds=0.5
+        )
+    )
+    while not any(queue.claimed_dir.glob("*.a.json")):
+        await asyncio.sleep(0.01)
+    survivor = asyncio.create_task(
+        run_worker(
+            queue,
+            fake_time_agent(),
+            worker_id="b",
+            lease_seconds=0.5,
+            poll_seconds=0.05,
+        )
+    )
+    while queue.counts()["done"] < 1:
+        await asyncio.sleep(0.01)
+
+    # Nothing is pending now, so the survivor only stays around for the claim.
+    assert not survivor.done()
+    killed.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await killed
+
+    assert await asyncio.wait_for(survivor, timeout=10) == 4
+    assert queue.is_done(item_ids)
+    assert all(result.passed for result in queue.results(item_ids))
+
+
+def test_run_sharded_with_worker_processes(tmp_path):
+    """Test a full run on two worker processes."""
+    results = run_sharded(
+        make_scenarios(8),
+        "benchmarks.fakes:fake_time_agent",
+        workers=2,
+        queue_dir=tmp_path / "queue",
+        batch_size=2,
+    )
+
+    assert [r.scenario_name for r in results] == [f"scenario_{i}" for i in range(8)]
+    assert all(r.passed for r in results)
+
+
+@pytest.mark.asyncio
+async def test_reused_queue_keeps_runs_apart(queue):
+    """Test that a second run in the same directory gets its own results."""
+    from benchmarks.fakes import fake_time_agent
+
+    first = queue.enqueue(make_scenarios(2), batch_size=2)
+    await run_worker(queue, fake_time_agent(), worker_id="a")
+    renamed = [
+        scenario.model_copy(update={"name": f"new_{i}"})
+        for i, scenario in enumerate(make_scenarios(2))
+    ]
+    second = queue.enqueue(renamed, batch_size=2)
+
+    assert await run_worker(queue, fake_time_agent(), worker_id="b") == 2
+    assert [r.scenario_name for r in queue.results(second)] == ["new_0", "new_1"]
+    assert [r.scenario_name for r in queue.results(first)] == [
+        "scenario_0",
+        "scenario_1",
+    ]
+
+
+def test_scenario_from_eval_case():
+    """Test converting the first invocation of an eval case."""
+    from evaluation.eval_case import EvalCase
+
+    case = EvalCase.model_validate(
+        {
+            "eval_id": "time_test",
+            "conversation": [
+                {
+                    "user_content": {"parts": [{"text": "What time is it?"}]},
+                    "intermediate_data": {
+                        "tool_uses": [{"name": "get_current_time", "args": {}}]
+                    },
+                }
+            ],
+        }
+    )
+
+    scenario = scenario_from_eval_case(case)
+    assert (scenario.name, scenario.query, scenario.expected_tool_call) == (
+        "time_test",
+        "What time is it?",
+        "get_current_time",
+    )
+
+
+EVAL_SET_PATH = Path(__file__).parent.parent / "evaluation" / "evaluation.test.json"
+EVAL_SET_SCENARIOS = [
+    ("get_current_time_test", "get_current_time"),
+    ("get_current_date_test", "get_current_date"),
+    ("no_tool_needed_test", None),
+]
+
+
+def test_load_eval_set_scenarios_from_json():
+    """Test loading scenarios from a plain JSON eval set."""
+    scenarios = load_eval_set_scenarios(EVAL_SET_PATH)
+
+    assert [(s.name, s.expected_tool_call) for s in scenarios] == EVAL_SET_SCENARIOS
+
+
+def test_load_eval_set_scenarios_from_jsonl(tmp_path):
+    """Test loading scenarios from a JSON-lines eval set."""
+    from evaluation.eval_set import EvalSet
+    from evaluation.eval_set_stream import write_eval_set_jsonl
+
+    eval_set = EvalSet.model_validate_json(EVAL_SET_PATH.read_bytes())
+    path = write_eval_set_jsonl(eval_set, tmp_path / "eval_set.jsonl")
+
+    scenarios = load_eval_set_scenarios(path)
+
+    assert [(s.name, s.expected_tool_call) for s in scenarios] == EVAL_SET_SCENARIOS
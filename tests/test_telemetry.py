@@ -0,0 +1,158 @@
+import pytest
+from google.adk.agents import BaseAgent
+from google.adk.events import Event
+from google.genai import types
+from opentelemetry import trace
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from src.models import Scenario
+from src.runner.scenario_runner import run_scenario
+from src.runner.telemetry import ScenarioTelemetry
+
+
+class ToolCallingAgent(BaseAgent):
+    """Agent that reports token usage, then calls get_current_time, then answers."""
+
+    async def _run_async_impl(self, ctx):
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            content=types.Content(role="model", parts=[types.Part(text="Let me check")]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=40, candidates_token_count=5
+            ),
+        )
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            content=types.Content(
+                role="model",
+                parts=[
+                    types.Part(
+                        function_call=types.FunctionCall(name="get_current_time")
+                    )
+                ],
+            ),
+        )
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            content=types.Content(role="model", parts=[types.Part(text="12:00")]),
+        )
+
+
+@pytest.fixture
+def telemetry(mocker, monkeypatch):
+    """Route the runner's telemetry to in-memory exporters."""
+    monkeypatch.delenv("OTEL_SDK_DISABLED", raising=False)
+    spans = InMemorySpanExporter()
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(SimpleSpanProcessor(spans))
+    metrics = InMemoryMetricReader()
+    meter_provider = MeterProvider(metric_readers=[metrics])
+    mocker.patch(
+        "src.runner.telemetry._telemetry",
+        ScenarioTelemetry(tracer_provider, meter_provider),
+    )
+    return spans, metrics
+
+
+@pytest.fixture
+def scenario():
+    return Scenario(
+        name="time_query",
+        query="What time is it?",
+        why_its_suitable="Tests tool usage",
+        expected_tool_call="get_current_time",
+    )
+
+
+def histograms(reader):
+    """Return {metric name: [data points]} from an in-memory metric reader."""
+    data = reader.get_metrics_data()
+    return {
+        metric.name: list(metric.data.data_points)
+        for resource_metrics in data.resource_metrics
+        for scope_metrics in resource_metrics.scope_metrics
+        for metric in scope_metrics.metrics
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("streaming", [False, True])
+async def test_scenario_span_tree(telemetry, scenario, streaming):
+    """Test that phases are child spans of the scenario span."""
+    spans, _ = telemetry
+    result = await run_scenario(
+        scenario, ToolCallingAgent(name="time_agent"), streaming=streaming
+    )
+    assert result.passed is True
+
+    finished = {span.name: span for span in spans.get_finished_spans()}
+    root = finished["magic_eval.run_scenario"]
+    for phase in ("session_setup", "agent_run", "scoring"):
+        child = finished[f"magic_eval.{phase}"]
+        assert child.parent.span_id == root.context.span_id
+
+    attributes = root.attributes
+    assert attributes["magic_eval.scenario.name"] == "time_query"
+    assert attributes["magic_eval.scenario.passed"] is True
+    assert attributes["magic_eval.scenario.events"] == (2 if streaming else 3)
+    assert attributes["magic_eval.scenario.tokens.input"] == 40
+    assert attributes["magic_eval.scenario.tokens.output"] == 5
+    assert (
+        0
+        <= attributes["magic_eval.scenario.time_to_first_event_ms"]
+        <= attributes["magic_eval.scenario.time_to_first_function_call_ms"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_scenario_metrics(telemetry, scenario):
+    """Test that every run records its measurements as histograms."""
+    _, reader = telemetry
+    agent = ToolCallingAgent(name="time_agent")
+    for i in range(3):
+        await run_scenario(scenario, agent, session_id=f"s{i}")
+
+    points = histograms(reader)
+    assert points["magic_eval.scenario.duration"][0].count == 3
+    assert points["magic_eval.scenario.time_to_first_function_call"][0].count == 3
+    assert points["magic_eval.scenario.events"][0].sum == 9
+    assert {
+        point.attributes["magic_eval.phase"]: point.count
+        for point in points["magic_eval.scenario.phase.duration"]
+    } == {"session_setup": 3, "agent_run": 3, "scoring": 3}
+    tokens = {
+        point.attributes["magic_eval.token.type"]: point.sum
+        for point in points["magic_eval.scenario.tokens"]
+    }
+    assert tokens == {"input": 120, "output": 15}
+
+
+def test_phases_only_become_current_inside_a_trace():
+    """Test that untraced phases skip the context, and sampled-out ones keep it."""
+    telemetry = ScenarioTelemetry(trace.NoOpTracerProvider())
+    with telemetry.span("outer"):
+        with telemetry.phase("agent_run") as span:
+            assert not span.get_span_context().is_valid
+            assert trace.get_current_span() is trace.INVALID_SPAN
+
+    spans = InMemorySpanExporter()
+    tracer_provider = TracerProvider(sampler=ALWAYS_OFF)
+    tracer_provider.add_span_processor(SimpleSpanProcessor(spans))
+    telemetry = ScenarioTelemetry(tracer_provider)
+    with telemetry.span("outer") as outer:
+        with telemetry.phase("agent_run") as span:
+            assert trace.get_current_span() is span
+            assert span.get_span_context().trace_id == outer.get_span_context().trace_id
+            assert not span.is_recording()
+    assert trace.get_current_span() is trace.INVALID_SPAN
+    assert spans.get_finished_spans() == ()
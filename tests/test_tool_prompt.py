@@ -0,0 +1,92 @@
+import json
+
+from src.creation.scenario_cache import CONFIG_DIR
+from src.creation.tool_prompt import (
+    count_tokens,
+    plan_shards,
+    prompt_tokens,
+    serialize_tool,
+    serialize_tools,
+)
+from src.models import ToolInfo
+
+TIME_TOOL = ToolInfo(
+    name="get_current_time",
+    description="Get the current time\n    in a specific timezone.",
+    parameters={
+        "type": "object",
+        "title": "get_current_timeArguments",
+        "properties": {
+            "timezone": {"type": "string", "description": "IANA timezone name"},
+            "format": {"type": "string", "enum": ["iso", "unix"]},
+            "fields": {"type": "array", "items": {"type": "string"}},
+        },
+        "required": ["timezone"],
+    },
+)
+
+
+def make_tools(count):
+    return [
+        ToolInfo(name=f"tool_{i}", description=f"Tool number {i}", parameters=None)
+        for i in range(count)
+    ]
+
+
+def test_tools_are_serialized_once_and_compactly():
+    """Test the compact encoding: deduplicated, sorted, schema boilerplate dropped."""
+    calculate = ToolInfo(
+        name="calculate", description="Do math", parameters={"expression": "string"}
+    )
+    text = serialize_tools([TIME_TOOL, calculate, TIME_TOOL])
+
+    assert text == serialize_tools([calculate, TIME_TOOL])
+    assert [json.loads(line)["name"] for line in text.splitlines()] == [
+        "calculate",
+        "get_current_time",
+    ]
+    assert json.loads(serialize_tool(TIME_TOOL)) == {
+        "name": "get_current_time",
+        "description": "Get the current time in a specific timezone.",
+        "parameters": {
+            "timezone": "string: IANA timezone name",
+            "format?": 'string one of ["iso","unix"]',
+            "fields?": "array of string",
+        },
+    }
+    assert count_tokens(text) < count_tokens(
+        str([tool.model_dump() for tool in [TIME_TOOL, calculate]])
+    ) / 2
+
+
+def test_prompt_includes_the_tools_once():
+    """Test that only the task prompt has the {tools} placeholder."""
+    prompt_config = "".join(
+        (CONFIG_DIR / name).read_text() for name in ("agents.yaml", "tasks.yaml")
+    )
+
+    assert prompt_config.count("{tools}") == 1
+    base = prompt_tokens([], 0)
+    assert prompt_tokens([TIME_TOOL], 0) - base <= count_tokens(
+        serialize_tool(TIME_TOOL)
+    ) + 1
+
+
+def test_shards_are_chunked_to_the_token_budget(caplog):
+    """Test that shards close at the token budget as well as at shard_size."""
+    tools = make_tools(6)
+    per_tool = count_tokens(serialize_tool(tools[0])) + 1
+    budget = prompt_tokens([], 0) + 2 * per_tool
+
+    shards = plan_shards(tools, shard_size=8, token_budget=budget)
+    assert [[tool.name for tool in shard] for shard in shards] == [
+        ["tool_0", "tool_1"],
+        ["tool_2", "tool_3"],
+        ["tool_4", "tool_5"],
+    ]
+    assert all(prompt_tokens(shard, 0) <= budget for shard in shards)
+    assert [len(s) for s in plan_shards(tools, 8, budget * 10)] == [6]
+
+    huge = [ToolInfo(name="huge", description="very long description " * 200)]
+    assert plan_shards(huge + tools[:1], 8, budget) == [huge, tools[:1]]
+    assert "over the budget" in caplog.text
@@ -0,0 +1,200 @@
+from typing import AsyncGenerator
+
+import pytest
+from google.adk.agents import LlmAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.tools import FunctionTool
+from google.adk.tools.base_toolset import BaseToolset
+from google.genai import types
+
+from src.creation.get_tools import get_tools_from_agent
+from src.models import AgentTools, Scenario, ToolInfo
+from src.runner.scenario_runner import run_scenario
+from src.runner.tool_stubs import (
+    StubTool,
+    StubToolset,
+    parameters_schema,
+    stub_agent,
+    stub_tools,
+)
+
+
+class ToolNamingLlm(BaseLlm):
+    """Calls the declared tool named in the query, then answers with its result."""
+
+    model: str = "fake/tool-naming"
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        parts = llm_request.contents[-1].parts
+        tool_result = next(
+            (p.function_response for p in parts if p.function_response), None
+        )
+        text = " ".join(p.text for p in parts if p.text)
+        tool = next((name for name in llm_request.tools_dict if name in text), None)
+
+        if tool_result is not None:
+            answer = types.Part(text=str(tool_result.response))
+        elif tool is not None:
+            answer = types.Part(
+                function_call=types.FunctionCall(name=tool, args={"timezone": "UTC"})
+            )
+        else:
+            answer = types.Part(text="No tool needed.")
+        yield LlmResponse(content=types.Content(role="model", parts=[answer]))
+
+
+def get_current_time(timezone: str) -> dict:
+    """Get the current time in a specific timezone."""
+    raise AssertionError("the real tool must not run in stub mode")
+
+
+TOOLS = AgentTools(
+    agent_name="time_agent",
+    tools=[
+        ToolInfo(
+            name="get_current_time",
+            description="Get the current time",
+            parameters={"timezone": "string"},
+        ),
+        ToolInfo(
+            name="convert_time",
+            description="Convert a time between timezones",
+            parameters={
+                "type": "object",
+                "properties": {
+                    "time": {"type": "string", "description": "HH:MM"},
+                    "target_timezone": {"type": "string", "enum": ["UTC", "CET"]},
+                    "round": {"type": ["boolean", "null"]},
+                },
+                "required": ["time", "target_timezone"],
+            },
+        ),
+        ToolInfo(name="get_current_time", description="Duplicate entry"),
+    ],
+)
+
+
+@pytest.fixture
+def agent():
+    return LlmAgent(
+        name="time_agent",
+        model=ToolNamingLlm(),
+        instruction="You are a helpful assistant.",
+        tools=[FunctionTool(get_current_time)],
+    )
+
+
+def test_stub_tools_keep_the_declarations():
+    """Test that stubs declare the same names, descriptions and parameters."""
+    stubs = stub_tools(TOOLS)
+
+    assert [stub.name for stub in stubs] == ["get_current_time", "convert_time"]
+    declaration = stubs[1]._get_declaration()
+    assert declaration.description == "Convert a time between timezones"
+    assert declaration.parameters.required == ["time", "target_timezone"]
+    properties = declaration.parameters.properties
+    assert properties["time"].type == types.Type.STRING
+    assert properties["target_timezone"].enum == ["UTC", "CET"]
+    assert properties["round"].type == types.Type.BOOLEAN
+    assert parameters_schema(None) is None
+
+
+@pytest.mark.asyncio
+async def test_stub_responses():
+    """Test default schema-shaped responses and canned responses."""
+    convert, = stub_tools(TOOLS.tools[1:2])
+    canned = StubTool(TOOLS.tools[0], response={"datetime": "2025-01-01T00:00"})
+    computed = StubTool(TOOLS.tools[0], response=lambda args: args["timezone"])
+
+    assert await convert.run_async(args={"time": "10:00"}, tool_context=None) == {
+        "status": "success",
+        "tool": "convert_time",
+        "arguments": {"time": "10:00", "target_timezone": "UTC", "round": False},
+    }
+    assert await canned.run_async(args={}, tool_context=None) == {
+        "datetime": "2025-01-01T00:00"
+    }
+    assert await computed.run_async(args={"timezone": "CET"}, tool_context=None) == "CET"
+    assert convert.calls == [{"time": "10:00"}]
+
+
+@pytest.mark.asyncio
+async def test_stub_agent_runs_scenarios(agent):
+    """Test that a stubbed agent picks tools through its own model loop."""
+    stubbed = stub_agent(agent)
+    stub = stubbed.tools[0]
+
+    result = await run_scenario(
+        Scenario(
+            name="time",
+            query="Use get_current_time please",
+            why_its_suitable="It asks for the time",
+            expected_tool_call="get_current_time",
+        ),
+        stubbed,
+    )
+
+    assert result.passed is True
+    assert stub.calls == [{"timezone": "UTC"}]
+    assert isinstance(agent.tools[0], FunctionTool)
+    assert get_tools_from_agent(stubbed).tools == [
+        ToolInfo(
+            name="get_current_time",
+            description="Get the current time in a specific timezone.",
+            parameters={
+                "type": "object",
+                "properties": {"timezone": {"type": "string"}},
+                "required": ["timezone"],
+            },
+        )
+    ]
+
+
+class ConvertToolset(BaseToolset):
+    """A toolset that counts how often it is asked for its tools."""
+
+    def __init__(self):
+        super().__init__()
+        self.listed = 0
+
+    async def get_tools(self, readonly_context=None):
+        self.listed += 1
+        return [FunctionTool(convert_time)]
+
+    async def close(self):
+        pass
+
+
+def convert_time(time: str, target_timezone: str) -> dict:
+    """Convert a time between timezones."""
+    raise AssertionError("the real tool must not run in stub mode")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("discovered", [True, False])
+async def test_stub_agent_keeps_tools_on_their_sub_agents(agent, discovered):
+    """Test that every agent in the tree gets stubs of its own tools."""
+    toolset = ConvertToolset()
+    converter = LlmAgent(name="converter", model=ToolNamingLlm(), tools=[toolset])
+    root = agent.clone(update={"sub_agents": [converter]})
+
+    stubbed = stub_agent(root, TOOLS if discovered else None)
+
+    stub_root, = stubbed.tools
+    stub_converter, = stubbed.sub_agents
+    stub_toolset, = stub_converter.tools
+    assert isinstance(stub_root, StubTool)
+    assert stub_root.name == "get_current_time"
+    assert stub_converter.parent_agent is stubbed
+    assert isinstance(stub_toolset, StubToolset)
+    convert, = await stub_toolset.get_tools()
+    assert isinstance(convert, StubTool)
+    assert convert.name == "convert_time"
+    assert await stub_toolset.get_tools() == [convert]
+    # Discovered tools spare the real toolset even the listing.
+    assert toolset.listed == (0 if discovered else 1)
+    assert converter.tools == [toolset]
@@ -0,0 +1,102 @@
+import pytest
+
+from src.models import Scenario, ScenarioResult
+from src.runner.trials import (
+    CI_WIDTH,
+    MAX_TRIALS,
+    SPRT_FAIL,
+    SPRT_PASS,
+    TrialPolicy,
+    run_trials,
+    run_trials_concurrently,
+    wilson_interval,
+)
+
+
+def scenario(name: str) -> Scenario:
+    return Scenario(
+        name=name,
+        query="What time is it?",
+        why_its_suitable="Tests tool usage",
+        expected_tool_call="get_current_time",
+    )
+
+
+@pytest.fixture
+def fake_runs(mocker):
+    """Patch run_scenario to pass or fail following a pattern per scenario."""
+    patterns = {"stable": "1", "broken": "0", "flaky": "10"}
+    counts = {}
+
+    async def fake_run_scenario(scenario, agent, **kwargs):
+        pattern = patterns[scenario.name]
+        count = counts[scenario.name] = counts.get(scenario.name, 0) + 1
+        return ScenarioResult(
+            scenario_name=scenario.name,
+            expected_tool_call=scenario.expected_tool_call,
+            passed=pattern[(count - 1) % len(pattern)] == "1",
+            latency_seconds=0.01,
+            event_count=1,
+        )
+
+    return mocker.patch(
+        "src.runner.trials.run_scenario", side_effect=fake_run_scenario
+    )
+
+
+def test_wilson_interval():
+    """Test the Wilson interval against known values."""
+    low, high = wilson_interval(0, 10)
+    assert low == 0.0
+    assert high == pytest.approx(0.2775, abs=1e-4)
+
+    low, high = wilson_interval(5, 10)
+    assert (low, high) == pytest.approx((0.2366, 0.7634), abs=1e-4)
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+
+def test_policy_stop_reasons():
+    """Test SPRT decisions, the interval width rule and the trial budget."""
+    policy = TrialPolicy()
+
+    assert policy.stop_reason(1, 1) is None
+    assert policy.stop_reason(2, 2) == SPRT_PASS
+    assert policy.stop_reason(0, 2) == SPRT_FAIL
+    assert policy.stop_reason(1, 2) is None
+    assert policy.stop_reason(5, 10) == MAX_TRIALS
+    assert TrialPolicy(max_trials=100).stop_reason(15, 30) is None
+    assert TrialPolicy(max_trials=100).stop_reason(20, 40) == CI_WIDTH
+
+    with pytest.raises(ValueError):
+        TrialPolicy(min_trials=5, max_trials=3)
+
+
+@pytest.mark.asyncio
+async def test_run_trials_adapts_to_flakiness(fake_runs):
+    """Test that stable scenarios stop early and flaky ones use the budget."""
+    policy = TrialPolicy(max_trials=8)
+
+    stable = await run_trials(scenario("stable"), agent=None, policy=policy)
+    flaky = await run_trials(scenario("flaky"), agent=None, policy=policy)
+
+    assert (stable.trials, stable.pass_rate, stable.stop_reason) == (2, 1.0, SPRT_PASS)
+    assert stable.ci_low < 1.0 == stable.ci_high
+    assert (flaky.trials, flaky.passes, flaky.stop_reason) == (8, 4, MAX_TRIALS)
+    assert flaky.ci_low < 0.5 < flaky.ci_high
+    assert len(flaky.results) == 8
+    session_ids = [call.kwargs["session_id"] for call in fake_runs.call_args_list]
+    assert session_ids[2:] == [f"456-trial-{i}" for i in range(8)]
+
+
+@pytest.mark.asyncio
+async def test_run_trials_concurrently_keeps_order(fake_runs):
+    """Test that results come back in scenario order with their own counts."""
+    results = await run_trials_concurrently(
+        [scenario("flaky"), scenario("broken"), scenario("stable")],
+        agent=None,
+        max_concurrency=2,
+    )
+
+    assert [r.scenario_name for r in results] == ["flaky", "broken", "stable"]
+    assert [r.stop_reason for r in results] == [MAX_TRIALS, SPRT_FAIL, SPRT_PASS]
+    assert [r.trials for r in results] == [10, 2, 2]
@@ -0,0 +1,155 @@
+import json
+import os
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from src.runner.telemetry import get_telemetry
+from src.weave_config import (
+    TracingConfig,
+    TracingProfile,
+    build_meter_provider,
+    build_tracer_provider,
+    setup_weave_tracing,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    for name in (
+        "MAGIC_EVAL_TRACING",
+        "MAGIC_EVAL_TRACE_SAMPLE_RATIO",
+        "MAGIC_EVAL_TRACE_FILE",
+        "MAGIC_EVAL_OTLP_ENDPOINT",
+        "WANDB_API_KEY",
+        "OTEL_SDK_DISABLED",
+        "CREWAI_DISABLE_TELEMETRY",
+    ):
+        monkeypatch.delenv(name, raising=False)
+
+
+def emit_spans(provider, count):
+    tracer = provider.get_tracer("test")
+    for i in range(count):
+        with tracer.start_as_current_span(f"root-{i}"):
+            with tracer.start_as_current_span(f"child-{i}"):
+                pass
+    provider.shutdown()
+
+
+def test_default_profile_depends_on_wandb_key(monkeypatch):
+    """Test that tracing is off offline and batched to Weave with a W&B key."""
+    assert TracingConfig.from_env().profile is TracingProfile.OFF
+
+    monkeypatch.setenv("WANDB_API_KEY", "key")
+    config = TracingConfig.from_env()
+    assert config.profile is TracingProfile.BATCHED
+    assert config.exports_to_weave
+
+
+def test_config_from_env(monkeypatch, tmp_path):
+    """Test that every setting can be chosen through the environment."""
+    monkeypatch.setenv("MAGIC_EVAL_TRACING", "Sampled")
+    monkeypatch.setenv("MAGIC_EVAL_TRACE_SAMPLE_RATIO", "0.25")
+    monkeypatch.setenv("MAGIC_EVAL_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+
+    config = TracingConfig.from_env()
+    assert config.profile is TracingProfile.SAMPLED
+    assert config.sample_ratio == 0.25
+    assert not config.exports_to_weave
+
+    monkeypatch.setenv("MAGIC_EVAL_TRACING", "verbose")
+    with pytest.raises(ValueError):
+        TracingConfig.from_env()
+
+
+def test_off_profile_builds_nothing():
+    """Test that the off profile installs a no-op tracer and no meter provider."""
+    config = TracingConfig(profile="off")
+    provider = build_tracer_provider(config)
+    assert not provider.get_tracer("test").start_span("dropped").is_recording()
+    assert build_meter_provider(config) is None
+
+
+def test_off_profile_drops_runner_spans_under_another_global_provider(mocker):
+    """Test that runner spans follow the profile even if crewai set the global."""
+    mocker.patch("src.runner.telemetry._telemetry")
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    # The global provider can only be set once; crewai may have got there first.
+    mocker.patch("src.weave_config.trace.set_tracer_provider")
+    mocker.patch("src.weave_config.trace.get_tracer_provider", return_value=provider)
+
+    setup_weave_tracing("off")
+    with get_telemetry().phase("agent_run"):
+        pass
+
+    assert exporter.get_finished_spans() == ()
+    assert os.environ["CREWAI_DISABLE_TELEMETRY"] == "true"
+
+
+def test_file_profile_writes_json_lines(tmp_path):
+    """Test that the file profile writes one JSON span per line."""
+    path = tmp_path / "traces" / "spans.jsonl"
+    emit_spans(build_tracer_provider(TracingConfig(profile="file", trace_file=path)), 3)
+
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    assert sorted(span["name"] for span in spans) == sorted(
+        [f"root-{i}" for i in range(3)] + [f"child-{i}" for i in range(3)]
+    )
+
+
+def test_sampled_profile_keeps_whole_traces():
+    """Test that sampling drops whole traces, never just some of their spans."""
+    config = TracingConfig(profile="sampled", sample_ratio=0.5)
+    provider = TracerProvider(sampler=build_tracer_provider(config).sampler)
+    exporter = InMemorySpanExporter()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    emit_spans(provider, 200)
+
+    names = [span.name for span in exporter.get_finished_spans()]
+    roots = {name.split("-")[1] for name in names if name.startswith("root")}
+    children = {name.split("-")[1] for name in names if name.startswith("child")}
+    assert roots == children
+    assert 40 < len(roots) < 160
+
+
+def test_zero_ratio_drops_everything(tmp_path):
+    """Test that a zero sample ratio records no spans."""
+    provider = build_tracer_provider(TracingConfig(profile="sampled", sample_ratio=0))
+    span = provider.get_tracer("test").start_span("dropped")
+    assert not span.is_recording()
+    provider.shutdown()
+
+
+def test_metrics_only_for_custom_collectors():
+    """Test that metrics are exported to a custom collector but never to W&B."""
+    assert build_meter_provider(TracingConfig(profile="batched")) is None
+    provider = build_meter_provider(
+        TracingConfig(profile="batched", otlp_endpoint="http://127.0.0.1:1/v1/traces")
+    )
+    assert provider is not None
+    provider.shutdown(timeout_millis=100)
+
+
+def test_setup_skips_weave_when_offline(mocker):
+    """Test that weave.init only runs for profiles that export to Weave."""
+    mocker.patch("src.runner.telemetry._telemetry")
+    weave_init = mocker.patch("src.weave_config.weave.init")
+    set_provider = mocker.patch("src.weave_config.trace.set_tracer_provider")
+
+    setup_weave_tracing()
+    setup_weave_tracing(
+        TracingConfig(profile="batched", otlp_endpoint="http://127.0.0.1:1/v1/traces")
+    )
+    weave_init.assert_not_called()
+    assert set_provider.call_count == 2
+
+    mocker.patch("src.weave_config.metrics.set_meter_provider")
+    setup_weave_tracing("batched")
+    weave_init.assert_called_once_with("Magic_evals")